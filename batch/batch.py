@@ -0,0 +1,86 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable
+import numpy as np
+from qiskit.circuit import QuantumCircuit
+
+
+def _encode_chunk(encoder: object, images: list, options: dict) -> list:
+    """Encode a chunk of images with the given encoder.
+
+    Args:
+        encoder (object): A FRQI, NEQR or QPIE instance.
+        images (list): The images that will be encoded.
+        options (dict): Keyword arguments of image_quantum_circuit.
+
+    Returns:
+        list: The circuits of the images.
+    """
+
+    return [encoder.image_quantum_circuit(image=image, **options) for image in images]
+
+
+def encode_images(
+    encoder: object,
+    images: Iterable[np.ndarray],
+    max_workers: int = None,
+    chunksize: int = None,
+    **options,
+) -> tuple[list[QuantumCircuit], dict]:
+    """Encode a batch of images, fanning the circuit construction out
+    over a process pool.
+
+    The images are split in chunks that are encoded by the workers and
+    the circuits are returned in the order of the images. The batch is
+    encoded in the current process when there is a single worker or a
+    single chunk.
+
+    Args:
+        encoder (object): A FRQI, NEQR or QPIE instance.
+        images (Iterable[np.ndarray]): A stacked array of images or an
+                                       iterable of images.
+        max_workers (int, optional): The number of processes. Defaults to None,
+                                     which uses the number of CPUs.
+        chunksize (int, optional): The number of images sent to a worker at once.
+                                   Defaults to None, which gives about four
+                                   chunks per worker.
+        **options: Keyword arguments of image_quantum_circuit.
+
+    Returns:
+        tuple[list[QuantumCircuit], dict]: The circuits of the images and the
+                                           execution strategy that was used.
+    """
+
+    images = list(images)
+    num_images = len(images)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, num_images))
+    if chunksize is None:
+        chunksize = int(np.ceil(num_images / (4 * max_workers))) or 1
+
+    chunks = [images[i : i + chunksize] for i in range(0, num_images, chunksize)]
+
+    if max_workers == 1 or len(chunks) <= 1:
+        strategy = {
+            "strategy": "serial",
+            "max_workers": 1,
+            "chunksize": num_images,
+            "num_chunks": len(chunks),
+        }
+        return _encode_chunk(encoder=encoder, images=images, options=options), strategy
+
+    strategy = {
+        "strategy": "process_pool",
+        "max_workers": max_workers,
+        "chunksize": chunksize,
+        "num_chunks": len(chunks),
+    }
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_encode_chunk, repeat(encoder), chunks, repeat(options))
+        circuits = [qc for chunk in results for qc in chunk]
+
+    return circuits, strategy
@@ -0,0 +1,8 @@
+from .benchmarks import (
+    benchmark_case,
+    benchmark_image,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
@@ -0,0 +1,53 @@
+import argparse
+from .benchmarks import (
+    ENCODERS,
+    IMAGE_KINDS,
+    IMAGE_SIZES,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+parser = argparse.ArgumentParser(
+    prog="python -m benchmarks",
+    description="Benchmark the FRQI, NEQR and QPIE encoders.",
+)
+parser.add_argument("--output", default="benchmark_results.json")
+parser.add_argument("--encoders", nargs="+", default=list(ENCODERS))
+parser.add_argument("--sizes", nargs="+", type=int, default=list(IMAGE_SIZES))
+parser.add_argument("--kinds", nargs="+", default=list(IMAGE_KINDS))
+parser.add_argument("--max-qubits", type=int, default=14)
+parser.add_argument("--shots", type=int, default=1024)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--no-memory", action="store_true")
+parser.add_argument("--baseline", default=None)
+parser.add_argument("--tolerance", type=float, default=0.25)
+args = parser.parse_args()
+
+results = run_benchmarks(
+    encoders=tuple(args.encoders),
+    sizes=tuple(args.sizes),
+    kinds=tuple(args.kinds),
+    max_qubits=args.max_qubits,
+    shots=args.shots,
+    seed=args.seed,
+    memory=not args.no_memory,
+)
+save_results(results=results, path=args.output)
+
+if args.baseline is not None:
+    regressions = compare_results(
+        baseline=load_results(path=args.baseline),
+        current=results,
+        tolerance=args.tolerance,
+    )
+    for regression in regressions:
+        print(
+            f"{regression['encoder']} {regression['image_kind']} "
+            f"{tuple(regression['image_shape'])} {regression['metric']}: "
+            f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+            f"({regression['ratio']:.2f}x)"
+        )
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,387 @@
+from __future__ import annotations
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+import numpy as np
+import qiskit
+from qiskit import transpile
+from qiskit.circuit import QuantumCircuit
+from qiskit.providers import aer
+from execution import Executor
+from frqi import FRQI
+from neqr import NEQR
+from qpie import QPIE
+
+ENCODERS = {
+    "frqi": (FRQI, {"method": "mcry"}),
+    "frqi-ucr": (FRQI, {"method": "ucr"}),
+    "neqr": (NEQR, {}),
+    "qpie": (QPIE, {}),
+}
+IMAGE_SIZES = (2, 4, 8, 16, 32, 64)
+IMAGE_KINDS = ("gray", "rgb", "3d")
+COMPARED_METRICS = (
+    "construction_time",
+    "construction_peak_memory",
+    "gate_count",
+    "depth",
+    "transpile_time",
+    "transpiled_gate_count",
+    "transpiled_depth",
+    "simulation_time",
+    "reconstruction_time",
+    "reconstruction_peak_memory",
+)
+
+
+def benchmark_image(size: int, kind: str, seed: int = 0) -> np.ndarray:
+    """Return a random benchmark image.
+
+    Args:
+        size (int): The number of rows and columns of the image.
+        kind (str): "gray" for a (size, size) image, "rgb" for a (size, size, 3)
+                    image and "3d" for a (size, size, 2) volume.
+        seed (int, optional): The seed of the random pixels. Defaults to 0.
+
+    Raises:
+        ValueError: If kind is not "gray", "rgb" or "3d".
+
+    Returns:
+        np.ndarray: The image with entries in [0, 1].
+    """
+
+    shapes = {"gray": (size, size), "rgb": (size, size, 3), "3d": (size, size, 2)}
+    if kind not in shapes:
+        raise ValueError(
+            f"Unsupported image kind ({kind}), choose one of {list(shapes)}!"
+        )
+
+    return np.random.default_rng(seed=seed).random(shapes[kind])
+
+
+def _measure(function: Callable, memory: bool = True) -> tuple:
+    """Run a function and measure its wall time and peak memory.
+
+    The peak memory is measured with tracemalloc in a second run, so the
+    tracing overhead does not affect the wall time.
+
+    Args:
+        function (Callable): The function without arguments.
+        memory (bool, optional): If we want to measure the peak memory.
+                                 Defaults to True.
+
+    Returns:
+        tuple: The result of the function, the wall time in seconds and the
+               peak memory in bytes allocated by Python and NumPy, or None.
+    """
+
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result, elapsed, peak_memory
+
+
+def _simulate_and_reconstruct(
+    encoder: FRQI | NEQR | QPIE,
+    quantum_circuit: QuantumCircuit,
+    image_shape: tuple,
+    shots: int,
+    memory: bool = True,
+) -> dict:
+    """Simulate a circuit and reconstruct its image.
+
+    NEQR circuits are sampled and decoded from the counts, FRQI and QPIE
+    circuits are decoded from the statevector.
+
+    Args:
+        encoder (FRQI | NEQR | QPIE): The encoder of the circuit.
+        quantum_circuit (QuantumCircuit): The circuit of the image.
+        image_shape (tuple): The shape of the image.
+        shots (int): The number of shots of the NEQR circuits.
+        memory (bool, optional): If we want to measure the peak memory.
+                                 Defaults to True.
+
+    Returns:
+        dict: The simulation and reconstruction times and the
+              reconstruction peak memory.
+    """
+
+    if isinstance(encoder, NEQR):
+        result, simulation_time, _ = _measure(
+            lambda: encoder.executor.get_counts(
+                quantum_circuits=[quantum_circuit], shots=shots
+            )[0],
+            memory=False,
+        )
+        _, reconstruction_time, reconstruction_peak_memory = _measure(
+            lambda: encoder.reconstruct_image_from_neqr_result(
+                counts=result, image_shape=image_shape
+            ),
+            memory=memory,
+        )
+    else:
+        result, simulation_time, _ = _measure(
+            lambda: encoder.executor.get_statevectors(
+                quantum_circuits=[quantum_circuit]
+            )[0],
+            memory=False,
+        )
+        _, reconstruction_time, reconstruction_peak_memory = _measure(
+            lambda: encoder.reconstruct_image_from_statevector(
+                statevector=result, image_shape=image_shape
+            ),
+            memory=memory,
+        )
+
+    return {
+        "simulation_time": simulation_time,
+        "reconstruction_time": reconstruction_time,
+        "reconstruction_peak_memory": reconstruction_peak_memory,
+    }
+
+
+def benchmark_case(
+    encoder_name: str,
+    image: np.ndarray,
+    max_qubits: int = 14,
+    shots: int = 1024,
+    seed: int = 0,
+    memory: bool = True,
+) -> dict:
+    """Benchmark the encoding, transpilation, simulation and reconstruction
+    of an image.
+
+    Args:
+        encoder_name (str): The name of the encoder in ENCODERS.
+        image (np.ndarray): The image that will be encoded.
+        max_qubits (int, optional): The largest circuit that is transpiled and
+                                    simulated, larger circuits only measure the
+                                    construction. Defaults to 14.
+        shots (int, optional): The number of shots of the NEQR circuits.
+                               Defaults to 1024.
+        seed (int, optional): The seed of the simulator. Defaults to 0.
+        memory (bool, optional): If we want to measure the peak memory.
+                                 Defaults to True.
+
+    Raises:
+        ValueError: If encoder_name is not in ENCODERS.
+
+    Returns:
+        dict: The metrics of the case, the skipped stages are None.
+    """
+
+    if encoder_name not in ENCODERS:
+        raise ValueError(
+            f"Unsupported encoder ({encoder_name}), choose one of {list(ENCODERS)}!"
+        )
+
+    encoder_class, options = ENCODERS[encoder_name]
+    executor_options = {"shots": shots, "seed_simulator": seed}
+    if encoder_class is QPIE:
+        executor_options["method"] = "statevector"
+    encoder = encoder_class(executor=Executor(**executor_options))
+    if isinstance(encoder, NEQR):
+        options = {**options, "measurements": True}
+
+    qc, construction_time, construction_peak_memory = _measure(
+        lambda: encoder.image_quantum_circuit(image=image, **options), memory=memory
+    )
+    case = {
+        "encoder": encoder_name,
+        "image_shape": list(image.shape),
+        "num_qubits": qc.num_qubits,
+        "construction_time": construction_time,
+        "construction_peak_memory": construction_peak_memory,
+        "gate_count": sum(qc.count_ops().values()),
+        "depth": qc.depth(),
+        "transpile_time": None,
+        "transpiled_gate_count": None,
+        "transpiled_depth": None,
+        "simulation_time": None,
+        "reconstruction_time": None,
+        "reconstruction_peak_memory": None,
+    }
+    if qc.num_qubits > max_qubits:
+        return case
+
+    transpiled_qc, transpile_time, _ = _measure(
+        lambda: transpile(circuits=qc, basis_gates=["u", "cx"], optimization_level=0),
+        memory=False,
+    )
+    case["transpile_time"] = transpile_time
+    case["transpiled_gate_count"] = sum(transpiled_qc.count_ops().values())
+    case["transpiled_depth"] = transpiled_qc.depth()
+    case.update(
+        _simulate_and_reconstruct(
+            encoder=encoder,
+            quantum_circuit=qc,
+            image_shape=image.shape,
+            shots=shots,
+            memory=memory,
+        )
+    )
+
+    return case
+
+
+def _metadata() -> dict:
+    """Return the environment of a benchmark run.
+
+    Returns:
+        dict: The commit, date and package versions.
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "qiskit-terra": qiskit.__version__,
+        "qiskit-aer": aer.__version__,
+    }
+
+
+def run_benchmarks(
+    encoders: tuple = tuple(ENCODERS),
+    sizes: tuple = IMAGE_SIZES,
+    kinds: tuple = IMAGE_KINDS,
+    max_qubits: int = 14,
+    shots: int = 1024,
+    seed: int = 0,
+    memory: bool = True,
+) -> dict:
+    """Run the benchmark of every encoder, image size and image kind.
+
+    Args:
+        encoders (tuple, optional): The names of the encoders in ENCODERS.
+                                    Defaults to every encoder.
+        sizes (tuple, optional): The numbers of rows and columns of the images.
+                                 Defaults to IMAGE_SIZES.
+        kinds (tuple, optional): The image kinds, "gray", "rgb" or "3d".
+                                 Defaults to IMAGE_KINDS.
+        max_qubits (int, optional): The largest circuit that is transpiled and
+                                    simulated. Defaults to 14.
+        shots (int, optional): The number of shots of the NEQR circuits.
+                               Defaults to 1024.
+        seed (int, optional): The seed of the images and of the simulator.
+                              Defaults to 0.
+        memory (bool, optional): If we want to measure the peak memory.
+                                 Defaults to True.
+
+    Returns:
+        dict: The metadata of the run and the metrics of every case.
+    """
+
+    results = []
+    for encoder_name in encoders:
+        for kind in kinds:
+            for size in sizes:
+                case = benchmark_case(
+                    encoder_name=encoder_name,
+                    image=benchmark_image(size=size, kind=kind, seed=seed),
+                    max_qubits=max_qubits,
+                    shots=shots,
+                    seed=seed,
+                    memory=memory,
+                )
+                case["image_kind"] = kind
+                results.append(case)
+
+    return {"metadata": _metadata(), "results": results}
+
+
+def save_results(results: dict, path: str) -> None:
+    """Save the benchmark results in a JSON file.
+
+    Args:
+        results (dict): The output of run_benchmarks.
+        path (str): The path of the JSON file.
+    """
+
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """Load the benchmark results from a JSON file.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Returns:
+        dict: The benchmark results.
+    """
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float = 0.25) -> list:
+    """Return the metrics that regressed between two benchmark runs.
+
+    Args:
+        baseline (dict): The results of the reference run.
+        current (dict): The results of the new run.
+        tolerance (float, optional): The relative increase of a metric that is
+                                     reported as a regression. Defaults to 0.25.
+
+    Returns:
+        list: A dictionary per regression with the encoder, image kind and shape,
+              metric, baseline and current values and their ratio.
+    """
+
+    def key(case: dict) -> tuple:
+        return case["encoder"], case["image_kind"], tuple(case["image_shape"])
+
+    baseline_cases = {key(case): case for case in baseline["results"]}
+    regressions = []
+
+    for case in current["results"]:
+        baseline_case = baseline_cases.get(key(case))
+        if baseline_case is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = baseline_case.get(metric), case.get(metric)
+            if not old or new is None or new <= old * (1 + tolerance):
+                continue
+            regressions.append(
+                {
+                    "encoder": case["encoder"],
+                    "image_kind": case["image_kind"],
+                    "image_shape": case["image_shape"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": new / old,
+                }
+            )
+
+    return regressions
@@ -0,0 +1 @@
+from .caching import CircuitCache, circuit_key, encoder_config
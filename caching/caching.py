@@ -0,0 +1,366 @@
+from __future__ import annotations
+import hashlib
+import inspect
+import os
+from collections import OrderedDict
+import numpy as np
+from qiskit import qpy, transpile
+from qiskit.circuit import ControlledGate, Gate, Instruction, QuantumCircuit
+from sparsity import SparseImage, is_sparse_image, to_sparse_image
+
+_CUSTOM_OPERATIONS = (ControlledGate, Gate, Instruction)
+_NAME_SEPARATOR = "_cached_"
+
+
+def encoder_config(encoder: object) -> dict:
+    """Return the constructor arguments of an encoder, except the executor.
+
+    Args:
+        encoder (object): The FRQI, NEQR or QPIE encoder.
+
+    Returns:
+        dict: The string value of every argument.
+    """
+
+    parameters = inspect.signature(type(encoder).__init__).parameters
+
+    return {
+        name: str(getattr(encoder, name, None))
+        for name in parameters
+        if name not in ("self", "executor")
+    }
+
+
+def circuit_key(
+    encoder: object,
+    image: np.ndarray | SparseImage,
+    basis_gates: list = None,
+    **options,
+) -> str:
+    """Return the content hash of the circuit of an image.
+
+    The key covers the image values, dtype and shape, if the image is
+    sparse, the encoder class and its constructor arguments, except the
+    executor, the circuit options and the basis gates of the transpiled
+    circuit.
+
+    Args:
+        encoder (object): The FRQI, NEQR or QPIE encoder.
+        image (np.ndarray | SparseImage): The image that will be encoded.
+        basis_gates (list, optional): The basis gates of the transpiled circuit.
+                                      Defaults to None, which is not transpiled.
+        **options: The keyword arguments of image_quantum_circuit.
+
+    Returns:
+        str: The SHA-256 hex digest of the circuit.
+    """
+
+    digest = hashlib.sha256()
+    if is_sparse_image(image):
+        sparse_image = to_sparse_image(image=image)
+        arrays = (sparse_image.coordinates, sparse_image.values)
+        digest.update(repr(("sparse", sparse_image.shape)).encode())
+    else:
+        arrays = (np.asarray(image),)
+        digest.update(repr(("dense", np.shape(image))).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(array.dtype.str.encode())
+        digest.update(array.tobytes())
+
+    digest.update(
+        repr(
+            (
+                type(encoder).__module__,
+                type(encoder).__name__,
+                sorted(encoder_config(encoder=encoder).items()),
+                sorted((name, str(value)) for name, value in options.items()),
+                None if basis_gates is None else tuple(basis_gates),
+            )
+        ).encode()
+    )
+
+    return digest.hexdigest()
+
+
+def _unique_operation_names(quantum_circuit: QuantumCircuit) -> QuantumCircuit:
+    """Return a copy of a circuit where the custom gates with different
+    parameters or sizes have different names.
+
+    QPY stores a single definition per custom gate name, so the
+    multi-controlled RY gates of different angles would be loaded with
+    the definition of the first one.
+
+    Args:
+        quantum_circuit (QuantumCircuit): The circuit that will be serialized.
+
+    Returns:
+        QuantumCircuit: The circuit with the renamed operations.
+    """
+
+    qc = quantum_circuit.copy()
+    names = {}
+    for i, instruction in enumerate(qc.data):
+        operation = instruction.operation
+        if type(operation) not in _CUSTOM_OPERATIONS:
+            continue
+        key = (operation.name, operation.num_qubits, str(operation.params))
+        names.setdefault(key, f"{operation.name}{_NAME_SEPARATOR}{len(names)}")
+        qc.data[i] = instruction.replace(operation=operation.copy(name=names[key]))
+
+    return qc
+
+
+def _restore_operation_names(quantum_circuit: QuantumCircuit) -> QuantumCircuit:
+    """Restore the names changed by _unique_operation_names in place.
+
+    Args:
+        quantum_circuit (QuantumCircuit): The loaded circuit.
+
+    Returns:
+        QuantumCircuit: The circuit with the original operation names.
+    """
+
+    for instruction in quantum_circuit.data:
+        operation = instruction.operation
+        if _NAME_SEPARATOR in operation.name:
+            operation.name = operation.name.rsplit(_NAME_SEPARATOR, 1)[0]
+
+    return quantum_circuit
+
+
+class CircuitCache:
+    """CircuitCache class"""
+
+    def __init__(
+        self,
+        directory: str = None,
+        max_memory_entries: int = 128,
+        max_disk_bytes: int = 2**30,
+    ) -> CircuitCache:
+        """Initialize a content-addressed cache of image circuits, with an
+        in-memory LRU in front of QPY files.
+
+        Args:
+            directory (str, optional): The directory of the QPY files.
+                                       Defaults to None, which only caches
+                                       the circuits in memory.
+            max_memory_entries (int, optional): The number of circuits kept in
+                                                memory. Defaults to 128.
+            max_disk_bytes (int, optional): The size of the QPY files, the least
+                                            recently used files are removed above it.
+                                            Defaults to 2**30.
+
+        Raises:
+            ValueError: If max_memory_entries or max_disk_bytes is negative.
+        """
+
+        if max_memory_entries < 0:
+            raise ValueError(
+                f"The max_memory_entries ({max_memory_entries}) should not be negative!"
+            )
+        if max_disk_bytes < 0:
+            raise ValueError(
+                f"The max_disk_bytes ({max_disk_bytes}) should not be negative!"
+            )
+
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self.stats = {}
+        self.reset_stats()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def reset_stats(self) -> None:
+        """Set the hit, miss and eviction counters to zero."""
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    def hit_rate(self) -> float:
+        """Return the fraction of the lookups served from the cache.
+
+        Returns:
+            float: The memory and disk hits over the lookups, 0 without lookups.
+        """
+
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+
+        return hits / lookups if lookups else 0.0
+
+    def _path(self, key: str) -> str:
+        """Return the QPY file of a key.
+
+        Args:
+            key (str): The circuit key.
+
+        Returns:
+            str: The path of the file.
+        """
+
+        return os.path.join(self.directory, f"{key}.qpy")
+
+    def get(self, key: str) -> QuantumCircuit | None:
+        """Return a copy of the cached circuit of a key.
+
+        Args:
+            key (str): The circuit key.
+
+        Returns:
+            QuantumCircuit | None: The circuit, or None if it is not cached.
+        """
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return self._memory[key].copy()
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as file:
+                qc = _restore_operation_names(quantum_circuit=qpy.load(file)[0])
+            os.utime(self._path(key))
+            self.stats["disk_hits"] += 1
+            self._remember(key=key, quantum_circuit=qc)
+            return qc.copy()
+
+        self.stats["misses"] += 1
+
+        return None
+
+    def put(self, key: str, quantum_circuit: QuantumCircuit) -> None:
+        """Store a circuit in memory and, with a directory, in a QPY file.
+
+        Args:
+            key (str): The circuit key.
+            quantum_circuit (QuantumCircuit): The circuit.
+        """
+
+        self._remember(key=key, quantum_circuit=quantum_circuit.copy())
+        if self.directory is None:
+            return
+
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            qpy.dump(_unique_operation_names(quantum_circuit=quantum_circuit), file)
+        os.replace(temporary_path, path)
+        self._evict_files(keep=path)
+
+    def _remember(self, key: str, quantum_circuit: QuantumCircuit) -> None:
+        """Add a circuit to the in-memory LRU and evict the oldest entries.
+
+        Args:
+            key (str): The circuit key.
+            quantum_circuit (QuantumCircuit): The circuit.
+        """
+
+        self._memory[key] = quantum_circuit
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def _evict_files(self, keep: str = None) -> None:
+        """Remove the least recently used QPY files above max_disk_bytes.
+
+        Args:
+            keep (str, optional): A file that is never removed, such as the one
+                                  that was just written. Defaults to None.
+        """
+
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".qpy"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total_bytes -= size
+            self.stats["disk_evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove the circuits from memory and the QPY files from the directory."""
+
+        self._memory.clear()
+        if self.directory is None:
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".qpy"):
+                os.remove(entry.path)
+
+    def image_quantum_circuit(
+        self,
+        encoder: object,
+        image: np.ndarray | SparseImage,
+        basis_gates: list = None,
+        **options,
+    ) -> QuantumCircuit:
+        """Return the circuit of an image from the cache, building and
+        storing it on a miss.
+
+        Args:
+            encoder (object): The FRQI, NEQR or QPIE encoder.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+            basis_gates (list, optional): The basis gates used to transpile the
+                                          circuit. Defaults to None, which caches
+                                          the circuit of the encoder.
+            **options: The keyword arguments of image_quantum_circuit.
+
+        Returns:
+            QuantumCircuit: The circuit of the image.
+        """
+
+        key = circuit_key(
+            encoder=encoder, image=image, basis_gates=basis_gates, **options
+        )
+        qc = self.get(key=key)
+        if qc is not None:
+            return qc
+
+        qc = encoder.image_quantum_circuit(image=image, **options)
+        if basis_gates is not None:
+            qc = transpile(circuits=qc, basis_gates=list(basis_gates))
+        self.put(key=key, quantum_circuit=qc)
+
+        return qc
+
+    def image_quantum_circuits(
+        self,
+        encoder: object,
+        images: list,
+        basis_gates: list = None,
+        **options,
+    ) -> list:
+        """Return the circuits of a list of images from the cache.
+
+        Args:
+            encoder (object): The FRQI, NEQR or QPIE encoder.
+            images (list): The images, or a stacked array of images.
+            basis_gates (list, optional): The basis gates used to transpile the
+                                          circuits. Defaults to None.
+            **options: The keyword arguments of image_quantum_circuit.
+
+        Returns:
+            list: The circuits of the images, in the input order.
+        """
+
+        return [
+            self.image_quantum_circuit(
+                encoder=encoder, image=image, basis_gates=basis_gates, **options
+            )
+            for image in images
+        ]
@@ -0,0 +1,268 @@
+from __future__ import annotations
+import json
+import os
+from typing import Callable
+import numpy as np
+import torch
+from skimage.transform import resize
+from torch.utils.data import Dataset
+from caching import encoder_config
+
+FEATURES = ("statevector", "probabilities", "simulation")
+
+
+def _encoder_features(encoder: object, image: np.ndarray, features: str) -> np.ndarray:
+    """Return the features of an encoded image.
+
+    Args:
+        encoder (object): The FRQI, NEQR or QPIE encoder.
+        image (np.ndarray): The image with entries in [0, 1].
+        features (str): "statevector" and "probabilities" are computed from the
+                        image without simulation, "simulation" simulates the
+                        circuit of the image with the executor of the encoder.
+
+    Returns:
+        np.ndarray: The real amplitudes or the probabilities of the circuit.
+    """
+
+    if features == "statevector":
+        return encoder.image_statevector(image=image)
+    if features == "probabilities":
+        return encoder.image_probabilities(image=image)
+
+    qc = encoder.image_quantum_circuit(image=image)
+
+    return np.real(encoder.executor.get_statevectors(quantum_circuits=[qc])[0])
+
+
+class EncodedDataset(Dataset):
+    """EncodedDataset class"""
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        encoder: object,
+        features: str | Callable = "statevector",
+        image_shape: tuple = None,
+        cache_path: str = None,
+        dtype: type = np.float32,
+    ) -> EncodedDataset:
+        """Initialize a dataset of the quantum features of the images of
+        another dataset, such as a MedMNIST dataset.
+
+        The features of an image are computed the first time it is read and
+        stored in a memory-mapped .npy file, so the next epochs only read the
+        file. The file is written by the DataLoader workers, each one opens
+        its own memory map.
+
+        Args:
+            dataset (Dataset): The dataset of (image, label) pairs, the images
+                               are channel-last arrays, PIL images or tensors,
+                               integer images are divided by 255.
+            encoder (object): The FRQI, NEQR or QPIE encoder.
+            features (str | Callable, optional): "statevector", "probabilities",
+                                                 "simulation" or a function of the
+                                                 encoder and the image that returns
+                                                 an array. Defaults to "statevector".
+            image_shape (tuple, optional): The shape the images are resized to
+                                           before the encoding. Defaults to None,
+                                           which keeps the original shape.
+            cache_path (str, optional): The .npy file of the features. Defaults to
+                                        None, which encodes the images on every read.
+            dtype (type, optional): The float type of the features.
+                                    Defaults to np.float32.
+
+        Raises:
+            ValueError: If features is not a callable or one of FEATURES.
+        """
+
+        if not callable(features) and features not in FEATURES:
+            raise ValueError(
+                f"Unsupported features ({features}), choose one of {list(FEATURES)}!"
+            )
+
+        self.dataset = dataset
+        self.encoder = encoder
+        self.features = features
+        self.image_shape = None if image_shape is None else tuple(image_shape)
+        self.cache_path = cache_path
+        self.dtype = np.dtype(dtype)
+        self._cache = None
+        self._done = None
+
+        self.feature_shape = self._encode(index=0)[0].shape
+        if cache_path is not None:
+            self._prepare_cache()
+
+    def __len__(self) -> int:
+        """Return the number of images.
+
+        Returns:
+            int: The length of the wrapped dataset.
+        """
+
+        return len(self.dataset)
+
+    def __getitem__(self, index: int) -> tuple:
+        """Return the features and the label of an image.
+
+        Args:
+            index (int): The index of the image.
+
+        Returns:
+            tuple: The features as a tensor and the label of the wrapped dataset.
+        """
+
+        if self.cache_path is None:
+            features, label = self._encode(index=index)
+            return torch.from_numpy(features), label
+
+        self._open_cache()
+        if self._done[index]:
+            features = np.array(self._cache[index])
+            label = self.dataset[index][1]
+        else:
+            features, label = self._encode(index=index)
+            self._cache[index] = features
+            self._done[index] = True
+
+        return torch.from_numpy(features), label
+
+    def __getstate__(self) -> dict:
+        """Return the state sent to the DataLoader workers, without the
+        memory maps, which every worker opens again.
+
+        Returns:
+            dict: The attributes of the dataset.
+        """
+
+        state = self.__dict__.copy()
+        state["_cache"], state["_done"] = None, None
+
+        return state
+
+    def _image(self, image: object) -> np.ndarray:
+        """Return an image of the wrapped dataset as an array in [0, 1].
+
+        Args:
+            image (object): An array, a PIL image or a tensor.
+
+        Returns:
+            np.ndarray: The image, resized to image_shape.
+        """
+
+        image = np.asarray(image)
+        if np.issubdtype(image.dtype, np.integer):
+            image = image / 255
+        if self.image_shape is not None and image.shape != self.image_shape:
+            image = resize(image, self.image_shape)
+
+        return image
+
+    def _encode(self, index: int) -> tuple:
+        """Return the features and the label of an image without the cache.
+
+        Args:
+            index (int): The index of the image.
+
+        Returns:
+            tuple: The features as an array and the label.
+        """
+
+        image, label = self.dataset[index]
+        image = self._image(image=image)
+        if callable(self.features):
+            features = self.features(self.encoder, image)
+        else:
+            features = _encoder_features(
+                encoder=self.encoder, image=image, features=self.features
+            )
+
+        return np.asarray(features, dtype=self.dtype), label
+
+    def _metadata(self) -> dict:
+        """Return the description of the cached features.
+
+        Returns:
+            dict: The encoder, its arguments, the features, the image shape,
+                  the number of images and the shape and type of the features.
+        """
+
+        features = self.features
+        if callable(features):
+            features = f"{features.__module__}.{features.__qualname__}"
+
+        return {
+            "encoder": type(self.encoder).__name__,
+            "encoder_config": encoder_config(encoder=self.encoder),
+            "features": features,
+            "image_shape": None if self.image_shape is None else list(self.image_shape),
+            "length": len(self),
+            "feature_shape": list(self.feature_shape),
+            "dtype": self.dtype.str,
+        }
+
+    def _prepare_cache(self) -> None:
+        """Create the cache files, unless they hold the same features.
+
+        The features are stored in cache_path, the images whose features
+        were written in cache_path + ".done" and the description of the
+        features in cache_path + ".json".
+        """
+
+        metadata = self._metadata()
+        metadata_path = f"{self.cache_path}.json"
+        if os.path.exists(metadata_path) and os.path.exists(self.cache_path):
+            with open(metadata_path) as file:
+                if json.load(file) == metadata:
+                    return
+
+        np.lib.format.open_memmap(
+            self.cache_path,
+            mode="w+",
+            dtype=self.dtype,
+            shape=(len(self),) + tuple(self.feature_shape),
+        ).flush()
+        np.lib.format.open_memmap(
+            f"{self.cache_path}.done", mode="w+", dtype=bool, shape=(len(self),)
+        ).flush()
+        with open(metadata_path, "w") as file:
+            json.dump(metadata, file, indent=2)
+
+    def _open_cache(self) -> None:
+        """Open the memory maps of the cache in the current process."""
+
+        if self._cache is None:
+            self._cache = np.load(self.cache_path, mmap_mode="r+")
+            self._done = np.load(f"{self.cache_path}.done", mmap_mode="r+")
+
+    def cached_fraction(self) -> float:
+        """Return the fraction of the images whose features are cached.
+
+        Returns:
+            float: The fraction, 0 without a cache.
+        """
+
+        if self.cache_path is None:
+            return 0.0
+        self._open_cache()
+
+        return float(np.mean(self._done)) if len(self) else 1.0
+
+    def precompute(self) -> None:
+        """Compute the features of the images that are not cached yet
+        and write the cache to disk."""
+
+        if self.cache_path is None:
+            return
+        self._open_cache()
+        for index in np.flatnonzero(~self._done):
+            self[int(index)]
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the memory-mapped features of this process to disk."""
+
+        if self._cache is not None:
+            self._cache.flush()
+            self._done.flush()
@@ -0,0 +1 @@
+from .emission import controlled_instructions, write_qasm
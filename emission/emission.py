@@ -0,0 +1,201 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, TextIO
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import (
+    Barrier,
+    ControlledGate,
+    Gate,
+    Measure,
+    Parameter,
+    QuantumCircuit,
+)
+from qiskit.circuit.library.standard_gates import RYGate, XGate
+
+QELIB1_GATES = {"h", "x", "cx", "ccx", "ry"}
+
+
+def controlled_instructions(
+    terms: Iterable[tuple],
+    control_qubits: list,
+    barrier_qubits: list,
+    barriers: bool = True,
+) -> Iterator[tuple]:
+    """Yield the instructions of a sequence of terms controlled on basis
+    states of the control qubits.
+
+    Each term is a boolean mask of the control qubits that are flipped with
+    X gates, so the term is controlled on their |0> state, and the list of
+    instructions applied between the flips. With barriers, every term is
+    wrapped in its own X flips and followed by a barrier. Without barriers,
+    only the qubits whose flip changes between consecutive terms are
+    flipped, which cancels the X pairs during the construction.
+
+    Args:
+        terms (Iterable[tuple]): The (flip mask, instructions) pairs.
+        control_qubits (list): The control qubits.
+        barrier_qubits (list): The qubits of the barriers.
+        barriers (bool, optional): If we want the per-term flips and barriers.
+                                   Defaults to True.
+
+    Yields:
+        Iterator[tuple]: The (operation, qargs, cargs) instructions.
+    """
+
+    x_gate = XGate()
+    barrier = Barrier(num_qubits=len(barrier_qubits))
+    qubits = np.empty(len(control_qubits), dtype=object)
+    qubits[:] = list(control_qubits)
+    flipped = np.zeros(len(qubits), dtype=bool)
+
+    for flip_mask, instructions in terms:
+        if barriers:
+            flips = qubits[flip_mask]
+            for qubit in flips:
+                yield x_gate, [qubit], []
+            yield from instructions
+            for qubit in flips:
+                yield x_gate, [qubit], []
+            yield barrier, barrier_qubits, []
+        else:
+            for qubit in qubits[flip_mask ^ flipped]:
+                yield x_gate, [qubit], []
+            flipped = flip_mask
+            yield from instructions
+
+    for qubit in qubits[flipped]:
+        yield x_gate, [qubit], []
+
+
+def _format_parameter(parameter: object) -> str:
+    """Format a gate parameter as an OpenQASM 2 expression.
+
+    Args:
+        parameter (object): A number or a parameter expression.
+
+    Returns:
+        str: The expression.
+    """
+
+    try:
+        return repr(float(parameter))
+    except TypeError:
+        return str(parameter)
+
+
+def _gate_definition(name: str, gate: Gate, parameters: list) -> str:
+    """Return the OpenQASM 2 definition of a gate in terms of u3 and cx.
+
+    Args:
+        name (str): The name of the gate in the file.
+        gate (Gate): The gate that will be defined.
+        parameters (list): The free parameters of the gate.
+
+    Returns:
+        str: The gate definition.
+    """
+
+    qc = QuantumCircuit(gate.num_qubits)
+    qc.append(gate, qargs=list(range(gate.num_qubits)))
+    qc = transpile(circuits=qc, basis_gates=["u3", "cx"], optimization_level=0)
+
+    body = []
+    for instruction in qc.data:
+        qargs = ",".join(f"q{qc.find_bit(qubit).index}" for qubit in instruction.qubits)
+        params = ",".join(_format_parameter(p) for p in instruction.operation.params)
+        params = f"({params})" if params else ""
+        body.append(f"{instruction.operation.name}{params} {qargs};")
+
+    qargs = ",".join(f"q{i}" for i in range(gate.num_qubits))
+    params = ",".join(parameter.name for parameter in parameters)
+    params = f"({params})" if params else ""
+
+    return f"gate {name}{params} {qargs} {{ {' '.join(body)} }}\n"
+
+
+def write_qasm(
+    quantum_circuit: QuantumCircuit, instructions: Iterable[tuple], file: TextIO
+) -> None:
+    """Stream a circuit to an OpenQASM 2 file.
+
+    The registers and instructions of quantum_circuit are written first and
+    then the instructions are written as they are generated, so the full
+    circuit is never held in memory. Multi-controlled X and RY gates are
+    defined in terms of u3 and cx the first time they are used, with the
+    decomposition of the multi-controlled X gates that are streamed.
+
+    Args:
+        quantum_circuit (QuantumCircuit): The circuit with the registers and
+                                          the first instructions.
+        instructions (Iterable[tuple]): The (operation, qargs, cargs) instructions
+                                        appended to the circuit.
+        file (TextIO): The text file where the circuit is written.
+
+    Raises:
+        ValueError: If an instruction is not supported.
+    """
+
+    qc = quantum_circuit
+    qubit_names = {
+        qubit: f"{register.name}[{i}]"
+        for register in qc.qregs
+        for i, qubit in enumerate(register)
+    }
+    clbit_names = {
+        clbit: f"{register.name}[{i}]"
+        for register in qc.cregs
+        for i, clbit in enumerate(register)
+    }
+    defined_gates = set()
+
+    file.write('OPENQASM 2.0;\ninclude "qelib1.inc";\n')
+    for register in qc.qregs:
+        file.write(f"qreg {register.name}[{register.size}];\n")
+    for register in qc.cregs:
+        file.write(f"creg {register.name}[{register.size}];\n")
+
+    initial_instructions = (
+        (instruction.operation, instruction.qubits, instruction.clbits)
+        for instruction in qc.data
+    )
+
+    for source in (initial_instructions, instructions):
+        for operation, qargs, cargs in source:
+            qubits = ",".join(qubit_names[qubit] for qubit in qargs)
+
+            if isinstance(operation, Barrier):
+                file.write(f"barrier {qubits};\n")
+                continue
+            if isinstance(operation, Measure):
+                file.write(f"measure {qubits} -> {clbit_names[cargs[0]]};\n")
+                continue
+
+            params = [operation.params[0]] if operation.params else []
+            if isinstance(operation, ControlledGate) and operation.name not in (
+                QELIB1_GATES
+            ):
+                num_ctrl_qubits = operation.num_ctrl_qubits
+                base_gate = operation.base_gate.name
+                if base_gate == "x":
+                    name = f"{operation.name}_{operation.num_qubits}"
+                    gate = operation
+                    parameters = []
+                elif base_gate == "ry":
+                    name = f"mcry_{num_ctrl_qubits}"
+                    theta = Parameter("theta")
+                    gate = RYGate(theta=theta).control(num_ctrl_qubits=num_ctrl_qubits)
+                    parameters = [theta]
+                    params = operation.base_gate.params
+                else:
+                    raise ValueError(f"Unsupported instruction ({operation.name})!")
+                if name not in defined_gates:
+                    file.write(_gate_definition(name, gate, parameters))
+                    defined_gates.add(name)
+            elif operation.name in QELIB1_GATES:
+                name = operation.name
+            else:
+                raise ValueError(f"Unsupported instruction ({operation.name})!")
+
+            params = ",".join(_format_parameter(p) for p in params)
+            params = f"({params})" if params else ""
+            file.write(f"{name}{params} {qubits};\n")
@@ -0,0 +1 @@
+from .execution import Executor
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import threading
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import QuantumCircuit
+from qiskit.providers.aer.backends import AerSimulator
+from qiskit.result import Result
+from histogram import result_histograms
+from profiling import profile_stage
+
+
+class Executor:
+    """Executor class"""
+
+    _SIMULATORS = {}
+    _SIMULATORS_LOCK = threading.Lock()
+
+    def __init__(
+        self,
+        method: str = "automatic",
+        precision: str = "double",
+        max_parallel_threads: int = 0,
+        max_parallel_experiments: int = 0,
+        max_parallel_shots: int = 0,
+        shots: int = 8192,
+        seed_simulator: int = None,
+    ) -> Executor:
+        """Initialize the executor.
+
+        Simulators are pooled per configuration and shared by every
+        executor with the same options, so creating executors is cheap.
+
+        Args:
+            method (str, optional): The simulation method of AerSimulator.
+                                    Defaults to "automatic".
+            precision (str, optional): The simulation precision, "single" or "double".
+                                       Defaults to "double".
+            max_parallel_threads (int, optional): The maximum number of OpenMP threads,
+                                                  0 uses all of them. Defaults to 0.
+            max_parallel_experiments (int, optional): The maximum number of circuits
+                                                      simulated in parallel, 0 uses
+                                                      the number of threads. Defaults to 0.
+            max_parallel_shots (int, optional): The maximum number of shots simulated
+                                                in parallel, 0 uses the number of
+                                                threads. Defaults to 0.
+            shots (int, optional): The default number of shots. Defaults to 8192.
+            seed_simulator (int, optional): The seed of the simulator. Defaults to None.
+        """
+
+        self.options = {
+            "method": method,
+            "precision": precision,
+            "max_parallel_threads": max_parallel_threads,
+            "max_parallel_experiments": max_parallel_experiments,
+            "max_parallel_shots": max_parallel_shots,
+        }
+        self.shots = shots
+        self.seed_simulator = seed_simulator
+
+    @property
+    def simulator(self) -> AerSimulator:
+        """Return the pooled simulator of the executor configuration.
+
+        Returns:
+            AerSimulator: The simulator shared by the executors with
+                          the same options.
+        """
+
+        key = tuple(sorted(self.options.items()))
+        with Executor._SIMULATORS_LOCK:
+            if key not in Executor._SIMULATORS:
+                Executor._SIMULATORS[key] = AerSimulator(**self.options)
+
+            return Executor._SIMULATORS[key]
+
+    def run(
+        self, quantum_circuits: list, shots: int = None, seed_simulator: int = None
+    ) -> Result:
+        """Run a list of circuits as a single batched job.
+
+        Args:
+            quantum_circuits (list): The circuits that will be simulated.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+            seed_simulator (int, optional): The seed of this job. Defaults to None,
+                                            which uses the executor seed.
+
+        Returns:
+            Result: The result of the job.
+        """
+
+        if isinstance(quantum_circuits, QuantumCircuit):
+            quantum_circuits = [quantum_circuits]
+
+        run_options = {"shots": self.shots if shots is None else shots}
+        if seed_simulator is None:
+            seed_simulator = self.seed_simulator
+        if seed_simulator is not None:
+            run_options["seed_simulator"] = seed_simulator
+
+        simulator = self.simulator
+        with profile_stage(stage="Executor.transpile") as record:
+            circuits = transpile(circuits=list(quantum_circuits), backend=simulator)
+            if record is not None:
+                record["gate_count"] = sum(len(qc.data) for qc in circuits)
+        with profile_stage(stage="Executor.simulate"):
+            result = simulator.run(circuits, **run_options).result()
+
+        return result
+
+    def get_counts(
+        self, quantum_circuits: list, shots: int = None, seed_simulator: int = None
+    ) -> list:
+        """Return the counts of a list of circuits with measurements.
+
+        Args:
+            quantum_circuits (list): The circuits that will be simulated.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+            seed_simulator (int, optional): The seed of this job. Defaults to None,
+                                            which uses the executor seed.
+
+        Returns:
+            list: The counts dictionary of each circuit.
+        """
+
+        result = self.run(
+            quantum_circuits=quantum_circuits,
+            shots=shots,
+            seed_simulator=seed_simulator,
+        )
+
+        return [result.get_counts(i) for i in range(len(result.results))]
+
+    def get_raw_counts(
+        self, quantum_circuits: list, shots: int = None, seed_simulator: int = None
+    ) -> list:
+        """Return the counts of a list of circuits with measurements, keyed by
+        the hexadecimal integer outcomes of the simulator.
+
+        Unlike get_counts, the bit strings of the classical registers are
+        not formatted, see histogram.counts_outcomes to read the keys.
+
+        Args:
+            quantum_circuits (list): The circuits that will be simulated.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+            seed_simulator (int, optional): The seed of this job. Defaults to None,
+                                            which uses the executor seed.
+
+        Returns:
+            list: The counts dictionary of each circuit.
+        """
+
+        result = self.run(
+            quantum_circuits=quantum_circuits,
+            shots=shots,
+            seed_simulator=seed_simulator,
+        )
+
+        return [result.data(i)["counts"] for i in range(len(result.results))]
+
+    def get_histograms(
+        self, quantum_circuits: list, shots: int = None, seed_simulator: int = None
+    ) -> list:
+        """Return the dense histograms of a list of circuits with measurements.
+
+        Args:
+            quantum_circuits (list): The circuits that will be simulated.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+            seed_simulator (int, optional): The seed of this job. Defaults to None,
+                                            which uses the executor seed.
+
+        Returns:
+            list: The shots of every integer outcome of each circuit, of
+                  length 2^num_clbits.
+        """
+
+        result = self.run(
+            quantum_circuits=quantum_circuits,
+            shots=shots,
+            seed_simulator=seed_simulator,
+        )
+
+        return result_histograms(result=result)
+
+    def get_statevectors(self, quantum_circuits: list) -> list:
+        """Return the final statevectors of a list of circuits.
+
+        The statevector is saved on copies of the circuits, so the input
+        circuits are not modified.
+
+        Args:
+            quantum_circuits (list): The circuits that will be simulated.
+
+        Returns:
+            list: The statevector of each circuit as a NumPy array.
+        """
+
+        if isinstance(quantum_circuits, QuantumCircuit):
+            quantum_circuits = [quantum_circuits]
+
+        circuits = []
+        for quantum_circuit in quantum_circuits:
+            qc = quantum_circuit.copy()
+            qc.save_statevector()
+            circuits.append(qc)
+
+        result = self.run(quantum_circuits=circuits, shots=1)
+
+        return [np.asarray(result.data(i)["statevector"]) for i in range(len(circuits))]
@@ -1,184 +1,1348 @@
 from __future__ import annotations
+from itertools import chain
+from typing import Iterable, Iterator, TextIO
 import numpy as np
-from qiskit.circuit import ClassicalRegister, QuantumCircuit, QuantumRegister
-from qiskit.circuit.library.standard_gates import RYGate
+from qiskit import transpile
+from qiskit.circuit import (
+    ClassicalRegister,
+    ParameterVector,
+    QuantumCircuit,
+    QuantumRegister,
+)
+from qiskit.circuit.library import Barrier, Measure
+from qiskit.circuit.library.standard_gates import CXGate, RYGate
+from batch import encode_images
+from emission import controlled_instructions, write_qasm
+from execution import Executor
+from histogram import counts_histogram
+from layout import ImageLayout, time_frames
+from profiling import profiled
+from resources import (
+    controlled_terms_depth,
+    flip_gate_count,
+    mcry_resources,
+    resource_estimate,
+    stream_resources,
+)
+from sampling import adaptive_counts
+from sparsity import (
+    SparseImage,
+    is_sparse_image,
+    sparse_channel_pixels,
+    to_dense_image,
+)
 
 
 class FRQI:
     """FRQI class"""
 
-    def __init__(self) -> FRQI:
-        pass
+    METHODS = ("mcry", "ucr")
 
+    def __init__(
+        self,
+        executor: Executor = None,
+        rgb: bool = None,
+        axis_registers: bool = False,
+        mcqi: bool = False,
+    ) -> FRQI:
+        """Initialize the FRQI encoder.
+
+        Args:
+            executor (Executor, optional): The executor used to simulate the circuits.
+                                           Defaults to None, which uses Executor().
+            rgb (bool, optional): If the last axis of the images holds the red,
+                                  green and blue channels. Defaults to None, which
+                                  treats a last axis of size 3 of a 3D image as
+                                  RGB channels.
+            axis_registers (bool, optional): If we want one position register per
+                                             spatial axis, "x", "y", "z" and "t",
+                                             instead of a single flattened
+                                             "pixel_indexes" register.
+                                             Defaults to False.
+            mcqi (bool, optional): If we want the multi-channel (MCQI) layout for
+                                   RGB images, where a 2-qubit "channel" register
+                                   selects the red, green or blue channel of a
+                                   single "colour" qubit instead of one colour
+                                   qubit per channel. Defaults to False.
+        """
+
+        self.executor = Executor() if executor is None else executor
+        self.rgb = rgb
+        self.axis_registers = axis_registers
+        self.mcqi = mcqi
+        self._templates = {}
+        self.last_batch_strategy = None
+
+    @profiled
     def image_quantum_circuit(
-        self, image: np.ndarray, measurements: bool = False
+        self,
+        image: np.ndarray | SparseImage,
+        measurements: bool = False,
+        method: str = "mcry",
+        template: bool = False,
+        basis_gates: list = None,
+        barriers: bool = True,
     ) -> QuantumCircuit:
         """Return a FRQI circuit that encodes the image given as input.
 
         Args:
-            image (np.ndarray): The image that will be encoded.
+            image (np.ndarray | SparseImage): The image that will be encoded.
             measurements (bool, optional): If we want to add measurements in the circuit.
                                            Defaults to False.
+            method (str, optional): The synthesis method of the rotations. "mcry" applies
+                                    one multi-controlled RY per pixel and "ucr" applies a
+                                    single uniformly controlled RY decomposed with the
+                                    Gray code into 2^n CNOTs and 2^n RY gates.
+                                    Defaults to "mcry".
+            template (bool, optional): If we want to bind the image angles to the cached
+                                       parameterized circuit of the image shape instead
+                                       of building a new circuit. Defaults to False.
+            basis_gates (list, optional): The basis gates used to transpile the template,
+                                          only used when template is True.
+                                          Defaults to None.
+            barriers (bool, optional): If we want a barrier after every pixel of the
+                                       "mcry" method. Without barriers, the X pairs
+                                       between consecutive pixels are cancelled during
+                                       the construction. Defaults to True.
+
+        Raises:
+            ValueError: If method is not "mcry" or "ucr".
 
         Returns:
             QuantumCircuit: The FRQI circuit of the input image.
         """
 
-        qc = self._initialize_circuit(image=image)
-        qc = self._encode_image(quantum_circuit=qc, image=image)
+        if template:
+            qc_template = self.circuit_template(
+                image_shape=image.shape,
+                measurements=measurements,
+                method=method,
+                basis_gates=basis_gates,
+            )
+            return self.bind_image(template=qc_template, image=image)
+
+        if method not in self.METHODS:
+            raise ValueError(
+                f"Unsupported method ({method}), choose one of {list(self.METHODS)}!"
+            )
+
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        if method == "ucr":
+            qc = self._encode_image_ucr(quantum_circuit=qc, image=image)
+        else:
+            qc = self._encode_image(quantum_circuit=qc, image=image, barriers=barriers)
         if measurements:
-            qc = self._add_measurements(quantum_circuit=qc)
+            qc = self._add_measurements(quantum_circuit=qc, barriers=barriers)
 
         return qc
 
-    def _add_measurements(self, quantum_circuit: QuantumCircuit) -> QuantumCircuit:
+    def stream_qasm(
+        self,
+        image: np.ndarray | SparseImage,
+        file: TextIO,
+        measurements: bool = False,
+        barriers: bool = False,
+    ) -> None:
+        """Write the "mcry" FRQI circuit of the image to an OpenQASM 2 file
+        without building the full circuit in memory.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+            file (TextIO): The text file where the circuit is written.
+            measurements (bool, optional): If we want to add measurements in the circuit.
+                                           Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to False.
+        """
+
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        channels, pixels, rotations = self._rotation_terms(image=image)
+        instructions = self._rotation_instructions(
+            quantum_circuit=qc,
+            channels=channels,
+            pixels=pixels,
+            rotations=rotations,
+            barriers=barriers,
+        )
+        if measurements:
+            instructions = chain(
+                instructions,
+                self._measurement_instructions(quantum_circuit=qc, barriers=barriers),
+            )
+
+        write_qasm(quantum_circuit=qc, instructions=instructions, file=file)
+
+    def batch_quantum_circuits(
+        self,
+        images: Iterable[np.ndarray],
+        measurements: bool = False,
+        method: str = "mcry",
+        max_workers: int = None,
+        chunksize: int = None,
+    ) -> list:
+        """Return the FRQI circuits of a batch of images.
+
+        The circuit construction is distributed over a process pool and
+        the strategy that was used is stored in last_batch_strategy.
+
+        Args:
+            images (Iterable[np.ndarray]): A stacked array of images or an
+                                           iterable of images.
+            measurements (bool, optional): If we want to add measurements in the circuits.
+                                           Defaults to False.
+            method (str, optional): The synthesis method of the rotations, "mcry"
+                                    or "ucr". Defaults to "mcry".
+            max_workers (int, optional): The number of processes. Defaults to None,
+                                         which uses the number of CPUs.
+            chunksize (int, optional): The number of images sent to a worker at once.
+                                       Defaults to None.
+
+        Returns:
+            list: The FRQI circuits of the images, in the input order.
+        """
+
+        circuits, self.last_batch_strategy = encode_images(
+            encoder=self,
+            images=images,
+            max_workers=max_workers,
+            chunksize=chunksize,
+            measurements=measurements,
+            method=method,
+        )
+
+        return circuits
+
+    def frame_quantum_circuits(
+        self,
+        series: np.ndarray,
+        time_axis: int = -1,
+        measurements: bool = False,
+        method: str = "mcry",
+        basis_gates: list = None,
+    ) -> list:
+        """Return the FRQI circuits of the frames of a time series.
+
+        The frames share the cached circuit template of the frame shape and
+        only the angles of every frame are assigned.
+
+        Args:
+            series (np.ndarray): The time series, such as a (x, y, z, t) fMRI scan.
+            time_axis (int, optional): The axis of the time steps. Defaults to -1.
+            measurements (bool, optional): If we want to add measurements in the circuits.
+                                           Defaults to False.
+            method (str, optional): The synthesis method of the rotations, "mcry"
+                                    or "ucr". Defaults to "mcry".
+            basis_gates (list, optional): The basis gates of the transpiled template.
+                                          Defaults to None.
+
+        Returns:
+            list: The FRQI circuits of the frames, in time order.
+        """
+
+        frames = time_frames(series=series, time_axis=time_axis)
+        template = self.circuit_template(
+            image_shape=frames.shape[1:],
+            measurements=measurements,
+            method=method,
+            basis_gates=basis_gates,
+        )
+
+        return [self.bind_image(template=template, image=frame) for frame in frames]
+
+    def _layout(self, image_shape: tuple) -> ImageLayout:
+        """Return the layout of an image in the position registers.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            ImageLayout: The layout of the image.
+        """
+
+        return ImageLayout(
+            image_shape=image_shape, rgb=self.rgb, axis_registers=self.axis_registers
+        )
+
+    def bit_layout(self, image_shape: tuple) -> dict:
+        """Return the classical bits of the registers of the FRQI circuit
+        of an image shape.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            dict: The (offset, size) of every classical register name, the
+                  position registers followed by the colour registers.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        registers = [
+            (f"bits_{name}", size)
+            for name, size in zip(layout.register_names, layout.register_sizes)
+        ]
+        if layout.rgb and self.mcqi:
+            registers += [("bits_channel", 2), ("bit_colour", 1)]
+        elif layout.rgb:
+            registers += [(f"bit_{colour}", 1) for colour in ("red", "green", "blue")]
+        else:
+            registers.append(("intensity_bit", 1))
+
+        offsets = np.cumsum([0] + [size for _, size in registers])
+
+        return {
+            name: (int(offset), size)
+            for (name, size), offset in zip(registers, offsets)
+        }
+
+    def _register_shape(self, layout: ImageLayout) -> tuple:
+        """Return the number of colour qubits and of control states of the
+        rotations of an image layout.
+
+        Args:
+            layout (ImageLayout): The layout of the image.
+
+        Returns:
+            tuple: The number of colour qubits and the number of basis states
+                   of the position registers, and of the channel register of
+                   the MCQI layout.
+        """
+
+        num_pixel = 2**layout.num_index_qubits
+        if self.mcqi and layout.rgb:
+            return 1, 4 * num_pixel
+
+        return layout.num_channels, num_pixel
+
+    def _index_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the position qubits of the FRQI circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The FRQI circuit.
+
+        Returns:
+            list: The qubits of the position registers, lowest bit first.
+        """
+
+        names = ("pixel_indexes",) + ImageLayout.AXIS_NAMES
+
+        return [
+            qubit
+            for register in quantum_circuit.qregs
+            if register.name in names
+            for qubit in register
+        ]
+
+    def _colour_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the colour qubit of every channel of the FRQI circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The FRQI circuit.
+
+        Returns:
+            list: The intensity qubit, the red, green and blue qubits, or the
+                  colour qubit of the MCQI layout.
+        """
+
+        names = ("intensity", "red", "green", "blue", "colour")
+
+        return [
+            register[0] for register in quantum_circuit.qregs if register.name in names
+        ]
+
+    def _channel_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the channel qubits of the MCQI layout.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The FRQI circuit.
+
+        Returns:
+            list: The qubits of the "channel" register, empty for the
+                  other layouts.
+        """
+
+        return [
+            qubit
+            for register in quantum_circuit.qregs
+            if register.name == "channel"
+            for qubit in register
+        ]
+
+    def _control_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the control qubits of the rotations of the FRQI circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The FRQI circuit.
+
+        Returns:
+            list: The position qubits followed by the channel qubits.
+        """
+
+        return self._index_qubits(quantum_circuit=quantum_circuit) + (
+            self._channel_qubits(quantum_circuit=quantum_circuit)
+        )
+
+    def _measurement_instructions(
+        self, quantum_circuit: QuantumCircuit, barriers: bool = True
+    ) -> Iterator[tuple]:
+        """Yield the measurements of the FRQI circuit registers.
+
+        Args:
+            quantum_circuit (QuantumCircuit): A FRQI circuit.
+            barriers (bool, optional): If we want barriers between the registers.
+                                       Defaults to True.
+
+        Yields:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qc = quantum_circuit
+        for i in range(len(qc.qregs)):
+            for qubit, clbit in zip(qc.qregs[i], qc.cregs[i]):
+                yield Measure(), [qubit], [clbit]
+            if barriers and i != len(qc.qregs) - 1:
+                yield Barrier(num_qubits=qc.num_qubits), list(qc.qubits), []
+
+    @profiled
+    def _add_measurements(
+        self, quantum_circuit: QuantumCircuit, barriers: bool = True
+    ) -> QuantumCircuit:
         """Add measurements in FRQI circuit.
 
         Args:
             quantum_circuit (QuantumCircuit): A FRQI circuit that we want to
                                               add measurements.
+            barriers (bool, optional): If we want barriers between the registers.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: FRQI circuit with measurements.
         """
 
         qc = quantum_circuit
-        for i in range(len(qc.qregs)):
-            qc.measure(qubit=qc.qregs[i], cbit=qc.cregs[i])
-            if i != len(qc.qregs) - 1:
-                qc.barrier()
+        for operation, qargs, cargs in self._measurement_instructions(
+            quantum_circuit=qc, barriers=barriers
+        ):
+            qc.append(operation, qargs=qargs, cargs=cargs)
 
         return qc
 
-    def _initialize_circuit(self, image: np.ndarray) -> QuantumCircuit:
+    @profiled
+    def _initialize_circuit(
+        self, image: np.ndarray | SparseImage, barriers: bool = True
+    ) -> QuantumCircuit:
         """Initialize the FRQI circuit.
 
         Args:
-            image (np.ndarray): The input image.
+            image (np.ndarray | SparseImage): The input image.
+            barriers (bool, optional): If we want a barrier after the Hadamard gates.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: The FRQI circuit initialized.
         """
 
-        if len(image.shape) == 3:
-            if image.shape[2] == 3:
-                num_qubits = np.ceil(np.log2(image.shape[0] * image.shape[1]))
-                pixel = QuantumRegister(size=num_qubits, name="pixel_indexes")
-                bits = ClassicalRegister(size=num_qubits, name="bits_pixel_indexes")
-                red = QuantumRegister(size=1, name="red")
-                green = QuantumRegister(size=1, name="green")
-                blue = QuantumRegister(size=1, name="blue")
-                bit_red = ClassicalRegister(size=1, name="bit_red")
-                bit_green = ClassicalRegister(size=1, name="bit_green")
-                bit_blue = ClassicalRegister(size=1, name="bit_blue")
-
-                qc = QuantumCircuit(
-                    pixel, red, green, blue, bits, bit_red, bit_green, bit_blue
-                )
-            else:
-                num_qubits = np.ceil(
-                    np.log2(image.shape[0] * image.shape[1] * image.shape[2])
-                )
-                pixel = QuantumRegister(size=num_qubits, name="pixel_indexes")
-                bits = ClassicalRegister(size=num_qubits, name="bits_pixel_indexes")
-                intensity = QuantumRegister(size=1, name="intensity")
-                intensity_bit = ClassicalRegister(size=1, name="intensity_bit")
-                qc = QuantumCircuit(pixel, intensity, bits, intensity_bit)
+        layout = self._layout(image_shape=image.shape)
+        qregs, cregs = [], []
+        for name, size in zip(layout.register_names, layout.register_sizes):
+            qregs.append(QuantumRegister(size=size, name=name))
+            cregs.append(ClassicalRegister(size=size, name=f"bits_{name}"))
+
+        if layout.rgb and self.mcqi:
+            qregs += [
+                QuantumRegister(size=2, name="channel"),
+                QuantumRegister(size=1, name="colour"),
+            ]
+            cregs += [
+                ClassicalRegister(size=2, name="bits_channel"),
+                ClassicalRegister(size=1, name="bit_colour"),
+            ]
+        elif layout.rgb:
+            for colour in ("red", "green", "blue"):
+                qregs.append(QuantumRegister(size=1, name=colour))
+                cregs.append(ClassicalRegister(size=1, name=f"bit_{colour}"))
         else:
-            num_qubits = np.ceil(np.log2(image.shape[0] * image.shape[1]))
-            pixel = QuantumRegister(size=num_qubits, name="pixel_indexes")
-            bits = ClassicalRegister(size=num_qubits, name="bits_pixel_indexes")
-            intensity = QuantumRegister(size=1, name="intensity")
-            intensity_bit = ClassicalRegister(size=1, name="intensity_bit")
-            qc = QuantumCircuit(pixel, intensity, bits, intensity_bit)
+            qregs.append(QuantumRegister(size=1, name="intensity"))
+            cregs.append(ClassicalRegister(size=1, name="intensity_bit"))
 
-        qc.h(qubit=pixel)
-        qc.barrier()
+        qc = QuantumCircuit(*qregs, *cregs)
+        qc.h(qubit=self._control_qubits(quantum_circuit=qc))
+        if barriers:
+            qc.barrier()
 
         return qc
 
+    @profiled
     def _encode_image(
-        self, quantum_circuit: QuantumCircuit, image: np.ndarray
+        self,
+        quantum_circuit: QuantumCircuit,
+        image: np.ndarray | SparseImage,
+        barriers: bool = True,
     ) -> QuantumCircuit:
         """Encode an image in the quantum circuit.
 
         Args:
             quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
-            image (np.ndarray): The image that will be encoded
+            image (np.ndarray | SparseImage): The image that will be encoded
                                 in the quantum circuit.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
+
+        Returns:
+            QuantumCircuit: A full FRQI circuit.
+        """
+
+        channels, pixels, rotations = self._rotation_terms(image=image)
+
+        return self._encode_rotations(
+            quantum_circuit=quantum_circuit,
+            channels=channels,
+            pixels=pixels,
+            rotations=rotations,
+            barriers=barriers,
+        )
+
+    def _rotation_terms(self, image: np.ndarray | SparseImage) -> tuple:
+        """Return the channel, position and RY angle of the pixel rotations.
+
+        Dense images rotate every pixel of the padded position register,
+        sparse images only rotate their nonzero pixels, since a zero angle
+        rotation is the identity.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            tuple: The channels, positions and RY angles of the rotations.
+        """
+
+        if is_sparse_image(image):
+            _, _, channels, pixels, values = sparse_channel_pixels(
+                image=image, layout=self._layout(image_shape=image.shape)
+            )
+            return channels, pixels, 2 * self._intensity_angles(intensities=values)
+
+        return self._dense_rotation_terms(
+            rotations=2 * self._padded_pixel_angles(image=image)
+        )
+
+    def _dense_rotation_terms(self, rotations: np.ndarray) -> tuple:
+        """Return the channel, position and angle of every entry of a
+        dense matrix of rotations.
+
+        Args:
+            rotations (np.ndarray): The RY angles of shape (channels, 2^n),
+                                    given as numbers or parameters.
+
+        Returns:
+            tuple: The channels, positions and RY angles of the rotations.
+        """
+
+        channels, pixels = np.indices(rotations.shape).reshape(2, -1)
+
+        return channels, pixels, rotations.reshape(-1)
+
+    def _encode_rotations(
+        self,
+        quantum_circuit: QuantumCircuit,
+        channels: np.ndarray,
+        pixels: np.ndarray,
+        rotations: np.ndarray,
+        barriers: bool = True,
+    ) -> QuantumCircuit:
+        """Apply one multi-controlled RY per rotation in the quantum circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            channels (np.ndarray): The colour channel of each rotation.
+            pixels (np.ndarray): The pixel position of each rotation.
+            rotations (np.ndarray): The RY angles, given as numbers or parameters.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: A full FRQI circuit.
         """
 
         qc = quantum_circuit
+        for operation, qargs, cargs in self._rotation_instructions(
+            quantum_circuit=qc,
+            channels=channels,
+            pixels=pixels,
+            rotations=rotations,
+            barriers=barriers,
+        ):
+            qc.append(operation, qargs=qargs, cargs=cargs)
+
+        return qc
+
+    def _rotation_instructions(
+        self,
+        quantum_circuit: QuantumCircuit,
+        channels: np.ndarray,
+        pixels: np.ndarray,
+        rotations: np.ndarray,
+        barriers: bool = True,
+    ) -> Iterator[tuple]:
+        """Return the instructions of one multi-controlled RY per rotation.
 
-        len_image_shape = len(image.shape)
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            channels (np.ndarray): The colour channel of each rotation.
+            pixels (np.ndarray): The pixel position of each rotation.
+            rotations (np.ndarray): The RY angles, given as numbers or parameters.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
 
-        if len_image_shape == 2:
-            n = 1
-            qargs = list(qc.qregs[0]) + list(qc.qregs[1])
+        Returns:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qc = quantum_circuit
+        control_qubits, targets, flip_masks = self._rotation_controls(
+            quantum_circuit=qc, channels=channels, pixels=pixels
+        )
+        num_qubits = len(control_qubits)
+        qargs = [
+            control_qubits + [qubit]
+            for qubit in self._colour_qubits(quantum_circuit=qc)
+        ]
+
+        def terms() -> Iterator[tuple]:
+            for k, flips, theta in zip(targets, flip_masks, rotations):
+                mcry = RYGate(theta=theta).control(num_ctrl_qubits=num_qubits)
+                yield flips, [(mcry, qargs[k], [])]
+
+        return controlled_instructions(
+            terms=terms(),
+            control_qubits=control_qubits,
+            barrier_qubits=list(qc.qubits),
+            barriers=barriers,
+        )
+
+    def _rotation_controls(
+        self, quantum_circuit: QuantumCircuit, channels: np.ndarray, pixels: np.ndarray
+    ) -> tuple:
+        """Return the control qubits, the colour qubit and the flipped control
+        qubits of the rotations.
+
+        The rotations of the MCQI layout all target the colour qubit and
+        are also controlled by the channel register in the state of their
+        channel.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            channels (np.ndarray): The colour channel of each rotation.
+            pixels (np.ndarray): The pixel position of each rotation.
+
+        Returns:
+            tuple: The control qubits, the index of the colour qubit of each
+                   rotation and the boolean flip masks of shape
+                   (rotations, control qubits).
+        """
+
+        qc = quantum_circuit
+        channels, pixels = np.asarray(channels), np.asarray(pixels)
+        control_qubits = self._control_qubits(quantum_circuit=qc)
+        if self._channel_qubits(quantum_circuit=qc):
+            num_index_qubits = len(self._index_qubits(quantum_circuit=qc))
+            states = pixels + (channels << num_index_qubits)
+            targets = np.zeros(len(channels), dtype=int)
         else:
-            if image.shape[2] == 3:
-                n = len_image_shape
-                qargs = [
-                    (list(qc.qregs[0]) + list(qc.qregs[i])) for i in range(1, n + 1)
-                ]
-            else:
-                n = 1
-                qargs = list(qc.qregs[0]) + list(qc.qregs[1])
-
-        num_pixel = 2 ** len(qc.qregs[0])
-        aux_bin_list = [bin(j)[2:] for j in range(num_pixel)]
-        aux_len_bin_list = [len(binary) for binary in aux_bin_list]
-        max_length = max(aux_len_bin_list)
-        binary_list = []
-
-        for bnum in aux_bin_list:
-            if len(bnum) < max_length:
-                new_binary = ""
-                for _ in range(max_length - len(bnum)):
-                    new_binary += "0"
-                new_binary += bnum
-                binary_list.append(new_binary)
-            else:
-                binary_list.append(bnum)
-
-        for k in range(n):
-            pixel_intensity = []
-            if n == 1:
-                pixel_matrix = image
-            else:
-                pixel_matrix = image[:, :, k]
-            if len(image.shape) == 3 and n == 1:
-                for row in pixel_matrix:
-                    for column in row:
-                        for entry in column:
-                            intensity = (((entry * 255 * 3) / 17) / 90) * np.pi
-                            pixel_intensity.append(intensity)
-            else:
-                for row in pixel_matrix:
-                    for entry in row:
-                        intensity = (((entry * 255 * 3) / 17) / 90) * np.pi
-                        pixel_intensity.append(intensity)
-
-            for i, bnum in enumerate(binary_list):
-
-                for idx, element in enumerate(bnum[::-1]):
-                    if element == "0":
-                        qc.x(qubit=qc.qregs[0][idx])
-
-                mcry = RYGate(theta=2 * pixel_intensity[i]).control(
-                    num_ctrl_qubits=len(qc.qregs[0])
-                )
-                if n == 1:
-                    qc.append(mcry, qargs=qargs)
-                else:
-                    qc.append(mcry, qargs=qargs[k])
+            states, targets = pixels, channels
+
+        control_bits = (
+            (states[:, np.newaxis] >> np.arange(len(control_qubits))) & 1
+        ).astype(bool)
+
+        return control_qubits, targets, ~control_bits
+
+    def _intensity_angles(self, intensities: np.ndarray) -> np.ndarray:
+        """Return the FRQI angles of pixel intensities.
+
+        Args:
+            intensities (np.ndarray): The pixel intensities.
+
+        Returns:
+            np.ndarray: The angles.
+        """
+
+        return (((intensities * 255 * 3) / 17) / 90) * np.pi
+
+    def _pixel_angles(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the FRQI angle of every pixel per colour channel.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+
+        Returns:
+            np.ndarray: A matrix of shape (channels, pixels) with the angles.
+        """
+
+        image = to_dense_image(image=image)
+        channels = self._layout(image_shape=image.shape).channel_matrix(image=image)
+
+        return self._intensity_angles(intensities=channels)
+
+    def _padded_pixel_angles(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the pixel angles padded with zeros up to a power of two.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+
+        Returns:
+            np.ndarray: A matrix of shape (channels, 2^n) with the angles,
+                        where n is the number of qubits of the position register.
+        """
+
+        pixel_angles = self._pixel_angles(image=image)
+        num_pixel = 2 ** int(np.ceil(np.log2(pixel_angles.shape[1])))
+        angles = np.zeros((pixel_angles.shape[0], num_pixel))
+        angles[:, : pixel_angles.shape[1]] = pixel_angles
+
+        return angles
+
+    def _register_angles(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the angle of every colour qubit per control state.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+
+        Returns:
+            np.ndarray: The padded pixel angles, or for the MCQI layout a
+                        matrix of shape (1, 4 * 2^n) with the angles of the
+                        channels in the states of the channel register and
+                        zeros in its unused fourth state.
+        """
+
+        angles = self._padded_pixel_angles(image=image)
+        num_colour_qubits, num_states = self._register_shape(
+            layout=self._layout(image_shape=image.shape)
+        )
+        if num_colour_qubits == len(angles):
+            return angles
 
-                for idx, element in enumerate(bnum[::-1]):
-                    if element == "0":
-                        qc.x(qubit=qc.qregs[0][idx])
-                qc.barrier()
+        register_angles = np.zeros((4, angles.shape[1]))
+        register_angles[: len(angles)] = angles
+
+        return register_angles.reshape(num_colour_qubits, num_states)
+
+    def _gray_code_rotation_angles(self, angles: np.ndarray) -> np.ndarray:
+        """Return the angles of the Gray code decomposition of a
+        uniformly controlled rotation.
+
+        The rotation angle applied for the control state k is recovered as
+        sum_i (-1)^popcount(k & g_i) * beta_i, where g_i is the i-th Gray code,
+        so beta is a Walsh-Hadamard transform of the angles read in Gray order.
+
+        Args:
+            angles (np.ndarray): The rotation angles indexed by control state,
+                                 the last axis must have a power of two length.
+
+        Returns:
+            np.ndarray: The angles of the single-qubit rotations in circuit order.
+        """
+
+        num_angles = angles.shape[-1]
+        coefficients = np.array(angles, dtype=float).reshape(-1, num_angles)
+
+        h = 1
+        while h < num_angles:
+            coefficients = coefficients.reshape(-1, num_angles // (2 * h), 2, h)
+            coefficients = np.stack(
+                (
+                    coefficients[:, :, 0] + coefficients[:, :, 1],
+                    coefficients[:, :, 0] - coefficients[:, :, 1],
+                ),
+                axis=2,
+            )
+            h *= 2
+
+        gray_code = np.arange(num_angles) ^ (np.arange(num_angles) >> 1)
+        coefficients = coefficients.reshape(angles.shape)[..., gray_code]
+
+        return coefficients / num_angles
+
+    @profiled
+    def _encode_image_ucr(
+        self, quantum_circuit: QuantumCircuit, image: np.ndarray | SparseImage
+    ) -> QuantumCircuit:
+        """Encode an image in the quantum circuit with uniformly
+        controlled rotations.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded
+                                in the quantum circuit.
+
+        Returns:
+            QuantumCircuit: A full FRQI circuit.
+        """
+
+        angles = self._register_angles(image=image)
+        rotations = self._gray_code_rotation_angles(angles=2 * angles)
+
+        return self._encode_rotations_ucr(
+            quantum_circuit=quantum_circuit, rotations=rotations
+        )
+
+    def _encode_rotations_ucr(
+        self, quantum_circuit: QuantumCircuit, rotations: np.ndarray
+    ) -> QuantumCircuit:
+        """Apply the Gray code decomposition of a uniformly controlled RY
+        in the quantum circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            rotations (np.ndarray): The angles of the single-qubit rotations of
+                                    shape (colour qubits, control states), given
+                                    as numbers or parameters.
+
+        Returns:
+            QuantumCircuit: A full FRQI circuit.
+        """
+
+        qc = quantum_circuit
+        for operation, qargs, cargs in self._ucr_instructions(
+            quantum_circuit=qc, rotations=rotations
+        ):
+            qc.append(operation, qargs=qargs, cargs=cargs)
 
         return qc
+
+    def _ucr_instructions(
+        self, quantum_circuit: QuantumCircuit, rotations: np.ndarray
+    ) -> Iterator[tuple]:
+        """Yield the Gray code decomposition of a uniformly controlled RY.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized FRQI circuit.
+            rotations (np.ndarray): The angles of the single-qubit rotations of
+                                    shape (colour qubits, control states), given
+                                    as numbers or parameters.
+
+        Yields:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qc = quantum_circuit
+
+        pixel = self._control_qubits(quantum_circuit=qc)
+        num_pixel = 2 ** len(pixel)
+
+        steps = np.arange(1, num_pixel + 1)
+        trailing_zeros = np.log2(steps & -steps).astype(int)
+        control_indexes = np.minimum(trailing_zeros, len(pixel) - 1)
+        cx_gate = CXGate()
+
+        for target, channel_rotations in zip(
+            self._colour_qubits(quantum_circuit=qc), rotations
+        ):
+            for theta, idx in zip(channel_rotations, control_indexes):
+                yield RYGate(theta=theta), [target], []
+                if len(pixel) > 0:
+                    yield cx_gate, [pixel[idx], target], []
+
+    def circuit_template(
+        self,
+        image_shape: tuple,
+        measurements: bool = False,
+        method: str = "mcry",
+        basis_gates: list = None,
+    ) -> QuantumCircuit:
+        """Return a parameterized FRQI circuit for images with the given shape.
+
+        The circuit only depends on the image shape, so it is built (and
+        transpiled, if basis_gates is given) once per shape and cached.
+        The angles of a specific image are assigned with bind_image.
+
+        Args:
+            image_shape (tuple): The shape of the images that will be encoded.
+            measurements (bool, optional): If we want to add measurements in the circuit.
+                                           Defaults to False.
+            method (str, optional): The synthesis method of the rotations, "mcry"
+                                    or "ucr". Defaults to "mcry".
+            basis_gates (list, optional): The basis gates used to transpile the template.
+                                          Defaults to None, which does not transpile it.
+
+        Raises:
+            ValueError: If method is not "mcry" or "ucr".
+
+        Returns:
+            QuantumCircuit: The parameterized FRQI circuit.
+        """
+
+        if method not in self.METHODS:
+            raise ValueError(
+                f"Unsupported method ({method}), choose one of {list(self.METHODS)}!"
+            )
+
+        key = (
+            tuple(image_shape),
+            measurements,
+            method,
+            None if basis_gates is None else tuple(basis_gates),
+        )
+        if key in self._templates:
+            return self._templates[key]
+
+        qc = self._initialize_circuit(image=np.zeros(shape=image_shape))
+        layout = self._layout(image_shape=image_shape)
+        if method == "ucr":
+            rotations_shape = self._register_shape(layout=layout)
+        else:
+            rotations_shape = (layout.num_channels, 2**layout.num_index_qubits)
+        theta = ParameterVector(name="theta", length=int(np.prod(rotations_shape)))
+        rotations = np.array(list(theta), dtype=object).reshape(rotations_shape)
+
+        if method == "ucr":
+            qc = self._encode_rotations_ucr(quantum_circuit=qc, rotations=rotations)
+        else:
+            channels, pixels, rotations = self._dense_rotation_terms(
+                rotations=rotations
+            )
+            qc = self._encode_rotations(
+                quantum_circuit=qc,
+                channels=channels,
+                pixels=pixels,
+                rotations=rotations,
+            )
+        if measurements:
+            qc = self._add_measurements(quantum_circuit=qc)
+        if basis_gates is not None:
+            qc = transpile(circuits=qc, basis_gates=list(basis_gates))
+
+        qc.metadata = {"method": method, "image_shape": tuple(image_shape)}
+        self._templates[key] = qc
+
+        return qc
+
+    def bind_image(
+        self, template: QuantumCircuit, image: np.ndarray | SparseImage
+    ) -> QuantumCircuit:
+        """Assign the angles of an image to a FRQI circuit template.
+
+        Args:
+            template (QuantumCircuit): A circuit returned by circuit_template.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Raises:
+            ValueError: If the image shape is not the shape of the template.
+
+        Returns:
+            QuantumCircuit: The FRQI circuit of the input image.
+        """
+
+        if tuple(image.shape) != template.metadata["image_shape"]:
+            raise ValueError(
+                f"Image shape {image.shape} does not match the template shape {template.metadata['image_shape']}!"
+            )
+
+        if template.metadata["method"] == "ucr":
+            rotations = self._gray_code_rotation_angles(
+                angles=2 * self._register_angles(image=image)
+            )
+        else:
+            rotations = 2 * self._padded_pixel_angles(image=image)
+
+        theta = template.parameters[0].vector
+
+        return template.assign_parameters({theta: rotations.reshape(-1)})
+
+    def estimate_resources(
+        self,
+        image: np.ndarray | SparseImage | tuple,
+        measurements: bool = False,
+        method: str = "mcry",
+        barriers: bool = True,
+    ) -> dict:
+        """Return the resources of the FRQI circuit of an image without
+        building the circuit, they only depend on the image shape for dense
+        images and on the nonzero pixels for sparse images.
+
+        Args:
+            image (np.ndarray | SparseImage | tuple): The image that will be
+                                                      encoded or its shape.
+            measurements (bool, optional): If the circuit has measurements.
+                                           Defaults to False.
+            method (str, optional): The synthesis method of the rotations, "mcry"
+                                    or "ucr". Defaults to "mcry".
+            barriers (bool, optional): If the circuit has barriers. Defaults to True.
+
+        Raises:
+            ValueError: If method is not "mcry" or "ucr".
+
+        Returns:
+            dict: The num_qubits, gate_counts, cx_count, depth and
+                  statevector_memory in bytes of the circuit.
+        """
+
+        if method not in self.METHODS:
+            raise ValueError(
+                f"Unsupported method ({method}), choose one of {list(self.METHODS)}!"
+            )
+
+        if isinstance(image, tuple):
+            image = np.zeros(image)
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        num_qubits = len(self._control_qubits(quantum_circuit=qc))
+
+        if method == "ucr":
+            instructions = self._ucr_instructions(
+                quantum_circuit=qc,
+                rotations=np.zeros(
+                    self._register_shape(layout=self._layout(image_shape=image.shape))
+                ),
+            )
+            if measurements:
+                instructions = chain(
+                    instructions,
+                    self._measurement_instructions(
+                        quantum_circuit=qc, barriers=barriers
+                    ),
+                )
+            gate_counts, cx_count, depth = stream_resources(
+                quantum_circuit=qc, instructions=instructions
+            )
+            return resource_estimate(
+                num_qubits=qc.num_qubits,
+                gate_counts=gate_counts,
+                cx_count=cx_count,
+                depth=depth,
+            )
+
+        channels, pixels, _ = self._rotation_terms(image=image)
+        _, _, flip_masks = self._rotation_controls(
+            quantum_circuit=qc, channels=channels, pixels=pixels
+        )
+        num_instructions = np.ones(len(flip_masks), dtype=int)
+
+        mcry_name, mcry_cx_count = mcry_resources(num_ctrl_qubits=num_qubits)
+        num_barriers = int(barriers) * (1 + len(flip_masks))
+        depth = int(num_qubits > 0) + controlled_terms_depth(
+            flip_masks=flip_masks, num_instructions=num_instructions, barriers=barriers
+        )
+        if measurements:
+            num_barriers += int(barriers) * (len(qc.cregs) - 1)
+            depth += len(qc.cregs) if barriers else 1
+
+        gate_counts = {
+            "h": num_qubits,
+            "barrier": num_barriers,
+            "x": flip_gate_count(flip_masks=flip_masks, barriers=barriers),
+            mcry_name: len(flip_masks),
+            "measure": qc.num_clbits * measurements,
+        }
+
+        return resource_estimate(
+            num_qubits=qc.num_qubits,
+            gate_counts=gate_counts,
+            cx_count=len(flip_masks) * mcry_cx_count,
+            depth=depth,
+        )
+
+    def image_statevector(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the statevector of the FRQI circuit of the image
+        without building or simulating the circuit.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            np.ndarray: The real amplitudes of the FRQI state in the
+                        qubit ordering of the FRQI circuit.
+        """
+
+        angles = self._register_angles(image=image)
+        num_pixel = angles.shape[1]
+
+        state = np.full((1, num_pixel), 1 / np.sqrt(num_pixel))
+        for channel_angles in angles:
+            factors = np.stack((np.cos(channel_angles), np.sin(channel_angles)))
+            state = (factors[:, None, :] * state[None, :, :]).reshape(-1, num_pixel)
+
+        return state.reshape(-1)
+
+    def image_probabilities(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the measurement probabilities of the FRQI circuit of
+        the image without building or simulating the circuit.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            np.ndarray: The probability of each basis state in the
+                        qubit ordering of the FRQI circuit.
+        """
+
+        return self.image_statevector(image=image) ** 2
+
+    def _image_from_weights(
+        self, weights: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Recover the image from the weights of the basis states.
+
+        Args:
+            weights (np.ndarray): The probabilities or counts of every basis
+                                  state in the qubit ordering of the FRQI circuit.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Raises:
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        num_colour_qubits, num_states = self._register_shape(layout=layout)
+        num_pixel = 2**layout.num_index_qubits
+
+        weights = np.reshape(weights, (2,) * num_colour_qubits + (num_states,))
+        angles = np.zeros((num_colour_qubits, num_states))
+        for k in range(num_colour_qubits):
+            axis = num_colour_qubits - 1 - k
+            other_axes = tuple(i for i in range(num_colour_qubits) if i != axis)
+            marginal = weights.sum(axis=other_axes) if other_axes else weights
+            angles[k] = np.arctan2(np.sqrt(marginal[1]), np.sqrt(marginal[0]))
+        angles = angles.reshape(-1, num_pixel)[: layout.num_channels]
+        pixel_intensity = 2 * angles[:, : layout.num_positions] / np.pi
+
+        return layout.image_from_channel_matrix(matrix=pixel_intensity)
+
+    @profiled
+    def reconstruct_image_from_frqi_result(
+        self, counts: dict, image_shape: tuple
+    ) -> np.ndarray:
+        """Reconstruct the image encoded on FRQI circuit from the counts.
+
+        The angle of each pixel, per colour qubit for RGB images, is estimated
+        from the fraction of shots where the colour qubit was measured as 1
+        with the position index of the pixel.
+
+        Args:
+            counts (dict): The dictionary with the results of the experiments
+                           with FRQI circuit, with bit string keys or the
+                           hexadecimal keys of Executor.get_raw_counts.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Raises:
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        weights = self._counts_to_weights(counts=counts, image_shape=image_shape)
+
+        return self._image_from_weights(weights=weights, image_shape=image_shape)
+
+    @profiled
+    def reconstruct_image_from_histogram(
+        self, histogram: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Reconstruct the image encoded on FRQI circuit from the dense
+        histogram of its integer outcomes.
+
+        Args:
+            histogram (np.ndarray): The shots of every integer outcome, such as
+                                    the histograms of Executor.get_histograms.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Raises:
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        return self._image_from_weights(weights=histogram, image_shape=image_shape)
+
+    def _counts_to_weights(self, counts: dict, image_shape: tuple) -> np.ndarray:
+        """Return the number of shots of every basis state.
+
+        Args:
+            counts (dict): The dictionary with the results of the experiments
+                           with FRQI circuit, with bit string keys or the
+                           hexadecimal keys of Executor.get_raw_counts.
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            np.ndarray: The shots in the qubit ordering of the FRQI circuit.
+        """
+
+        num_clbits = sum(
+            size for _, size in self.bit_layout(image_shape=image_shape).values()
+        )
+
+        return counts_histogram(counts=counts, num_clbits=num_clbits)
+
+    @profiled
+    def reconstruct_image_from_statevector(
+        self, statevector: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Reconstruct the image encoded on FRQI circuit from its statevector.
+
+        Args:
+            statevector (np.ndarray): The statevector of the FRQI circuit.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Raises:
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        weights = np.abs(np.asarray(statevector)) ** 2
+
+        return self._image_from_weights(weights=weights, image_shape=image_shape)
+
+    def reconstruct_images(
+        self,
+        quantum_circuits: list,
+        image_shape: tuple,
+        shots: int = None,
+        statevector: bool = False,
+    ) -> list:
+        """Reconstruct the images encoded on a list of FRQI circuits,
+        simulating all of them in a single batched job.
+
+        Args:
+            quantum_circuits (list): The FRQI circuits.
+            image_shape (tuple): The shape of the images that
+                                 we want to reconstruct.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+            statevector (bool, optional): If we want to reconstruct the images from
+                                          the statevectors of circuits without
+                                          measurements instead of the counts.
+                                          Defaults to False.
+
+        Returns:
+            list: The reconstructed images.
+        """
+
+        if statevector:
+            statevectors = self.executor.get_statevectors(
+                quantum_circuits=quantum_circuits
+            )
+            return [
+                self.reconstruct_image_from_statevector(
+                    statevector=statevec, image_shape=image_shape
+                )
+                for statevec in statevectors
+            ]
+
+        histograms = self.executor.get_histograms(
+            quantum_circuits=quantum_circuits, shots=shots
+        )
+
+        return [
+            self.reconstruct_image_from_histogram(
+                histogram=histogram, image_shape=image_shape
+            )
+            for histogram in histograms
+        ]
+
+    def pixel_errors(self, counts: dict, image_shape: tuple) -> np.ndarray:
+        """Return the confidence of the reconstruction of every pixel.
+
+        The intensity of a pixel is 2 / pi times the angle estimated from
+        the n shots with the position of the pixel, whose standard error is
+        1 / (2 * sqrt(n)) for every angle, so the error of the intensity is
+        1 / (pi * sqrt(n)).
+
+        Args:
+            counts (dict): The dictionary with the results of the experiments
+                           with FRQI circuit, with bit string keys or the
+                           hexadecimal keys of Executor.get_raw_counts.
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            np.ndarray: The standard error of every pixel, with the image shape,
+                        1 for the pixels that were never measured.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        _, num_states = self._register_shape(layout=layout)
+        num_pixel = 2**layout.num_index_qubits
+
+        weights = self._counts_to_weights(counts=counts, image_shape=image_shape)
+        weights = weights.reshape(-1, num_states)
+        totals = weights.sum(axis=0).reshape(-1, num_pixel)[: layout.num_channels]
+        totals = np.broadcast_to(
+            totals[:, : layout.num_positions],
+            (layout.num_channels, layout.num_positions),
+        )
+        errors = np.minimum(
+            1.0,
+            np.divide(
+                1, np.pi * np.sqrt(totals), out=np.ones(totals.shape), where=totals > 0
+            ),
+        )
+
+        return layout.image_from_channel_matrix(matrix=errors)
+
+    def reconstruct_image_adaptively(
+        self,
+        quantum_circuit: QuantumCircuit,
+        image_shape: tuple,
+        target_error: float = 0.05,
+        fraction: float = 1.0,
+        initial_shots: int = None,
+        max_shots: int = 2**20,
+    ) -> dict:
+        """Reconstruct the image encoded on a FRQI circuit, running shots in
+        increments until the pixels meet a target error.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The FRQI circuit with measurements.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+            target_error (float, optional): The standard error of the pixel
+                                            intensities, see pixel_errors.
+                                            Defaults to 0.05.
+            fraction (float, optional): The fraction of pixels that must meet the
+                                        target error. Defaults to 1.0.
+            initial_shots (int, optional): The shots of the first round. Defaults to
+                                           None, which expects the 1 / (pi * target_error)^2
+                                           shots that a pixel needs per basis state of
+                                           the position and channel registers.
+            max_shots (int, optional): The budget of shots. Defaults to 2**20.
+
+        Returns:
+            dict: The reconstructed "image" and the sampling report of
+                  adaptive_counts.
+        """
+
+        if initial_shots is None:
+            num_control_qubits = len(
+                self._control_qubits(quantum_circuit=quantum_circuit)
+            )
+            shots_per_pixel = np.ceil(1 / (np.pi * target_error) ** 2)
+            initial_shots = int(shots_per_pixel * 2**num_control_qubits)
+
+        report = adaptive_counts(
+            executor=self.executor,
+            quantum_circuit=quantum_circuit,
+            pixel_errors=lambda counts: self.pixel_errors(
+                counts=counts, image_shape=image_shape
+            ),
+            target_error=target_error,
+            fraction=fraction,
+            initial_shots=initial_shots,
+            max_shots=max_shots,
+        )
+        report["image"] = self.reconstruct_image_from_frqi_result(
+            counts=report["counts"], image_shape=image_shape
+        )
+
+        return report
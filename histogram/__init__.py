@@ -0,0 +1,10 @@
+from .histogram import (
+    counts_histogram,
+    counts_outcomes,
+    memory_histogram,
+    probability_histogram,
+    register_histogram,
+    register_layout,
+    register_values,
+    result_histograms,
+)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+import numpy as np
+from qiskit.circuit import QuantumCircuit
+from qiskit.result import Result
+
+
+def register_layout(quantum_circuit: QuantumCircuit) -> dict:
+    """Return the bits of every classical register of a circuit.
+
+    The integer outcome of a shot has the value of the classical bit i
+    in its bit i, so a register with offset o and size s is read as
+    (outcome >> o) & (2^s - 1).
+
+    Args:
+        quantum_circuit (QuantumCircuit): The circuit.
+
+    Returns:
+        dict: The (offset, size) of every register name, in register order.
+    """
+
+    return {
+        register.name: (quantum_circuit.find_bit(register[0]).index, register.size)
+        for register in quantum_circuit.cregs
+        if register.size
+    }
+
+
+def _outcome_values(keys: list) -> np.ndarray:
+    """Return the integer outcomes of the keys of counts or memory.
+
+    Args:
+        keys (list): Hexadecimal keys, such as "0x1f", or bit strings
+                     whose registers may be separated by spaces.
+
+    Returns:
+        np.ndarray: The integer outcome of every key.
+    """
+
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if keys[0].startswith("0x"):
+        return np.fromiter((int(key, 16) for key in keys), dtype=np.int64)
+
+    chars = np.frombuffer("".join(keys).encode("ascii"), dtype=np.uint8)
+    chars = chars.reshape(len(keys), len(keys[0]))
+    bits = chars[:, chars[0] != ord(" ")] == ord("1")
+
+    return bits @ (1 << np.arange(bits.shape[1], dtype=np.int64)[::-1])
+
+
+def counts_outcomes(counts: dict) -> tuple:
+    """Return the integer outcomes and the shots of a counts dictionary.
+
+    Args:
+        counts (dict): The counts returned by Result.get_counts, or the raw
+                       counts of an Aer result with hexadecimal keys.
+
+    Returns:
+        tuple: The integer outcomes and the number of shots of every key.
+    """
+
+    keys = list(counts.keys())
+    shots = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+
+    return _outcome_values(keys=keys), shots
+
+
+def _num_clbits(keys: list, num_clbits: int = None) -> int:
+    """Return the number of classical bits of the keys of counts or memory.
+
+    Args:
+        keys (list): The keys.
+        num_clbits (int, optional): The number of classical bits. Defaults to
+                                    None, which reads it from the bit strings.
+
+    Raises:
+        ValueError: If num_clbits is None for hexadecimal keys.
+
+    Returns:
+        int: The number of classical bits.
+    """
+
+    if num_clbits is not None:
+        return num_clbits
+    if keys and keys[0].startswith("0x"):
+        raise ValueError("The num_clbits is needed for hexadecimal keys!")
+
+    return len(keys[0].replace(" ", "")) if keys else 0
+
+
+def counts_histogram(counts: dict, num_clbits: int = None) -> np.ndarray:
+    """Return the dense histogram of a counts dictionary.
+
+    Args:
+        counts (dict): The counts with bit string or hexadecimal keys.
+        num_clbits (int, optional): The number of classical bits. Defaults to
+                                    None, which reads it from the bit strings.
+
+    Raises:
+        ValueError: If num_clbits is None for hexadecimal keys.
+
+    Returns:
+        np.ndarray: The shots of every integer outcome, of length 2^num_clbits.
+    """
+
+    num_clbits = _num_clbits(keys=list(counts.keys()), num_clbits=num_clbits)
+    outcomes, shots = counts_outcomes(counts=counts)
+
+    return np.bincount(outcomes, weights=shots, minlength=2**num_clbits).astype(
+        np.int64
+    )
+
+
+def memory_histogram(memory: list, num_clbits: int = None) -> np.ndarray:
+    """Return the dense histogram of the per-shot memory of a job.
+
+    Args:
+        memory (list): The outcome of every shot, as returned by
+                       Result.get_memory or with hexadecimal keys.
+        num_clbits (int, optional): The number of classical bits. Defaults to
+                                    None, which reads it from the bit strings.
+
+    Raises:
+        ValueError: If num_clbits is None for hexadecimal keys.
+
+    Returns:
+        np.ndarray: The shots of every integer outcome, of length 2^num_clbits.
+    """
+
+    num_clbits = _num_clbits(keys=memory, num_clbits=num_clbits)
+
+    return np.bincount(_outcome_values(keys=list(memory)), minlength=2**num_clbits)
+
+
+def probability_histogram(
+    probabilities: np.ndarray, shots: int = None, statevector: bool = False
+) -> np.ndarray:
+    """Return the histogram of the probabilities of the basis states.
+
+    Args:
+        probabilities (np.ndarray): The probability of every basis state.
+        shots (int, optional): The number of shots of the expected counts.
+                               Defaults to None, which keeps the probabilities.
+        statevector (bool, optional): If probabilities is a statevector, whose
+                                      squared amplitudes are the probabilities.
+                                      Defaults to False.
+
+    Returns:
+        np.ndarray: The probabilities, or the expected shots, of every
+                    integer outcome.
+    """
+
+    histogram = np.asarray(probabilities)
+    if statevector:
+        histogram = np.abs(histogram) ** 2
+    if shots is not None:
+        histogram = histogram * shots
+
+    return histogram
+
+
+def result_histograms(result: Result) -> list:
+    """Return the dense histograms of every experiment of an Aer result.
+
+    The raw counts of the result are read with their hexadecimal keys, so
+    the bit strings of Result.get_counts are never formatted.
+
+    Args:
+        result (Result): The result of a job with measurements.
+
+    Returns:
+        list: The histogram of every experiment.
+    """
+
+    return [
+        counts_histogram(
+            counts=result.data(i)["counts"],
+            num_clbits=experiment.header.memory_slots,
+        )
+        for i, experiment in enumerate(result.results)
+    ]
+
+
+def register_values(outcomes: np.ndarray, layout: dict, name: str) -> np.ndarray:
+    """Return the value of a classical register in every outcome.
+
+    Args:
+        outcomes (np.ndarray): The integer outcomes.
+        layout (dict): The register layout returned by register_layout.
+        name (str): The name of the register.
+
+    Returns:
+        np.ndarray: The integer value of the register.
+    """
+
+    offset, size = layout[name]
+
+    return (np.asarray(outcomes) >> offset) & ((1 << size) - 1)
+
+
+def register_histogram(histogram: np.ndarray, layout: dict, names: list) -> np.ndarray:
+    """Return a dense histogram indexed by the values of some registers.
+
+    Args:
+        histogram (np.ndarray): The dense histogram of the integer outcomes.
+        layout (dict): The register layout of every classical bit.
+        names (list): The registers of the axes of the output, the
+                      other registers are summed.
+
+    Returns:
+        np.ndarray: The histogram of shape (2^size of every register in names).
+    """
+
+    registers = sorted(layout.items(), key=lambda item: item[1][0], reverse=True)
+    histogram = np.reshape(histogram, [2**size for _, (_, size) in registers])
+    axes = [name for name, _ in registers]
+    summed_axes = tuple(i for i, name in enumerate(axes) if name not in names)
+    histogram = histogram.sum(axis=summed_axes)
+    axes = [name for name in axes if name in names]
+
+    return np.transpose(histogram, [axes.index(name) for name in names])
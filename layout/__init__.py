@@ -0,0 +1 @@
+from .layout import ImageLayout, time_frames
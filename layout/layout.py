@@ -0,0 +1,198 @@
+from __future__ import annotations
+import numpy as np
+
+
+class ImageLayout:
+    """ImageLayout class"""
+
+    AXIS_NAMES = ("x", "y", "z", "t")
+
+    def __init__(
+        self, image_shape: tuple, rgb: bool = None, axis_registers: bool = False
+    ) -> ImageLayout:
+        """Initialize the mapping between the pixels of an image and the
+        position registers of a circuit.
+
+        By default the spatial axes are flattened in row-major order into a
+        single "pixel_indexes" register of ceil(log2(pixels)) qubits. With
+        axis_registers, every spatial axis gets its own register, named
+        "x", "y", "z" and "t" in the order of the axes, and the position of a
+        pixel is the concatenation of its coordinates with the first axis in
+        the lowest bits. Each axis is padded on its own to a power of two, so
+        axis-wise operations do not need to undo the flattening.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+            rgb (bool, optional): If the last axis holds the red, green and blue
+                                  channels. Defaults to None, which treats a last
+                                  axis of size 3 of a 3D image as RGB channels.
+            axis_registers (bool, optional): If we want one position register per
+                                             spatial axis. Defaults to False.
+
+        Raises:
+            ValueError: If the number of axes is not supported by the layout.
+            ValueError: If rgb is True and the last axis does not have size 3.
+        """
+
+        image_shape = tuple(int(size) for size in image_shape)
+        if rgb is None:
+            rgb = len(image_shape) == 3 and image_shape[2] == 3
+        if rgb and (len(image_shape) < 3 or image_shape[-1] != 3):
+            raise ValueError(
+                f"The RGB images need a last axis of size 3, got {image_shape}!"
+            )
+
+        spatial_shape = image_shape[:-1] if rgb else image_shape
+        if axis_registers:
+            if not 2 <= len(spatial_shape) <= len(self.AXIS_NAMES):
+                raise ValueError(
+                    f"The axis registers support 2 to {len(self.AXIS_NAMES)} spatial axes, got {spatial_shape}!"
+                )
+            register_sizes = tuple(
+                int(np.ceil(np.log2(size))) for size in spatial_shape
+            )
+            register_names = self.AXIS_NAMES[: len(spatial_shape)]
+        else:
+            if len(image_shape) not in (2, 3) or len(spatial_shape) < 2:
+                raise ValueError(
+                    "Image shape should be a tuple of length 2 for images in gray scale or a tuple of length 3 for RGB images and 3D images!"
+                )
+            register_sizes = (int(np.ceil(np.log2(np.prod(spatial_shape)))),)
+            register_names = ("pixel_indexes",)
+
+        self.image_shape = image_shape
+        self.rgb = bool(rgb)
+        self.axis_registers = axis_registers
+        self.spatial_shape = spatial_shape
+        self.num_channels = 3 if rgb else 1
+        self.register_sizes = register_sizes
+        self.register_names = register_names
+        self.num_index_qubits = sum(register_sizes)
+        if axis_registers:
+            self.num_positions = 2**self.num_index_qubits
+        else:
+            self.num_positions = int(np.prod(spatial_shape))
+
+    def positions(self, coordinates: np.ndarray) -> np.ndarray:
+        """Return the position index of pixels from their spatial coordinates.
+
+        Args:
+            coordinates (np.ndarray): The integer coordinates of the pixels,
+                                      of shape (pixels, spatial axes).
+
+        Returns:
+            np.ndarray: The position indexes.
+        """
+
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(
+            -1, len(self.spatial_shape)
+        )
+        if not self.axis_registers:
+            return np.ravel_multi_index(coordinates.T, self.spatial_shape)
+
+        offsets = np.cumsum((0,) + self.register_sizes[:-1])
+
+        return (coordinates << offsets).sum(axis=1)
+
+    def coordinates(self, positions: np.ndarray) -> tuple:
+        """Return the spatial coordinates of position indexes.
+
+        Args:
+            positions (np.ndarray): The position indexes.
+
+        Returns:
+            tuple: An array of coordinates per spatial axis and a boolean array
+                   that is False for the positions outside of the image.
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+        if not self.axis_registers:
+            valid = positions < self.num_positions
+            coordinates = np.unravel_index(
+                np.where(valid, positions, 0), self.spatial_shape
+            )
+            return coordinates, valid
+
+        offsets = np.cumsum((0,) + self.register_sizes[:-1])
+        coordinates = tuple(
+            (positions >> offset) & (2**size - 1)
+            for offset, size in zip(offsets, self.register_sizes)
+        )
+        valid = np.all(
+            [
+                coordinate < size
+                for coordinate, size in zip(coordinates, self.spatial_shape)
+            ],
+            axis=0,
+        )
+
+        return coordinates, valid
+
+    def _pixel_positions(self) -> np.ndarray:
+        """Return the position index of every pixel in row-major order.
+
+        Returns:
+            np.ndarray: The position indexes.
+        """
+
+        if not self.axis_registers:
+            return np.arange(self.num_positions)
+
+        grid = np.indices(self.spatial_shape).reshape(len(self.spatial_shape), -1)
+
+        return self.positions(coordinates=grid.T)
+
+    def channel_matrix(self, image: np.ndarray) -> np.ndarray:
+        """Return the pixels of a dense image per colour channel and position.
+
+        Args:
+            image (np.ndarray): The image.
+
+        Returns:
+            np.ndarray: A matrix of shape (channels, positions), the positions
+                        that are not pixels of the image hold zeros.
+        """
+
+        image = np.asarray(image)
+        if self.rgb:
+            channels = np.moveaxis(image, -1, 0).reshape(3, -1)
+        else:
+            channels = np.reshape(image, (1, -1))
+        if not self.axis_registers:
+            return channels
+
+        matrix = np.zeros((self.num_channels, self.num_positions), dtype=channels.dtype)
+        matrix[:, self._pixel_positions()] = channels
+
+        return matrix
+
+    def image_from_channel_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """Return the image of a matrix of pixels per colour channel and position.
+
+        Args:
+            matrix (np.ndarray): A matrix of shape (channels, positions).
+
+        Returns:
+            np.ndarray: The image.
+        """
+
+        channels = np.asarray(matrix)[:, self._pixel_positions()]
+        if self.rgb:
+            channels = channels.reshape((3,) + self.spatial_shape)
+            return np.moveaxis(channels, 0, -1)
+
+        return channels.reshape(self.image_shape)
+
+
+def time_frames(series: np.ndarray, time_axis: int = -1) -> np.ndarray:
+    """Return the frames of a time series as a stacked array of images.
+
+    Args:
+        series (np.ndarray): The time series, such as a (x, y, z, t) fMRI scan.
+        time_axis (int, optional): The axis of the time steps. Defaults to -1.
+
+    Returns:
+        np.ndarray: The frames stacked on the first axis.
+    """
+
+    return np.moveaxis(np.asarray(series), time_axis, 0)
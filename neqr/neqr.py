@@ -1,303 +1,1277 @@
 from __future__ import annotations
+from itertools import chain
+from typing import Iterable, Iterator, TextIO
 import numpy as np
-from qiskit.circuit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit import ClassicalRegister, Gate, QuantumCircuit, QuantumRegister
+from qiskit.circuit.library import Barrier, Measure
+from qiskit.circuit.library.standard_gates import (
+    MCXGrayCode,
+    MCXRecursive,
+    MCXVChain,
+    XGate,
+)
+from batch import encode_images
+from emission import controlled_instructions, write_qasm
+from execution import Executor
+from histogram import counts_outcomes, register_values
+from layout import ImageLayout, time_frames
+from profiling import profiled
+from resources import (
+    controlled_terms_depth,
+    decomposed_cx_count,
+    flip_gate_count,
+    resource_estimate,
+    stream_resources,
+)
+from sampling import adaptive_counts
+from sparsity import (
+    SparseImage,
+    is_sparse_image,
+    sparse_channel_pixels,
+    to_dense_image,
+)
 
 
 class NEQR:
     """NEQR class"""
 
-    def __init__(self) -> NEQR:
-        pass
+    MCT_MODES = ("noancilla", "v-chain", "recursion")
 
+    def __init__(
+        self,
+        executor: Executor = None,
+        mct_mode: str = "noancilla",
+        bit_depth: int = 8,
+        rgb: bool = None,
+        axis_registers: bool = False,
+    ) -> NEQR:
+        """Initialize the NEQR encoder.
+
+        The pixel values in [0, 1] are quantized to bit_depth bits, which is
+        the size of the intensity register. Each bit less halves the
+        statevector of the circuit.
+
+        The mct_mode trades circuit width for depth in the decomposition of the
+        multi-controlled X gates with n controls. "noancilla" uses the Gray code
+        decomposition, with no extra qubits but O(2^n) CNOTs. "v-chain" adds an
+        "ancilla" register of n - 2 clean qubits to the circuit and decomposes
+        each gate with O(n) CNOTs. "recursion" needs a single dirty ancilla for
+        n > 4 and borrows an idle intensity qubit, so it keeps the circuit width
+        with O(n^2) CNOTs.
+
+        Args:
+            executor (Executor, optional): The executor used to simulate the circuits.
+                                           Defaults to None, which uses Executor().
+            mct_mode (str, optional): The decomposition of the multi-controlled X
+                                      gates, "noancilla", "v-chain" or "recursion".
+                                      Defaults to "noancilla".
+            bit_depth (int, optional): The number of bits of the pixel intensities.
+                                       Defaults to 8.
+            rgb (bool, optional): If the last axis of the images holds the red,
+                                  green and blue channels. Defaults to None, which
+                                  treats a last axis of size 3 of a 3D image as
+                                  RGB channels.
+            axis_registers (bool, optional): If we want one position register per
+                                             spatial axis, "x", "y", "z" and "t",
+                                             instead of a single flattened
+                                             "pixel_indexes" register.
+                                             Defaults to False.
+
+        Raises:
+            ValueError: If mct_mode is not "noancilla", "v-chain" or "recursion".
+            ValueError: If bit_depth is not a positive integer.
+            ValueError: If mct_mode is "recursion" and bit_depth is 1, since
+                        there is no idle intensity qubit to borrow.
+        """
+
+        if mct_mode not in self.MCT_MODES:
+            raise ValueError(
+                f"Unsupported mct_mode ({mct_mode}), choose one of {list(self.MCT_MODES)}!"
+            )
+        if int(bit_depth) != bit_depth or bit_depth < 1:
+            raise ValueError(
+                f"The bit_depth ({bit_depth}) should be a positive integer!"
+            )
+        if mct_mode == "recursion" and bit_depth == 1:
+            raise ValueError("The recursion mct_mode needs a bit_depth of at least 2!")
+
+        self.executor = Executor() if executor is None else executor
+        self.mct_mode = mct_mode
+        self.bit_depth = int(bit_depth)
+        self.rgb = rgb
+        self.axis_registers = axis_registers
+        self.last_batch_strategy = None
+
+    @profiled
     def image_quantum_circuit(
-        self, image: np.ndarray, measurements: bool = False
+        self,
+        image: np.ndarray | SparseImage,
+        measurements: bool = False,
+        compress: bool = False,
+        barriers: bool = True,
     ) -> QuantumCircuit:
         """Return a NEQR circuit that encodes the image given as input.
 
         Args:
-            image (np.ndarray): The image that will be encoded.
+            image (np.ndarray | SparseImage): The image that will be encoded, sparse
+                                              images are also given as scipy.sparse
+                                              matrices.
             measurements (bool, optional): If we want to add measurements in the circuit.
                                            Defaults to False.
+            compress (bool, optional): If we want to minimize each intensity bit-plane
+                                       as an ESOP and apply one multi-controlled X per
+                                       product term instead of one per pixel.
+                                       Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel. Without
+                                       barriers, the X pairs between consecutive pixels
+                                       are cancelled during the construction.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: The NEQR circuit of the input image.
         """
 
-        qc = self._initialize_circuit(image=image)
-        qc = self._encode_image(quantum_circuit=qc, image=image)
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        qc = self._encode_image(
+            quantum_circuit=qc, image=image, compress=compress, barriers=barriers
+        )
         if measurements:
-            qc = self._add_measurements(quantum_circuit=qc)
+            qc = self._add_measurements(quantum_circuit=qc, barriers=barriers)
 
         return qc
 
-    def _add_measurements(self, quantum_circuit: QuantumCircuit) -> QuantumCircuit:
+    def stream_qasm(
+        self,
+        image: np.ndarray | SparseImage,
+        file: TextIO,
+        measurements: bool = False,
+        compress: bool = False,
+        barriers: bool = False,
+    ) -> None:
+        """Write the NEQR circuit of the image to an OpenQASM 2 file without
+        building the full circuit in memory.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded, sparse
+                                              images are also given as scipy.sparse
+                                              matrices.
+            file (TextIO): The text file where the circuit is written.
+            measurements (bool, optional): If we want to add measurements in the circuit.
+                                           Defaults to False.
+            compress (bool, optional): If we want to minimize the intensity bit-planes.
+                                       Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to False.
+        """
+
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        instructions = self._encoding_instructions(
+            quantum_circuit=qc, image=image, compress=compress, barriers=barriers
+        )
+        if measurements:
+            instructions = chain(
+                instructions,
+                self._measurement_instructions(quantum_circuit=qc, barriers=barriers),
+            )
+
+        write_qasm(quantum_circuit=qc, instructions=instructions, file=file)
+
+    def batch_quantum_circuits(
+        self,
+        images: Iterable[np.ndarray],
+        measurements: bool = False,
+        compress: bool = False,
+        max_workers: int = None,
+        chunksize: int = None,
+    ) -> list:
+        """Return the NEQR circuits of a batch of images.
+
+        The circuit construction is distributed over a process pool and
+        the strategy that was used is stored in last_batch_strategy.
+
+        Args:
+            images (Iterable[np.ndarray]): A stacked array of images or an
+                                           iterable of images.
+            measurements (bool, optional): If we want to add measurements in the circuits.
+                                           Defaults to False.
+            compress (bool, optional): If we want to minimize the intensity bit-planes.
+                                       Defaults to False.
+            max_workers (int, optional): The number of processes. Defaults to None,
+                                         which uses the number of CPUs.
+            chunksize (int, optional): The number of images sent to a worker at once.
+                                       Defaults to None.
+
+        Returns:
+            list: The NEQR circuits of the images, in the input order.
+        """
+
+        circuits, self.last_batch_strategy = encode_images(
+            encoder=self,
+            images=images,
+            max_workers=max_workers,
+            chunksize=chunksize,
+            measurements=measurements,
+            compress=compress,
+        )
+
+        return circuits
+
+    def frame_quantum_circuits(
+        self,
+        series: np.ndarray,
+        time_axis: int = -1,
+        measurements: bool = False,
+        compress: bool = False,
+        barriers: bool = True,
+    ) -> list:
+        """Return the NEQR circuits of the frames of a time series.
+
+        The registers and the Hadamard gates are built once for the frame
+        shape and every frame is encoded on a copy of that circuit.
+
+        Args:
+            series (np.ndarray): The time series, such as a (x, y, z, t) fMRI scan.
+            time_axis (int, optional): The axis of the time steps. Defaults to -1.
+            measurements (bool, optional): If we want to add measurements in the circuits.
+                                           Defaults to False.
+            compress (bool, optional): If we want to minimize the intensity bit-planes.
+                                       Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
+
+        Returns:
+            list: The NEQR circuits of the frames, in time order.
+        """
+
+        frames = time_frames(series=series, time_axis=time_axis)
+        initialized_qc = self._initialize_circuit(image=frames[0], barriers=barriers)
+
+        circuits = []
+        for frame in frames:
+            qc = self._encode_image(
+                quantum_circuit=initialized_qc.copy(),
+                image=frame,
+                compress=compress,
+                barriers=barriers,
+            )
+            if measurements:
+                qc = self._add_measurements(quantum_circuit=qc, barriers=barriers)
+            circuits.append(qc)
+
+        return circuits
+
+    def _layout(self, image_shape: tuple) -> ImageLayout:
+        """Return the layout of an image in the position registers.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            ImageLayout: The layout of the image.
+        """
+
+        return ImageLayout(
+            image_shape=image_shape, rgb=self.rgb, axis_registers=self.axis_registers
+        )
+
+    def bit_layout(self, image_shape: tuple) -> dict:
+        """Return the classical bits of the registers of the NEQR circuit
+        of an image shape.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            dict: The (offset, size) of every classical register name, the
+                  intensity, the position registers and the RGB register.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        registers = [("bits_intensity", self.bit_depth)]
+        registers += [
+            (f"bits_{name}", size)
+            for name, size in zip(layout.register_names, layout.register_sizes)
+        ]
+        if layout.rgb:
+            registers.append(("bits_rgb", 2))
+
+        offsets = np.cumsum([0] + [size for _, size in registers])
+
+        return {
+            name: (int(offset), size)
+            for (name, size), offset in zip(registers, offsets)
+        }
+
+    def _measurement_instructions(
+        self, quantum_circuit: QuantumCircuit, barriers: bool = True
+    ) -> Iterator[tuple]:
+        """Yield the measurements of the NEQR circuit registers.
+
+        Args:
+            quantum_circuit (QuantumCircuit): A NEQR circuit.
+            barriers (bool, optional): If we want barriers between the registers.
+                                       Defaults to True.
+
+        Yields:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qc = quantum_circuit
+        for i in range(len(qc.cregs)):
+            for qubit, clbit in zip(qc.qregs[i], qc.cregs[i]):
+                yield Measure(), [qubit], [clbit]
+            if barriers and i != len(qc.cregs) - 1:
+                yield Barrier(num_qubits=qc.num_qubits), list(qc.qubits), []
+
+    @profiled
+    def _add_measurements(
+        self, quantum_circuit: QuantumCircuit, barriers: bool = True
+    ) -> QuantumCircuit:
         """Add measurements in NEQR circuit.
 
         Args:
             quantum_circuit (QuantumCircuit): A quantum circuit that we want to
                                               add measurements.
+            barriers (bool, optional): If we want barriers between the registers.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: A quantum circuit with measurements.
         """
 
         qc = quantum_circuit
-        for i in range(len(qc.qregs)):
-            qc.measure(qubit=qc.qregs[i], cbit=qc.cregs[i])
-            if i != len(qc.qregs) - 1:
-                qc.barrier()
+        for operation, qargs, cargs in self._measurement_instructions(
+            quantum_circuit=qc, barriers=barriers
+        ):
+            qc.append(operation, qargs=qargs, cargs=cargs)
 
         return qc
 
-    def _initialize_circuit(self, image: np.ndarray) -> QuantumCircuit:
+    @profiled
+    def _initialize_circuit(
+        self, image: np.ndarray | SparseImage, barriers: bool = True
+    ) -> QuantumCircuit:
         """Initialize the NEQR circuit.
 
         Args:
-            image (np.ndarray): The input image.
+            image (np.ndarray | SparseImage): The input image.
+            barriers (bool, optional): If we want a barrier after the Hadamard gates.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: The NEQR circuit initialized.
         """
-        intensity = QuantumRegister(size=8, name="intensity")
-        bits_intensity = ClassicalRegister(size=8, name="bits_intensity")
+        layout = self._layout(image_shape=image.shape)
+        intensity = QuantumRegister(size=self.bit_depth, name="intensity")
+        bits_intensity = ClassicalRegister(size=self.bit_depth, name="bits_intensity")
+        qregs, cregs = [intensity], [bits_intensity]
 
-        if len(image.shape) == 3:
-            if image.shape[2] == 3:
-                num_qubits = int(np.ceil(np.log2(image.shape[0] * image.shape[1])))
-                qubits_index = QuantumRegister(size=num_qubits, name="pixel_indexes")
-                bits_index = ClassicalRegister(
-                    size=num_qubits, name="bits_pixel_indexes"
-                )
-                rgb = QuantumRegister(size=2, name="rgb")
-                rgb_bits = ClassicalRegister(size=2, name="bits_rgb")
+        for name, size in zip(layout.register_names, layout.register_sizes):
+            qregs.append(QuantumRegister(size=size, name=name))
+            cregs.append(ClassicalRegister(size=size, name=f"bits_{name}"))
+        if layout.rgb:
+            qregs.append(QuantumRegister(size=2, name="rgb"))
+            cregs.append(ClassicalRegister(size=2, name="bits_rgb"))
 
-                qc = QuantumCircuit(
-                    intensity, qubits_index, rgb, bits_intensity, bits_index, rgb_bits
-                )
-                qc.h(qubit=rgb)
-            else:
-                num_qubits = int(
-                    np.ceil(np.log2(image.shape[0] * image.shape[1] * image.shape[2]))
-                )
-                qubits_index = QuantumRegister(size=num_qubits, name="pixel_indexes")
-                bits_index = ClassicalRegister(
-                    size=num_qubits, name="bits_pixel_indexes"
-                )
-                qc = QuantumCircuit(intensity, qubits_index, bits_intensity, bits_index)
+        qc = QuantumCircuit(*qregs, *cregs)
+        if layout.rgb:
+            qc.h(qubit=qregs[-1])
 
-        else:
-            num_qubits = int(np.ceil(np.log2(image.shape[0] * image.shape[1])))
-            qubits_index = QuantumRegister(size=num_qubits, name="pixel_indexes")
-            bits_index = ClassicalRegister(size=num_qubits, name="bits_pixel_indexes")
-            qc = QuantumCircuit(intensity, qubits_index, bits_intensity, bits_index)
+        num_ancillas = self._num_ancillas(
+            num_ctrl_qubits=qc.num_qubits - self.bit_depth
+        )
+        if num_ancillas:
+            qc.add_register(QuantumRegister(size=num_ancillas, name="ancilla"))
 
-        qc.h(qubit=qubits_index)
-        qc.barrier()
+        qc.h(qubit=self._index_qubits(quantum_circuit=qc))
+        if barriers:
+            qc.barrier()
 
         return qc
 
+    def _num_ancillas(self, num_ctrl_qubits: int) -> int:
+        """Return the number of ancilla qubits added to the circuit by the
+        decomposition of a multi-controlled X gate.
+
+        Args:
+            num_ctrl_qubits (int): The number of control qubits.
+
+        Returns:
+            int: The number of ancilla qubits.
+        """
+
+        if self.mct_mode == "v-chain":
+            return max(0, num_ctrl_qubits - 2)
+
+        return 0
+
+    def _index_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the position qubits of the NEQR circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The NEQR circuit.
+
+        Returns:
+            list: The qubits of the position registers, lowest bit first.
+        """
+
+        names = ("pixel_indexes",) + ImageLayout.AXIS_NAMES
+
+        return [
+            qubit
+            for register in quantum_circuit.qregs
+            if register.name in names
+            for qubit in register
+        ]
+
+    def _control_qubits(self, quantum_circuit: QuantumCircuit) -> list:
+        """Return the position and colour qubits of the NEQR circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The NEQR circuit.
+
+        Returns:
+            list: The qubits that control the intensity gates.
+        """
+
+        qregs = {register.name: register for register in quantum_circuit.qregs}
+        control_qubits = self._index_qubits(quantum_circuit=quantum_circuit)
+        if "rgb" in qregs:
+            control_qubits += list(qregs["rgb"])
+
+        return control_qubits
+
+    def _mct_gate(self, num_ctrl_qubits: int) -> Gate:
+        """Return a multi-controlled X gate decomposed with the mct_mode
+        of the encoder.
+
+        Args:
+            num_ctrl_qubits (int): The number of control qubits.
+
+        Returns:
+            Gate: The multi-controlled X gate, or a X gate without controls.
+        """
+
+        if num_ctrl_qubits == 0:
+            return XGate()
+        if self.mct_mode == "v-chain" and num_ctrl_qubits > 2:
+            return MCXVChain(num_ctrl_qubits=num_ctrl_qubits)
+        if self.mct_mode == "recursion" and num_ctrl_qubits > 4:
+            return MCXRecursive(num_ctrl_qubits=num_ctrl_qubits)
+
+        return MCXGrayCode(num_ctrl_qubits=num_ctrl_qubits)
+
+    def _mct_instruction(
+        self,
+        quantum_circuit: QuantumCircuit,
+        controls: list,
+        target: int,
+        gates: dict,
+    ) -> tuple:
+        """Return a multi-controlled X on an intensity qubit decomposed
+        with the mct_mode of the encoder.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized NEQR circuit.
+            controls (list): The control qubits.
+            target (int): The index of the intensity qubit.
+            gates (dict): A cache of the gates by number of controls.
+
+        Returns:
+            tuple: The (operation, qargs, cargs) instruction.
+        """
+
+        qc = quantum_circuit
+        num_ctrl_qubits = len(controls)
+        qargs = controls + [qc.qregs[0][target]]
+
+        if num_ctrl_qubits not in gates:
+            gates[num_ctrl_qubits] = self._mct_gate(num_ctrl_qubits=num_ctrl_qubits)
+        gate = gates[num_ctrl_qubits]
+
+        num_ancillas = gate.num_qubits - len(qargs)
+        if isinstance(gate, MCXRecursive) and num_ancillas:
+            qargs.append(qc.qregs[0][(target + 1) % qc.qregs[0].size])
+        elif num_ancillas:
+            qargs += list(qc.qregs[-1])[:num_ancillas]
+
+        return gate, qargs, []
+
+    def _pixel_intensities(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Quantize the image into integer intensities per colour channel.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+
+        Returns:
+            np.ndarray: A matrix of shape (channels, pixels) with the
+                        bit_depth-bit intensity of each pixel.
+        """
+
+        image = to_dense_image(image=image)
+        channels = self._layout(image_shape=image.shape).channel_matrix(image=image)
+
+        return self._quantize(values=channels)
+
+    def _quantize(self, values: np.ndarray) -> np.ndarray:
+        """Quantize pixel values in [0, 1] to bit_depth-bit integers.
+
+        Args:
+            values (np.ndarray): The pixel values.
+
+        Returns:
+            np.ndarray: The integer intensities.
+        """
+
+        return np.round((2**self.bit_depth - 1) * values).astype(np.int64)
+
+    def _nonzero_intensities(self, image: np.ndarray | SparseImage) -> tuple:
+        """Return the nonzero bit_depth-bit intensities of the image.
+
+        Sparse images are quantized from their coordinate list, so the
+        work is proportional to the number of nonzero pixels.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+
+        Returns:
+            tuple: The number of channels, the number of pixels per channel and
+                   the channels, positions and intensities of the nonzero pixels
+                   sorted by channel and position.
+        """
+
+        if is_sparse_image(image):
+            n, num_pixels, channels, pixels, values = sparse_channel_pixels(
+                image=image, layout=self._layout(image_shape=image.shape)
+            )
+            intensities = self._quantize(values=values)
+            nonzero = intensities != 0
+            return (
+                n,
+                num_pixels,
+                channels[nonzero],
+                pixels[nonzero],
+                intensities[nonzero],
+            )
+
+        pixel_intensity = self._pixel_intensities(image=image)
+        n, num_pixels = pixel_intensity.shape
+        channels, pixels = np.nonzero(pixel_intensity)
+
+        return n, num_pixels, channels, pixels, pixel_intensity[channels, pixels]
+
+    def _pixel_flip_masks(
+        self,
+        num_channels: int,
+        channels: np.ndarray,
+        pixels: np.ndarray,
+        num_index_qubits: int,
+    ) -> np.ndarray:
+        """Return the control qubits flipped to select each pixel.
+
+        Args:
+            num_channels (int): The number of colour channels.
+            channels (np.ndarray): The channel of each pixel.
+            pixels (np.ndarray): The position of each pixel.
+            num_index_qubits (int): The number of qubits in the position register.
+
+        Returns:
+            np.ndarray: A boolean matrix of shape (pixels, control qubits)
+                        that is True for the control qubits in |0>.
+        """
+
+        position_bits = self._position_bits(
+            positions=pixels, num_qubits=num_index_qubits
+        )
+        channel_flips = np.zeros((num_channels, 0), dtype=bool)
+        if num_channels != 1:
+            channel_flips = np.array([[True, True], [False, True], [True, False]])
+
+        return np.concatenate((~position_bits, channel_flips[channels]), axis=1)
+
+    def _position_bits(self, positions: np.ndarray, num_qubits: int) -> np.ndarray:
+        """Return the binary representation of pixel positions.
+
+        Args:
+            positions (np.ndarray): The positions of the pixels.
+            num_qubits (int): The number of qubits in the position register.
+
+        Returns:
+            np.ndarray: A boolean matrix of shape (pixels, qubits) where the
+                        column idx holds the bit of weight 2**idx.
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+
+        return ((positions[:, None] >> np.arange(num_qubits)) & 1).astype(bool)
+
+    def _intensity_bitplanes(self, intensities: np.ndarray) -> np.ndarray:
+        """Return the bit-planes of the pixel intensities.
+
+        Args:
+            intensities (np.ndarray): The integer intensities of the pixels.
+
+        Returns:
+            np.ndarray: A boolean array with an extra trailing axis of size
+                        bit_depth where the entry idx holds the bit of
+                        weight 2**idx.
+        """
+
+        return ((intensities[..., None] >> np.arange(self.bit_depth)) & 1).astype(bool)
+
+    @profiled
     def _encode_image(
-        self, quantum_circuit: QuantumCircuit, image: np.ndarray
+        self,
+        quantum_circuit: QuantumCircuit,
+        image: np.ndarray | SparseImage,
+        compress: bool = False,
+        barriers: bool = True,
     ) -> QuantumCircuit:
         """Encode an image in the quantum circuit.
 
         Args:
             quantum_circuit (QuantumCircuit): The initialized NEQR circuit.
-            image (np.ndarray): The image that will be encoded
+            image (np.ndarray | SparseImage): The image that will be encoded
                                 in the quantum circuit.
+            compress (bool, optional): If we want to minimize the intensity bit-planes.
+                                       Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
 
         Returns:
             QuantumCircuit: A full NEQR circuit.
         """
 
         qc = quantum_circuit
+        for operation, qargs, cargs in self._encoding_instructions(
+            quantum_circuit=qc, image=image, compress=compress, barriers=barriers
+        ):
+            qc._append(operation, qargs, cargs)
 
-        len_image_shape = len(image.shape)
+        return qc
 
-        if len_image_shape == 2:
-            n = 1
-        else:
-            if image.shape[2] == 3:
-                n = len_image_shape
-            else:
-                n = 1
-
-        num_pixel = 2 ** len(qc.qregs[1])
-        if len(image.shape) == 3 and n == 1:
-            aux_bin_list = [bin(i)[2:] for i in range(num_pixel)][
-                : image.shape[0] * image.shape[1] * image.shape[2]
-            ]
+    def _encoding_instructions(
+        self,
+        quantum_circuit: QuantumCircuit,
+        image: np.ndarray | SparseImage,
+        compress: bool = False,
+        barriers: bool = True,
+    ) -> Iterator[tuple]:
+        """Return the instructions that encode an image in the quantum circuit.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized NEQR circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded
+                                in the quantum circuit.
+            compress (bool, optional): If we want to minimize the intensity bit-planes.
+                                       Defaults to False.
+            barriers (bool, optional): If we want a barrier after every pixel.
+                                       Defaults to True.
+
+        Returns:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qc = quantum_circuit
+
+        control_qubits = self._control_qubits(quantum_circuit=qc)
+
+        if compress:
+            terms = self._compressed_terms(quantum_circuit=qc, image=image)
         else:
-            aux_bin_list = [bin(i)[2:] for i in range(num_pixel)][
-                : image.shape[0] * image.shape[1]
-            ]
-        aux_len_bin_list = [len(binary_num) for binary_num in aux_bin_list]
-        max_length = max(aux_len_bin_list)
-        binary_list = []
-
-        for bnum in aux_bin_list:
-            if len(bnum) < max_length:
-                new_binary = ""
-                for _ in range(max_length - len(bnum)):
-                    new_binary += "0"
-                new_binary += bnum
-                binary_list.append(new_binary)
-            else:
-                binary_list.append(bnum)
-
-        for j in range(n):
-            pixel_intensity = []
-            if n == 1:
-                pixels_matrix = image
-            else:
-                pixels_matrix = image[:, :, j]
-            if len(image.shape) == 3 and n == 1:
-                for row in pixels_matrix:
-                    for column in row:
-                        for entry in column:
-                            intensity = int(np.round(255 * entry))
-                            pixel_intensity.append(intensity)
-            else:
-                for row in pixels_matrix:
-                    for entry in row:
-                        intensity = int(np.round(255 * entry))
-                        pixel_intensity.append(intensity)
-
-            binary_pixel_intensity = [
-                bin(p_intensity)[2:] for p_intensity in pixel_intensity
+            terms = self._pixel_terms(quantum_circuit=qc, image=image)
+
+        return controlled_instructions(
+            terms=terms,
+            control_qubits=control_qubits,
+            barrier_qubits=list(qc.qubits),
+            barriers=barriers,
+        )
+
+    def _pixel_terms(
+        self, quantum_circuit: QuantumCircuit, image: np.ndarray | SparseImage
+    ) -> Iterator[tuple]:
+        """Yield one term controlled on the position of every nonzero pixel.
+
+        The position bits and the intensity bit-planes are computed as
+        NumPy arrays in a single pass and the gates are emitted from
+        those arrays, skipping the per-pixel string manipulation.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized NEQR circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Yields:
+            Iterator[tuple]: The flip mask of the control qubits and the
+                             multi-controlled X gates of each pixel.
+        """
+
+        qc = quantum_circuit
+
+        n, _, channels, pixels, intensities = self._nonzero_intensities(image=image)
+        flip_masks = self._pixel_flip_masks(
+            num_channels=n,
+            channels=channels,
+            pixels=pixels,
+            num_index_qubits=len(self._index_qubits(quantum_circuit=qc)),
+        )
+        bitplanes = self._intensity_bitplanes(intensities=intensities)
+
+        control_qubits = self._control_qubits(quantum_circuit=qc)
+        mct_instructions = [
+            self._mct_instruction(
+                quantum_circuit=qc, controls=control_qubits, target=idx, gates={}
+            )
+            for idx in range(len(qc.qregs[0]))
+        ]
+
+        for flip_mask, bits in zip(flip_masks, bitplanes):
+            instructions = [mct_instructions[idx] for idx in np.flatnonzero(bits)]
+            yield flip_mask, instructions
+
+    def _minimize_bitplane(self, minterms: np.ndarray, num_variables: int) -> set:
+        """Minimize a bit-plane as an exclusive-or sum of products.
+
+        Cubes are (mask, value) pairs, where mask holds the variables that
+        appear in the product term. Two cubes that only differ in the
+        polarity of one variable are merged into a cube without it, and
+        equal cubes cancel each other, so the exclusive-or of the cubes is
+        always the bit-plane.
+
+        Args:
+            minterms (np.ndarray): The control states where the bit-plane is 1.
+            num_variables (int): The number of control qubits.
+
+        Returns:
+            set: The cubes of the minimized bit-plane.
+        """
+
+        full_mask = 2**num_variables - 1
+        cubes = {(full_mask, int(value)) for value in minterms}
+
+        changed = True
+        while changed:
+            changed = False
+            for var in range(num_variables):
+                bit = 1 << var
+                candidates = [
+                    cube for cube in cubes if cube[0] & bit and not cube[1] & bit
+                ]
+                for mask, value in candidates:
+                    partner = (mask, value | bit)
+                    if (mask, value) not in cubes or partner not in cubes:
+                        continue
+                    cubes.remove((mask, value))
+                    cubes.remove(partner)
+                    merged = (mask & ~bit, value)
+                    if merged in cubes:
+                        cubes.remove(merged)
+                    else:
+                        cubes.add(merged)
+                    changed = True
+
+        return cubes
+
+    def _image_cubes(
+        self, image: np.ndarray | SparseImage, num_index_qubits: int
+    ) -> dict:
+        """Return the minimized product terms of every intensity bit-plane.
+
+        Args:
+            image (np.ndarray | SparseImage): The input image.
+            num_index_qubits (int): The number of qubits in the position register.
+
+        Returns:
+            dict: A dictionary that maps each cube to the list of
+                  intensity qubits that it targets.
+        """
+
+        n, _, channels, pixels, intensities = self._nonzero_intensities(image=image)
+        bitplanes = self._intensity_bitplanes(intensities=intensities)
+
+        states = (channels << num_index_qubits) + pixels
+        num_variables = num_index_qubits + (2 if n != 1 else 0)
+
+        image_cubes = {}
+        for idx in range(bitplanes.shape[-1]):
+            minterms = states[bitplanes[:, idx]]
+            for cube in self._minimize_bitplane(
+                minterms=minterms, num_variables=num_variables
+            ):
+                image_cubes.setdefault(cube, []).append(idx)
+
+        return image_cubes
+
+    def _compressed_terms(
+        self, quantum_circuit: QuantumCircuit, image: np.ndarray | SparseImage
+    ) -> Iterator[tuple]:
+        """Yield one term per cube of the minimized bit-planes.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The initialized NEQR circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Yields:
+            Iterator[tuple]: The flip mask of the control qubits and the
+                             multi-controlled X gates of each cube.
+        """
+
+        qc = quantum_circuit
+
+        control_qubits = self._control_qubits(quantum_circuit=qc)
+        variables = np.arange(len(control_qubits))
+
+        image_cubes = self._image_cubes(
+            image=image, num_index_qubits=len(self._index_qubits(quantum_circuit=qc))
+        )
+        mct_gates = {}
+
+        for (mask, value), targets in sorted(image_cubes.items()):
+            mask_bits = ((mask >> variables) & 1).astype(bool)
+            value_bits = ((value >> variables) & 1).astype(bool)
+            controls = [control_qubits[idx] for idx in np.flatnonzero(mask_bits)]
+            instructions = [
+                self._mct_instruction(
+                    quantum_circuit=qc, controls=controls, target=idx, gates=mct_gates
+                )
+                for idx in targets
             ]
+            yield mask_bits & ~value_bits, instructions
 
-            for k, bnum in enumerate(binary_list):
-
-                if binary_pixel_intensity[k] != "0":
-                    for idx, element in enumerate(bnum[::-1]):
-                        if element == "0":
-                            qc.x(qubit=qc.qregs[1][idx])
-                    if n != 1:
-                        if j == 0:
-                            qc.x(qubit=qc.qregs[2])
-                        elif j == 1:
-                            qc.x(qubit=qc.qregs[2][1])
-                        elif j == 2:
-                            qc.x(qubit=qc.qregs[2][0])
-
-                    for idx, element in enumerate(binary_pixel_intensity[k][::-1]):
-                        if element == "1":
-                            if n == 1:
-                                qc.mct(
-                                    control_qubits=qc.qregs[1],
-                                    target_qubit=qc.qregs[0][idx],
-                                )
-                            else:
-                                control_qubits_list = list(qc.qregs[1]) + list(
-                                    qc.qregs[2]
-                                )
-                                qc.mct(
-                                    control_qubits=control_qubits_list,
-                                    target_qubit=qc.qregs[0][idx],
-                                )
-
-                    for idx, element in enumerate(bnum[::-1]):
-                        if element == "0":
-                            qc.x(qubit=qc.qregs[1][idx])
-
-                    if n != 1:
-                        if j == 0:
-                            qc.x(qubit=qc.qregs[2])
-                        elif j == 1:
-                            qc.x(qubit=qc.qregs[2][1])
-                        elif j == 2:
-                            qc.x(qubit=qc.qregs[2][0])
-                    qc.barrier()
+    def compression_report(self, image: np.ndarray) -> dict:
+        """Report the multi-controlled X reduction of the compressed encoding.
 
-        return qc
+        Args:
+            image (np.ndarray): The input image.
 
-    def _calculate_pixel_intensity_from_intensity_string(
-        self, intensity_strings: list
-    ) -> list:
-        """Calculate the intensity of a pixel from a pixel string.
+        Returns:
+            dict: The number of multi-controlled X gates applied by the
+                  per-pixel encoding ("pixel_terms") and by the compressed
+                  encoding ("compressed_terms"), and the fraction of gates
+                  removed ("reduction").
+        """
+
+        pixel_intensity = self._pixel_intensities(image=image)
+        pixel_terms = int(self._intensity_bitplanes(intensities=pixel_intensity).sum())
+        num_index_qubits = self._layout(image_shape=image.shape).num_index_qubits
+        image_cubes = self._image_cubes(image=image, num_index_qubits=num_index_qubits)
+        compressed_terms = sum(len(targets) for targets in image_cubes.values())
+        reduction = 1 - compressed_terms / pixel_terms if pixel_terms else 0.0
+
+        return {
+            "pixel_terms": pixel_terms,
+            "compressed_terms": compressed_terms,
+            "reduction": reduction,
+        }
+
+    def estimate_resources(
+        self,
+        image: np.ndarray | SparseImage | tuple,
+        measurements: bool = False,
+        compress: bool = False,
+        barriers: bool = True,
+    ) -> dict:
+        """Return the resources of the NEQR circuit of an image without
+        building the circuit.
+
+        The gate counts and the depth follow from the image shape and the
+        set bits of the pixel intensities, given only the shape the estimate
+        is the worst case of an image with every intensity bit set.
+
+        Args:
+            image (np.ndarray | SparseImage | tuple): The image that will be
+                                                      encoded or its shape.
+            measurements (bool, optional): If the circuit has measurements.
+                                           Defaults to False.
+            compress (bool, optional): If the intensity bit-planes are minimized,
+                                       which runs the minimization of the image.
+                                       Defaults to False.
+            barriers (bool, optional): If the circuit has barriers. Defaults to True.
+
+        Raises:
+            ValueError: If compress is True and only the image shape is given.
+
+        Returns:
+            dict: The num_qubits, gate_counts, cx_count, depth and
+                  statevector_memory in bytes of the circuit.
+        """
+
+        if isinstance(image, tuple):
+            if compress:
+                raise ValueError("The compressed estimate needs the image!")
+            image = np.ones(image)
+
+        qc = self._initialize_circuit(image=image, barriers=barriers)
+        if compress:
+            instructions = self._encoding_instructions(
+                quantum_circuit=qc, image=image, compress=True, barriers=barriers
+            )
+            if measurements:
+                instructions = chain(
+                    instructions,
+                    self._measurement_instructions(
+                        quantum_circuit=qc, barriers=barriers
+                    ),
+                )
+            gate_counts, cx_count, depth = stream_resources(
+                quantum_circuit=qc, instructions=instructions
+            )
+            return resource_estimate(
+                num_qubits=qc.num_qubits,
+                gate_counts=gate_counts,
+                cx_count=cx_count,
+                depth=depth,
+            )
+
+        n, _, channels, pixels, intensities = self._nonzero_intensities(image=image)
+        num_ctrl_qubits = len(self._control_qubits(quantum_circuit=qc))
+        flip_masks = self._pixel_flip_masks(
+            num_channels=n,
+            channels=channels,
+            pixels=pixels,
+            num_index_qubits=len(self._index_qubits(quantum_circuit=qc)),
+        )
+        num_instructions = self._intensity_bitplanes(intensities=intensities).sum(
+            axis=-1
+        )
+
+        mct_gate = self._mct_gate(num_ctrl_qubits=num_ctrl_qubits)
+        num_barriers = int(barriers) * (1 + len(flip_masks))
+        depth = int(num_ctrl_qubits > 0) + controlled_terms_depth(
+            flip_masks=flip_masks, num_instructions=num_instructions, barriers=barriers
+        )
+        if measurements:
+            num_barriers += int(barriers) * (len(qc.cregs) - 1)
+            depth += len(qc.cregs) if barriers else 1
+
+        gate_counts = {
+            "h": num_ctrl_qubits,
+            "barrier": num_barriers,
+            "x": flip_gate_count(flip_masks=flip_masks, barriers=barriers),
+            mct_gate.name: int(num_instructions.sum()),
+            "measure": qc.num_clbits * measurements,
+        }
+
+        return resource_estimate(
+            num_qubits=qc.num_qubits,
+            gate_counts=gate_counts,
+            cx_count=gate_counts[mct_gate.name]
+            * decomposed_cx_count(operation=mct_gate),
+            depth=depth,
+        )
+
+    def image_statevector(self, image: np.ndarray) -> np.ndarray:
+        """Return the statevector of the NEQR circuit of the image
+        without building or simulating the circuit.
 
         Args:
-            intensity_strings (list): A list with the binary strings
-                                      that represents the intensities
-                                      of each pixel in the image.
+            image (np.ndarray): The image that will be encoded.
 
         Returns:
-            list: An array with the pixels intensity.
+            np.ndarray: The real amplitudes of the NEQR state in the
+                        qubit ordering of the NEQR circuit.
         """
 
-        pixel_intensity = []
+        pixel_intensity = self._pixel_intensities(image=image)
+        n, num_pixels = pixel_intensity.shape
+        num_pixel = 2 ** int(np.ceil(np.log2(num_pixels)))
+        num_channel_states = 4 if n != 1 else 1
 
-        for string in intensity_strings:
-            intensity = 0
-            for idx, char in enumerate(string):
-                if char == "1":
-                    intensity += 2 ** (7 - idx)
-            intensity = intensity / 255
-            pixel_intensity.append(intensity)
+        intensities = np.zeros((num_channel_states, num_pixel), dtype=np.int64)
+        intensities[:n, :num_pixels] = pixel_intensity
+        basis_states = intensities.reshape(-1) + 2**self.bit_depth * np.arange(
+            intensities.size
+        )
+        num_ancillas = self._num_ancillas(
+            num_ctrl_qubits=int(np.log2(intensities.size))
+        )
+
+        state = np.zeros(2 ** (self.bit_depth + num_ancillas) * intensities.size)
+        state[basis_states] = 1 / np.sqrt(intensities.size)
 
-        return pixel_intensity
+        return state
 
+    def image_probabilities(self, image: np.ndarray) -> np.ndarray:
+        """Return the measurement probabilities of the NEQR circuit of
+        the image without building or simulating the circuit.
+
+        Args:
+            image (np.ndarray): The image that will be encoded.
+
+        Returns:
+            np.ndarray: The probability of each basis state in the
+                        qubit ordering of the NEQR circuit.
+        """
+
+        return self.image_statevector(image=image) ** 2
+
+    def _outcome_arrays(
+        self, outcomes: np.ndarray, shots: np.ndarray, image_shape: tuple
+    ) -> tuple:
+        """Split the integer outcomes of a NEQR circuit into its registers.
+
+        Args:
+            outcomes (np.ndarray): The integer outcomes, see histogram.counts_outcomes.
+            shots (np.ndarray): The number of shots of every outcome.
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            tuple: The arrays with the intensity, the position index, the
+                   colour channel and the number of shots of the outcomes
+                   of the pixels of the image.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        bit_layout = self.bit_layout(image_shape=image_shape)
+        outcomes = np.asarray(outcomes, dtype=np.int64)
+
+        intensity = register_values(
+            outcomes=outcomes, layout=bit_layout, name="bits_intensity"
+        )
+        index, offset = np.zeros_like(outcomes), 0
+        for name, size in zip(layout.register_names, layout.register_sizes):
+            index |= (
+                register_values(
+                    outcomes=outcomes, layout=bit_layout, name=f"bits_{name}"
+                )
+                << offset
+            )
+            offset += size
+        channel = np.zeros_like(outcomes)
+        if layout.rgb:
+            channel = register_values(
+                outcomes=outcomes, layout=bit_layout, name="bits_rgb"
+            )
+
+        valid = (channel < layout.num_channels) & (index < layout.num_positions)
+
+        return intensity[valid], index[valid], channel[valid], np.asarray(shots)[valid]
+
+    def _image_from_outcomes(
+        self, outcomes: np.ndarray, shots: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Recover the image from the integer outcomes of a NEQR circuit.
+
+        Args:
+            outcomes (np.ndarray): The integer outcomes.
+            shots (np.ndarray): The number of shots of every outcome.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        num_channels, num_pixels = layout.num_channels, layout.num_positions
+
+        intensity, index, channel, shots = self._outcome_arrays(
+            outcomes=outcomes, shots=shots, image_shape=image_shape
+        )
+        slots = channel * num_pixels + index
+
+        order = np.lexsort((shots, slots))
+        sorted_slots = slots[order]
+        last_of_slot = np.append(sorted_slots[1:] != sorted_slots[:-1], True)
+        most_frequent = order[last_of_slot[: order.size]]
+
+        pixel_intensity = np.zeros(num_channels * num_pixels)
+        pixel_intensity[slots[most_frequent]] = intensity[most_frequent] / (
+            2**self.bit_depth - 1
+        )
+
+        return layout.image_from_channel_matrix(
+            matrix=pixel_intensity.reshape(num_channels, num_pixels)
+        )
+
+    @profiled
     def reconstruct_image_from_neqr_result(
         self, counts: dict, image_shape: tuple
     ) -> np.ndarray:
         """Reconstruct the image encoded on NEQR circuit.
 
+        The intensity of each pixel is the most frequent intensity measured
+        with the position index of the pixel, so a few noisy shots do not
+        corrupt the reconstruction.
+
         Args:
-            counts (dict): The dictionary with the results
-                           of the experiments with NEQR circuit.
+            counts (dict): The dictionary with the results of the experiments
+                           with NEQR circuit, with bit string keys or the
+                           hexadecimal keys of Executor.get_raw_counts.
             image_shape (tuple): The shape of the image that
                                  we want to reconstruct.
 
         Raises:
-            ValueError: If image_shape is not a tuple
-                        with length equal to 2 or 3.
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
 
         Returns:
             np.ndarray: Image matrix.
         """
 
-        keys_list = sorted(list(counts.keys()))
+        outcomes, shots = counts_outcomes(counts=counts)
 
-        if len(keys_list[0].split(" ")) == 2:
-            if image_shape[0] == image_shape[1]:
-                intensity_strings = [key.split(" ")[1] for key in keys_list]
-            else:
-                intensity_strings = [key.split(" ")[1] for key in keys_list][
-                    : image_shape[0] * image_shape[1]
-                ]
-        elif len(keys_list[0].split(" ")) == 3:
-            processed_keys = [key for key in keys_list if key.split(" ")[0] != "11"]
-            if image_shape[0] == image_shape[1]:
-                intensity_strings = [key.split(" ")[2] for key in processed_keys]
-            else:
-                intensity_strings = [key.split(" ")[2] for key in processed_keys][
-                    : image_shape[0] * image_shape[1]
-                ]
+        return self._image_from_outcomes(
+            outcomes=outcomes, shots=shots, image_shape=image_shape
+        )
+
+    @profiled
+    def reconstruct_image_from_histogram(
+        self, histogram: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Reconstruct the image encoded on NEQR circuit from the dense
+        histogram of its integer outcomes.
+
+        Args:
+            histogram (np.ndarray): The shots of every integer outcome, such as
+                                    the histograms of Executor.get_histograms.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
 
-        pixel_intensity = self._calculate_pixel_intensity_from_intensity_string(
-            intensity_strings=intensity_strings
+        Raises:
+            ValueError: If image_shape is not a tuple with length equal to 2 or 3,
+                        or with 2 to 4 spatial axes for the axis registers.
+
+        Returns:
+            np.ndarray: Image matrix.
+        """
+
+        outcomes = np.flatnonzero(histogram)
+
+        return self._image_from_outcomes(
+            outcomes=outcomes,
+            shots=np.asarray(histogram)[outcomes],
+            image_shape=image_shape,
         )
 
-        if len(image_shape) == 3:
-            if image_shape[2] == 3:
-                pixel_intensity_rgb = np.split(np.array(pixel_intensity), 3)
-                image = np.zeros(image_shape)
-                for i, channel in enumerate(pixel_intensity_rgb):
-                    channel_np = np.array(channel).reshape(
-                        (image.shape[0], image.shape[1])
-                    )
-                    for j, row in enumerate(channel_np):
-                        for k, entry in enumerate(row):
-                            image[j, k, i] = entry
-                return image
-            else:
-                image = np.array(pixel_intensity).reshape(image_shape)
-                return image
-        elif len(image_shape) == 2:
-            image = np.array(pixel_intensity).reshape(image_shape)
-            return image
-        else:
-            raise ValueError(
-                "Image shape should be a tuple of length 2 for images in gray scale or a tuple of length 3 for RGB images and 3D images!"
+    def reconstruct_images(
+        self, quantum_circuits: list, image_shape: tuple, shots: int = None
+    ) -> list:
+        """Reconstruct the images encoded on a list of NEQR circuits with
+        measurements, simulating all of them in a single batched job.
+
+        Args:
+            quantum_circuits (list): The NEQR circuits with measurements.
+            image_shape (tuple): The shape of the images that
+                                 we want to reconstruct.
+            shots (int, optional): The number of shots. Defaults to None,
+                                   which uses the executor shots.
+
+        Returns:
+            list: The reconstructed images.
+        """
+
+        counts_list = self.executor.get_raw_counts(
+            quantum_circuits=quantum_circuits, shots=shots
+        )
+
+        return [
+            self.reconstruct_image_from_neqr_result(
+                counts=counts, image_shape=image_shape
             )
+            for counts in counts_list
+        ]
+
+    def pixel_errors(self, counts: dict, image_shape: tuple) -> np.ndarray:
+        """Return the confidence of the reconstruction of every pixel.
+
+        The error of a pixel is the Hoeffding bound exp(-n * m^2 / 2) of the
+        probability that the majority vote picks a wrong intensity, where n
+        is the number of shots with the position of the pixel and m is the
+        margin between the fractions of its two most frequent intensities.
+
+        Args:
+            counts (dict): The dictionary with the results of the experiments
+                           with NEQR circuit, with bit string keys or the
+                           hexadecimal keys of Executor.get_raw_counts.
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            np.ndarray: The error of every pixel, with the image shape,
+                        1 for the pixels that were never measured.
+        """
+
+        layout = self._layout(image_shape=image_shape)
+        num_channels, num_pixels = layout.num_channels, layout.num_positions
+        num_slots = num_channels * num_pixels
+
+        outcomes, shots = counts_outcomes(counts=counts)
+        _, index, channel, shots = self._outcome_arrays(
+            outcomes=outcomes, shots=shots, image_shape=image_shape
+        )
+        slots = channel * num_pixels + index
+
+        totals = np.bincount(slots, weights=shots, minlength=num_slots)
+        order = np.lexsort((-shots, slots))
+        sorted_slots, sorted_shots = slots[order], shots[order]
+        first = np.ones(sorted_slots.size, dtype=bool)
+        first[1:] = sorted_slots[1:] != sorted_slots[:-1]
+        second = np.zeros(sorted_slots.size, dtype=bool)
+        second[1:] = first[:-1] & ~first[1:]
+
+        top, runner_up = np.zeros(num_slots), np.zeros(num_slots)
+        top[sorted_slots[first]] = sorted_shots[first]
+        runner_up[sorted_slots[second]] = sorted_shots[second]
+
+        margin = np.divide(
+            top - runner_up, totals, out=np.zeros(num_slots), where=totals > 0
+        )
+        errors = np.where(totals > 0, np.exp(-totals * margin**2 / 2), 1.0)
+
+        return layout.image_from_channel_matrix(
+            matrix=errors.reshape(num_channels, num_pixels)
+        )
+
+    def reconstruct_image_adaptively(
+        self,
+        quantum_circuit: QuantumCircuit,
+        image_shape: tuple,
+        target_error: float = 0.05,
+        fraction: float = 1.0,
+        initial_shots: int = None,
+        max_shots: int = 2**20,
+    ) -> dict:
+        """Reconstruct the image encoded on a NEQR circuit, running shots in
+        increments until the pixels meet a target error.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The NEQR circuit with measurements.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+            target_error (float, optional): The bound of the probability of a wrong
+                                            intensity, see pixel_errors.
+                                            Defaults to 0.05.
+            fraction (float, optional): The fraction of pixels that must meet the
+                                        target error. Defaults to 1.0.
+            initial_shots (int, optional): The shots of the first round. Defaults to
+                                           None, which expects the 2 * ln(1 / target_error)
+                                           shots that a noiseless pixel needs per basis
+                                           state of the position and colour registers.
+            max_shots (int, optional): The budget of shots. Defaults to 2**20.
+
+        Returns:
+            dict: The reconstructed "image" and the sampling report of
+                  adaptive_counts.
+        """
+
+        if initial_shots is None:
+            num_ctrl_qubits = len(self._control_qubits(quantum_circuit=quantum_circuit))
+            shots_per_pixel = np.ceil(2 * np.log(1 / target_error))
+            initial_shots = int(shots_per_pixel * 2**num_ctrl_qubits)
+
+        report = adaptive_counts(
+            executor=self.executor,
+            quantum_circuit=quantum_circuit,
+            pixel_errors=lambda counts: self.pixel_errors(
+                counts=counts, image_shape=image_shape
+            ),
+            target_error=target_error,
+            fraction=fraction,
+            initial_shots=initial_shots,
+            max_shots=max_shots,
+        )
+        report["image"] = self.reconstruct_image_from_neqr_result(
+            counts=report["counts"], image_shape=image_shape
+        )
+
+        return report
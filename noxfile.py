@@ -11,9 +11,18 @@ def tests_coverage(session):
     session.run("pytest", "--cov=./", "--cov-report=xml")
     
 
+@nox.session(name="benchmarks")
+def benchmarks(session):
+    """ Run the benchmark suite and save the results in benchmark_results.json,
+    pass --baseline <file> to report the regressions against a previous run.
+    """
+    session.install("-r", "requirements.txt")
+    session.run("python", "-m", "benchmarks", *session.posargs)
+
+
 @nox.session(name="style")
 def style_check(session):
     """ Install black and test if the linting is correct.
     """
     session.install("black")
-    session.run("black", "--check", "--diff", "tests", "neqr", "frqi", "qpie")
+    session.run("black", "--check", "--diff", "tests", "neqr", "frqi", "qpie", "batch", "execution", "qhed", "tiling", "emission", "benchmarks", "resources", "sparsity", "layout", "sampling", "caching", "profiling", "histogram", "dataset")
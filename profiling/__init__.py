@@ -0,0 +1 @@
+from .profiling import ProfileCollector, active_collector, profile_stage, profiled
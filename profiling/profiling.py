@@ -0,0 +1,249 @@
+from __future__ import annotations
+import csv
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+from qiskit.circuit import QuantumCircuit
+
+FIELDS = ("stage", "parent", "wall_time", "gate_count", "peak_memory")
+_ACTIVE_COLLECTOR = ContextVar("active_collector", default=None)
+
+
+class ProfileCollector:
+    """ProfileCollector class"""
+
+    def __init__(self, memory: bool = False) -> ProfileCollector:
+        """Initialize a collector of the stage records of the pipeline.
+
+        The collector records the stages run inside its context, subclasses
+        can override record to send the records somewhere else.
+
+        Args:
+            memory (bool, optional): If we want the peak memory of every stage,
+                                     traced with tracemalloc, which slows down
+                                     the stages. Defaults to False.
+        """
+
+        self.memory = memory
+        self.records = []
+        self._stack = []
+        self._token = None
+        self._started_tracing = False
+
+    def __enter__(self) -> ProfileCollector:
+        """Activate the collector in the current context.
+
+        Returns:
+            ProfileCollector: The collector.
+        """
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _ACTIVE_COLLECTOR.set(self)
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Deactivate the collector and stop the tracing it started."""
+
+        _ACTIVE_COLLECTOR.reset(self._token)
+        self._token = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def record(self, record: dict) -> None:
+        """Store the record of a finished stage.
+
+        Args:
+            record (dict): The stage, parent, wall_time, gate_count
+                           and peak_memory of the stage.
+        """
+
+        self.records.append(record)
+
+    def _start(self, stage: str) -> dict:
+        """Open a stage.
+
+        The peak of tracemalloc is reset at the start of every stage, so the
+        peak reached by a nested stage is kept on the stack for its parents.
+
+        Args:
+            stage (str): The name of the stage.
+
+        Returns:
+            dict: The record of the stage, filled when it finishes.
+        """
+
+        record = dict.fromkeys(FIELDS)
+        record["stage"] = stage
+        record["parent"] = self._stack[-1][0]["stage"] if self._stack else None
+        memory = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][1][1] = max(self._stack[-1][1][1], peak)
+            tracemalloc.reset_peak()
+            memory = [current, current]
+        self._stack.append((record, memory))
+
+        return record
+
+    def _finish(self, record: dict, wall_time: float) -> None:
+        """Close the innermost stage and pass its record to the collector.
+
+        Args:
+            record (dict): The record returned by _start.
+            wall_time (float): The duration of the stage in seconds.
+        """
+
+        _, memory = self._stack.pop()
+        record["wall_time"] = wall_time
+        if memory is not None and tracemalloc.is_tracing():
+            peak = max(memory[1], tracemalloc.get_traced_memory()[1])
+            record["peak_memory"] = peak - memory[0]
+            if self._stack and self._stack[-1][1] is not None:
+                self._stack[-1][1][1] = max(self._stack[-1][1][1], peak)
+        self.record(record=record)
+
+    def summary(self) -> dict:
+        """Return the totals of the records per stage.
+
+        Returns:
+            dict: The calls, total wall_time, total gate_count and maximum
+                  peak_memory of every stage.
+        """
+
+        summary = {}
+        for record in self.records:
+            stage = summary.setdefault(
+                record["stage"],
+                {"calls": 0, "wall_time": 0.0, "gate_count": 0, "peak_memory": None},
+            )
+            stage["calls"] += 1
+            stage["wall_time"] += record["wall_time"]
+            stage["gate_count"] += record["gate_count"] or 0
+            if record["peak_memory"] is not None:
+                stage["peak_memory"] = max(
+                    stage["peak_memory"] or 0, record["peak_memory"]
+                )
+
+        return summary
+
+    def to_json(self, path: str) -> None:
+        """Save the records in a JSON file.
+
+        Args:
+            path (str): The path of the JSON file.
+        """
+
+        with open(path, "w") as file:
+            json.dump(self.records, file, indent=2)
+
+    def to_csv(self, path: str) -> None:
+        """Save the records in a CSV file, with a column per field.
+
+        Args:
+            path (str): The path of the CSV file.
+        """
+
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+
+def active_collector() -> ProfileCollector | None:
+    """Return the collector of the current context.
+
+    Returns:
+        ProfileCollector | None: The active collector, or None when
+                                 the profiling is disabled.
+    """
+
+    return _ACTIVE_COLLECTOR.get()
+
+
+def _gate_count(result: object) -> int | None:
+    """Return the number of instructions of a stage result.
+
+    Args:
+        result (object): The value returned by the stage.
+
+    Returns:
+        int | None: The instructions of a circuit or of a list of circuits,
+                    None for the other results.
+    """
+
+    if isinstance(result, QuantumCircuit):
+        return len(result.data)
+    if (
+        isinstance(result, list)
+        and result
+        and all(isinstance(qc, QuantumCircuit) for qc in result)
+    ):
+        return sum(len(qc.data) for qc in result)
+
+    return None
+
+
+@contextmanager
+def profile_stage(stage: str) -> Iterator[dict | None]:
+    """Record a stage of the pipeline in the active collector.
+
+    Args:
+        stage (str): The name of the stage.
+
+    Yields:
+        Iterator[dict | None]: The record of the stage, where the caller can
+                               set the gate_count, or None when the profiling
+                               is disabled.
+    """
+
+    collector = _ACTIVE_COLLECTOR.get()
+    if collector is None:
+        yield None
+        return
+
+    record = collector._start(stage=stage)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        collector._finish(record=record, wall_time=time.perf_counter() - start)
+
+
+def profiled(function: Callable) -> Callable:
+    """Decorate a function to record it as a stage named after its
+    qualified name, such as "NEQR._encode_image".
+
+    The gate count of the stage is the number of instructions of the
+    returned circuits. Without an active collector the function is called
+    directly, so the decorator only costs a context variable lookup.
+
+    Args:
+        function (Callable): The function of the stage.
+
+    Returns:
+        Callable: The decorated function.
+    """
+
+    stage = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _ACTIVE_COLLECTOR.get() is None:
+            return function(*args, **kwargs)
+
+        with profile_stage(stage=stage) as record:
+            result = function(*args, **kwargs)
+            record["gate_count"] = _gate_count(result=result)
+
+        return result
+
+    return wrapper
@@ -0,0 +1 @@
+from .qhed import QHED
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import numpy as np
+from qiskit.circuit import QuantumCircuit, QuantumRegister
+from qiskit.circuit.library import MCXVChain
+from execution import Executor
+from qpie import QPIE
+
+
+class QHED:
+    """QHED class"""
+
+    def __init__(self, executor: Executor = None, threshold: float = 1e-8) -> QHED:
+        """Initialize the quantum Hadamard edge detection.
+
+        Args:
+            executor (Executor, optional): The executor used to simulate the circuits.
+                                           Defaults to None, which uses the
+                                           statevector executor of QPIE.
+            threshold (float, optional): The minimum absolute amplitude of an edge.
+                                         Defaults to 1e-8.
+        """
+
+        self.qpie = QPIE(executor=executor)
+        self.threshold = threshold
+
+    def _mcx(
+        self, qc: QuantumCircuit, controls: list, target: int, dirty_qubits: list
+    ) -> None:
+        """Append a multi-controlled X gate built from V-chains of Toffoli gates
+        on dirty ancillas, which are qubits in any state that are restored.
+
+        With fewer than k - 2 dirty qubits for k controls, the controls are
+        split in two halves and the gate is applied as two pairs of smaller
+        gates through one dirty qubit, whose ancillas are the other half,
+        so the gate costs O(k) CNOTs with a single dirty qubit.
+
+        Args:
+            qc (QuantumCircuit): The circuit the gate is appended to.
+            controls (list): The control qubits.
+            target (int): The target qubit.
+            dirty_qubits (list): The qubits that can be used as dirty ancillas.
+        """
+
+        num_controls = len(controls)
+        if num_controls <= 2:
+            qc.mcx(control_qubits=controls, target_qubit=target)
+        elif len(dirty_qubits) >= num_controls - 2:
+            qc.append(
+                MCXVChain(num_ctrl_qubits=num_controls, dirty_ancillas=True),
+                qargs=controls + [target] + dirty_qubits[: num_controls - 2],
+            )
+        else:
+            half = (num_controls + 1) // 2
+            for _ in range(2):
+                self._mcx(
+                    qc=qc,
+                    controls=controls[:half],
+                    target=dirty_qubits[0],
+                    dirty_qubits=controls[half:] + [target],
+                )
+                self._mcx(
+                    qc=qc,
+                    controls=controls[half:] + [dirty_qubits[0]],
+                    target=target,
+                    dirty_qubits=controls[:half],
+                )
+
+    def _decrement(self, num_qubits: int) -> QuantumCircuit:
+        """Return a circuit that maps the basis state |j> to |j - 1 mod 2^n>.
+
+        The decrement flips the bit i when all the lower bits are 0, so it
+        is a ladder of multi-controlled X gates with open controls applied
+        from the most significant bit down. The gates use the higher bits
+        and one extra qubit as dirty ancillas, so the circuit has O(n^2)
+        CNOTs instead of the exponential count of the ancilla-free gates.
+
+        Args:
+            num_qubits (int): The number of qubits of the register.
+
+        Returns:
+            QuantumCircuit: The decrement circuit, on the num_qubits qubits of the
+                            register and a last qubit in any state that is restored.
+        """
+
+        qc = QuantumCircuit(num_qubits + 1, name="decrement")
+        qc.x(qubit=range(num_qubits))
+        for i in range(num_qubits - 1, 0, -1):
+            self._mcx(
+                qc=qc,
+                controls=list(range(i)),
+                target=i,
+                dirty_qubits=list(range(i + 1, num_qubits + 1)),
+            )
+        qc.x(qubit=range(1, num_qubits))
+
+        return qc
+
+    def image_quantum_circuit(self, image: np.ndarray) -> QuantumCircuit:
+        """Return the QHED circuit that scans the rows of the image.
+
+        The last qubit is a work qubit of the decrement, which stays in |0>,
+        so the amplitudes of the scan are the first 2^(n + 1) amplitudes.
+
+        Args:
+            image (np.ndarray): The image whose edges will be detected.
+
+        Returns:
+            QuantumCircuit: The QHED circuit of the input image.
+        """
+
+        qc_qpie = self.qpie.image_quantum_circuit(image=image)
+
+        ancilla = QuantumRegister(size=1, name="ancilla")
+        pixel = QuantumRegister(size=qc_qpie.num_qubits, name="pixel")
+        work = QuantumRegister(size=1, name="work")
+        qc = QuantumCircuit(ancilla, pixel, work)
+
+        qc.compose(qc_qpie, qubits=pixel, inplace=True)
+        qc.h(qubit=ancilla)
+        qc.compose(
+            self._decrement(num_qubits=ancilla.size + pixel.size),
+            qubits=list(ancilla) + list(pixel) + list(work),
+            inplace=True,
+        )
+        qc.h(qubit=ancilla)
+
+        return qc
+
+    def _edges_from_statevector(
+        self, statevector: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Threshold the odd amplitudes of a QHED statevector.
+
+        Args:
+            statevector (np.ndarray): The statevector of a QHED circuit.
+            image_shape (tuple): The shape of the scanned image.
+
+        Returns:
+            np.ndarray: A binary matrix with the edges.
+        """
+
+        num_pixels = int(np.prod(image_shape))
+        odd_amplitudes = np.real(statevector[1::2][:num_pixels])
+
+        return (np.abs(odd_amplitudes) > self.threshold).reshape(image_shape)
+
+    def detect_edges(self, image: np.ndarray) -> np.ndarray:
+        """Detect the horizontal and vertical edges of the image.
+
+        The horizontal scan and the vertical scan, which encodes the
+        transposed image, are simulated as a single batched job.
+
+        Args:
+            image (np.ndarray): The gray scale image whose edges will be detected.
+
+        Returns:
+            np.ndarray: A binary matrix with the edges of the image.
+        """
+
+        image = np.asarray(image)
+        quantum_circuits = [
+            self.image_quantum_circuit(image=image),
+            self.image_quantum_circuit(image=image.T),
+        ]
+        statevector_h, statevector_v = self.qpie.executor.get_statevectors(
+            quantum_circuits=quantum_circuits
+        )
+
+        edge_scan_h = self._edges_from_statevector(
+            statevector=statevector_h, image_shape=image.shape
+        )
+        edge_scan_v = self._edges_from_statevector(
+            statevector=statevector_v, image_shape=image.T.shape
+        ).T
+
+        return (edge_scan_h | edge_scan_v).astype(int)
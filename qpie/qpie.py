@@ -1,41 +1,77 @@
 from __future__ import annotations
+from itertools import chain
+from typing import Iterable, Iterator
 import numpy as np
-from qiskit.circuit import ClassicalRegister, QuantumRegister, QuantumCircuit
-from qiskit.providers.aer.backends import AerSimulator
+from qiskit.circuit import (
+    ClassicalRegister,
+    Measure,
+    QuantumRegister,
+    QuantumCircuit,
+)
+from qiskit.circuit.library import MCXGrayCode
+from qiskit.circuit.library.standard_gates import RYGate
+from batch import encode_images
+from emission import controlled_instructions
+from execution import Executor
+from profiling import profiled
+from resources import resource_estimate, stream_resources
+from sparsity import SparseImage, is_sparse_image, to_dense_image, to_sparse_image
 
 
 class QPIE:
     """QPIE class"""
 
-    def __init__(self) -> QPIE:
-        pass
+    def __init__(self, dtype: type = np.float64, executor: Executor = None) -> QPIE:
+        """Initialize the QPIE encoder.
 
-    def _amplitude_encode(self, image: np.ndarray) -> list:
-        """Return a list that represents the normalized image
+        Args:
+            dtype (type, optional): The float type of the amplitudes and of the
+                                    recovered images, np.float32 halves their
+                                    memory and simulates in single precision.
+                                    Defaults to np.float64.
+            executor (Executor, optional): The executor used to simulate the circuits.
+                                           Defaults to None, which uses a statevector
+                                           executor with the precision of dtype.
+        """
+
+        self.dtype = np.dtype(dtype)
+        if executor is None:
+            precision = "single" if self.dtype == np.float32 else "double"
+            executor = Executor(method="statevector", precision=precision)
+        self.executor = executor
+        self.last_batch_strategy = None
+
+    def _amplitude_encode(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return a contiguous array that represents the normalized image
         for amplitude encoding.
 
         Args:
-            image (np.ndarray): The image that will be encoded.
+            image (np.ndarray | SparseImage): The image that will be encoded.
 
         Returns:
-            list: Return a list with the elements of the normalized input image.
+            np.ndarray: The flattened normalized image, the input image
+                        is not modified.
         """
 
-        normalization_factor = np.sqrt(np.sum(np.sum(image**2, axis=1)))
-        normalized_image = image / normalization_factor
-        num_elements = np.prod(image.shape)
-        normalized_image = normalized_image.reshape(num_elements)
-        normalized_image_list = [num for num in normalized_image]
+        normalized_image = np.array(to_dense_image(image=image), dtype=self.dtype)
+        normalized_image = normalized_image.reshape(-1)
+        normalized_image /= np.linalg.norm(normalized_image)
 
-        return normalized_image_list
+        return normalized_image
 
+    @profiled
     def image_quantum_circuit(
-        self, image: np.ndarray, measurements: bool = False
+        self, image: np.ndarray | SparseImage, measurements: bool = False
     ) -> QuantumCircuit:
         """Return a QPIE circuit that encodes the image given as input.
 
+        Dense images are prepared with an initialize instruction, sparse
+        images with one controlled rotation per nonzero prefix of the
+        amplitude indexes, which scales with the number of nonzero pixels
+        instead of the number of pixels.
+
         Args:
-            image (np.ndarray): The image that will be encoded.
+            image (np.ndarray | SparseImage): The image that will be encoded.
             measurements (bool, optional): If we want to add measurements in the circuit.
                                            Defaults to False.
 
@@ -43,9 +79,23 @@ class QPIE:
             QuantumCircuit: The QPIE circuit of the input image.
         """
 
-        normalized_img = self._amplitude_encode(image=image)
-        num_elements = np.prod(image.shape)
-        num_qubits = np.ceil(np.log2(num_elements))
+        if is_sparse_image(image):
+            qc = self._initialize_circuit(
+                image_shape=image.shape, measurements=measurements
+            )
+            instructions = self._sparse_instructions(
+                quantum_circuit=qc, image=image, measurements=measurements
+            )
+            for operation, qargs, cargs in instructions:
+                qc._append(operation, qargs=qargs, cargs=cargs)
+
+            return qc
+
+        normalized_img = self.image_statevector(image=image)
+        if normalized_img.dtype != np.float64:
+            normalized_img = normalized_img.astype(np.float64)
+            normalized_img /= np.linalg.norm(normalized_img)
+        num_qubits = int(np.log2(normalized_img.size))
 
         qubits = QuantumRegister(size=num_qubits, name="pixel")
         if measurements:
@@ -61,11 +111,318 @@ class QPIE:
 
         return qc
 
+    def bit_layout(self, image_shape: tuple) -> dict:
+        """Return the classical bits of the register of the QPIE circuit
+        of an image shape with measurements.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            dict: The (offset, size) of the "bits_pixel" register.
+        """
+
+        return {"bits_pixel": (0, int(np.ceil(np.log2(np.prod(image_shape)))))}
+
+    @profiled
+    def _initialize_circuit(
+        self, image_shape: tuple, measurements: bool = False
+    ) -> QuantumCircuit:
+        """Return an empty QPIE circuit for an image shape.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+            measurements (bool, optional): If the circuit has a classical register.
+                                           Defaults to False.
+
+        Returns:
+            QuantumCircuit: The circuit with the pixel register.
+        """
+
+        num_qubits = int(np.ceil(np.log2(np.prod(image_shape))))
+        qubits = QuantumRegister(size=num_qubits, name="pixel")
+        if measurements:
+            bits = ClassicalRegister(size=num_qubits, name="bits_pixel")
+            return QuantumCircuit(qubits, bits)
+
+        return QuantumCircuit(qubits)
+
+    def _sparse_instructions(
+        self,
+        quantum_circuit: QuantumCircuit,
+        image: np.ndarray | SparseImage,
+        measurements: bool = False,
+    ) -> Iterator[tuple]:
+        """Return the instructions of the QPIE circuit of a sparse image.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The empty QPIE circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+            measurements (bool, optional): If we want to add measurements.
+                                           Defaults to False.
+
+        Returns:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        instructions = self._sparse_state_instructions(
+            quantum_circuit=quantum_circuit, image=image
+        )
+        if measurements:
+            instructions = chain(
+                instructions,
+                self._measurement_instructions(quantum_circuit=quantum_circuit),
+            )
+
+        return instructions
+
+    def _measurement_instructions(
+        self, quantum_circuit: QuantumCircuit
+    ) -> Iterator[tuple]:
+        """Return the measurement instructions of the pixel register.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The QPIE circuit.
+
+        Returns:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        measure = Measure()
+
+        return (
+            (measure, [qubit], [clbit])
+            for qubit, clbit in zip(quantum_circuit.qregs[0], quantum_circuit.cregs[0])
+        )
+
+    def _sparse_state_instructions(
+        self, quantum_circuit: QuantumCircuit, image: np.ndarray | SparseImage
+    ) -> Iterator[tuple]:
+        """Return the instructions that prepare the QPIE state of a sparse image.
+
+        The amplitudes are split as a binary tree from the most significant
+        qubit down. Every qubit is rotated once per nonzero prefix of the
+        higher qubits, controlled only on the higher qubits that tell the
+        nonzero prefixes apart, so the circuit has O(nnz * n) rotations.
+        A controlled RY(theta) is applied as RY(theta / 2), MCX, RY(-theta / 2)
+        and MCX.
+
+        Args:
+            quantum_circuit (QuantumCircuit): The empty QPIE circuit.
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            Iterator[tuple]: The (operation, qargs, cargs) instructions.
+        """
+
+        qubits = list(quantum_circuit.qregs[0])
+        num_qubits = len(qubits)
+        sparse_image = to_sparse_image(image=image)
+        indexes = np.ravel_multi_index(sparse_image.coordinates.T, sparse_image.shape)
+        values = sparse_image.values.astype(np.float64)
+        values /= np.linalg.norm(values)
+        mcx_gates = {}
+
+        def terms() -> Iterator[tuple]:
+            for q in range(num_qubits - 1, -1, -1):
+                keys, inverse = np.unique(indexes >> q, return_inverse=True)
+                if q == 0:
+                    amplitudes = values
+                else:
+                    amplitudes = np.sqrt(np.bincount(inverse, weights=values**2))
+                prefixes, parents = np.unique(keys >> 1, return_inverse=True)
+                children = np.zeros((len(prefixes), 2))
+                children[parents, keys & 1] = amplitudes
+                thetas = 2 * np.arctan2(children[:, 1], children[:, 0])
+
+                varying = np.bitwise_or.reduce(prefixes ^ prefixes[0])
+                offsets = np.flatnonzero((varying >> np.arange(num_qubits - q - 1)) & 1)
+                controls = [qubits[q + 1 + offset] for offset in offsets]
+                flip_masks = np.zeros((len(prefixes), num_qubits), dtype=bool)
+                flip_masks[:, q + 1 + offsets] = (
+                    (prefixes[:, np.newaxis] >> offsets) & 1
+                ) == 0
+                if controls and len(controls) not in mcx_gates:
+                    mcx_gates[len(controls)] = MCXGrayCode(
+                        num_ctrl_qubits=len(controls)
+                    )
+
+                target = qubits[q]
+                for flip_mask, theta in zip(flip_masks, thetas):
+                    if theta == 0:
+                        continue
+                    if not controls:
+                        yield flip_mask, [(RYGate(theta=theta), [target], [])]
+                        continue
+                    mcx = mcx_gates[len(controls)]
+                    yield flip_mask, [
+                        (RYGate(theta=theta / 2), [target], []),
+                        (mcx, controls + [target], []),
+                        (RYGate(theta=-theta / 2), [target], []),
+                        (mcx, controls + [target], []),
+                    ]
+
+        return controlled_instructions(
+            terms=terms(), control_qubits=qubits, barrier_qubits=qubits, barriers=False
+        )
+
+    def batch_quantum_circuits(
+        self,
+        images: Iterable[np.ndarray],
+        measurements: bool = False,
+        max_workers: int = None,
+        chunksize: int = None,
+    ) -> list:
+        """Return the QPIE circuits of a batch of images.
+
+        The circuit construction is distributed over a process pool and
+        the strategy that was used is stored in last_batch_strategy.
+
+        Args:
+            images (Iterable[np.ndarray]): A stacked array of images or an
+                                           iterable of images.
+            measurements (bool, optional): If we want to add measurements in the circuits.
+                                           Defaults to False.
+            max_workers (int, optional): The number of processes. Defaults to None,
+                                         which uses the number of CPUs.
+            chunksize (int, optional): The number of images sent to a worker at once.
+                                       Defaults to None.
+
+        Returns:
+            list: The QPIE circuits of the images, in the input order.
+        """
+
+        circuits, self.last_batch_strategy = encode_images(
+            encoder=self,
+            images=images,
+            max_workers=max_workers,
+            chunksize=chunksize,
+            measurements=measurements,
+        )
+
+        return circuits
+
+    def estimate_resources(
+        self, image: np.ndarray | SparseImage | tuple, measurements: bool = False
+    ) -> dict:
+        """Return the resources of the QPIE circuit of an image without
+        building the circuit.
+
+        The CNOT count of a dense image is the one of the state preparation
+        of a generic image, 2^n - 2, images whose amplitudes cancel whole
+        rotation multiplexers of the decomposition need fewer CNOTs. The
+        resources of a sparse image are counted on its rotations.
+
+        Args:
+            image (np.ndarray | SparseImage | tuple): The image that will be
+                                                      encoded or its shape.
+            measurements (bool, optional): If the circuit has measurements.
+                                           Defaults to False.
+
+        Returns:
+            dict: The num_qubits, gate_counts, cx_count, depth and
+                  statevector_memory in bytes of the circuit.
+        """
+
+        if is_sparse_image(image):
+            qc = self._initialize_circuit(
+                image_shape=image.shape, measurements=measurements
+            )
+            instructions = self._sparse_instructions(
+                quantum_circuit=qc, image=image, measurements=measurements
+            )
+            gate_counts, cx_count, depth = stream_resources(
+                quantum_circuit=qc, instructions=instructions
+            )
+            return resource_estimate(
+                num_qubits=qc.num_qubits,
+                gate_counts=gate_counts,
+                cx_count=cx_count,
+                depth=depth,
+                bytes_per_amplitude=2 * self.dtype.itemsize,
+            )
+
+        image_shape = image if isinstance(image, tuple) else np.shape(image)
+        num_qubits = int(np.ceil(np.log2(np.prod(image_shape))))
+        gate_counts = {"initialize": 1, "measure": num_qubits * measurements}
+
+        return resource_estimate(
+            num_qubits=num_qubits,
+            gate_counts=gate_counts,
+            cx_count=max(0, 2**num_qubits - 2),
+            depth=1 + int(measurements),
+            bytes_per_amplitude=2 * self.dtype.itemsize,
+        )
+
+    def image_statevector(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the statevector of the QPIE circuit of the image
+        without building or simulating the circuit.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            np.ndarray: The normalized image padded with zeros up to
+                        a power of two length.
+        """
+
+        normalized_img = self._amplitude_encode(image=image)
+        num_qubits = int(np.ceil(np.log2(normalized_img.size)))
+        if normalized_img.size == 2**num_qubits:
+            return normalized_img
+
+        state = np.zeros(2**num_qubits, dtype=self.dtype)
+        state[: normalized_img.size] = normalized_img
+
+        return state
+
+    def image_probabilities(self, image: np.ndarray | SparseImage) -> np.ndarray:
+        """Return the measurement probabilities of the QPIE circuit of
+        the image without building or simulating the circuit.
+
+        Args:
+            image (np.ndarray | SparseImage): The image that will be encoded.
+
+        Returns:
+            np.ndarray: The probability of each basis state.
+        """
+
+        return self.image_statevector(image=image) ** 2
+
+    @profiled
+    def reconstruct_image_from_statevector(
+        self, statevector: np.ndarray, image_shape: tuple
+    ) -> np.ndarray:
+        """Reconstruct the image encoded on QPIE circuit from its statevector.
+
+        The image is read from the real part of the first amplitudes, so it
+        is the normalized image, without the padding of the statevector.
+
+        Args:
+            statevector (np.ndarray): The statevector of the QPIE circuit.
+            image_shape (tuple): The shape of the image that
+                                 we want to reconstruct.
+
+        Returns:
+            np.ndarray: The normalized image matrix.
+        """
+
+        num_elements = int(np.prod(image_shape))
+
+        return (
+            np.real(np.asarray(statevector)[:num_elements])
+            .astype(self.dtype, copy=False)
+            .reshape(image_shape)
+        )
+
     def recover_image_from_statevector(
         self, quantum_circuit: QuantumCircuit, image_shape: tuple
     ) -> np.ndarray:
         """Reconstruct the image encoded on QPIE circuit.
 
+        The statevector is saved on a copy of the circuit, so the input
+        circuit is not modified and concurrent callers can share it.
+
         Args:
             quantum_circuit (QuantumCircuit): The QPIE circuit that encodes
                                               the input image.
@@ -76,9 +433,31 @@ class QPIE:
             np.ndarray: The image reconstructed from the statevector.
         """
 
-        backend = AerSimulator(method="statevector")
-        quantum_circuit.save_state()
-        statevec = backend.run(quantum_circuit).result().get_statevector()
-        image = np.real(statevec).reshape(image_shape)
+        return self.recover_images_from_statevectors(
+            quantum_circuits=[quantum_circuit], image_shape=image_shape
+        )[0]
+
+    @profiled
+    def recover_images_from_statevectors(
+        self, quantum_circuits: list, image_shape: tuple
+    ) -> list:
+        """Reconstruct the images encoded on a list of QPIE circuits,
+        simulating all of them in a single batched job.
+
+        Args:
+            quantum_circuits (list): The QPIE circuits that encode the images.
+            image_shape (tuple): The shape of the images that
+                                 we want to reconstruct.
+
+        Returns:
+            list: The images reconstructed from the statevectors.
+        """
+
+        statevectors = self.executor.get_statevectors(quantum_circuits=quantum_circuits)
 
-        return image
+        return [
+            self.reconstruct_image_from_statevector(
+                statevector=statevector, image_shape=image_shape
+            )
+            for statevector in statevectors
+        ]
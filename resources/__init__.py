@@ -0,0 +1,8 @@
+from .resources import (
+    controlled_terms_depth,
+    decomposed_cx_count,
+    flip_gate_count,
+    mcry_resources,
+    resource_estimate,
+    stream_resources,
+)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+from itertools import chain
+from typing import Iterable
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import ControlledGate, Instruction, QuantumCircuit
+
+BYTES_PER_AMPLITUDE = 16
+_CX_COUNTS = {}
+
+
+def decomposed_cx_count(operation: Instruction) -> int:
+    """Return the number of CNOTs of an operation transpiled to u and cx.
+
+    The Gray code decompositions of the multi-controlled X and RY gates
+    with k >= 5 controls use 3 * 2^k - 4 CNOTs, the other operations are
+    transpiled once and cached by name and number of qubits.
+
+    Args:
+        operation (Instruction): The operation.
+
+    Returns:
+        int: The number of CNOTs.
+    """
+
+    if operation.name in ("barrier", "measure"):
+        return 0
+    if (
+        isinstance(operation, ControlledGate)
+        and operation.num_ctrl_qubits >= 5
+        and operation.num_qubits == operation.num_ctrl_qubits + 1
+        and operation.base_gate.name in ("x", "ry")
+    ):
+        return 3 * 2**operation.num_ctrl_qubits - 4
+
+    key = (operation.name, operation.num_qubits)
+    if key not in _CX_COUNTS:
+        qc = QuantumCircuit(operation.num_qubits)
+        qc.append(operation, qargs=list(range(operation.num_qubits)))
+        qc = transpile(circuits=qc, basis_gates=["u", "cx"], optimization_level=0)
+        _CX_COUNTS[key] = qc.count_ops().get("cx", 0)
+
+    return _CX_COUNTS[key]
+
+
+def mcry_resources(num_ctrl_qubits: int) -> tuple:
+    """Return the name and the number of CNOTs of a multi-controlled RY
+    without building the gate, which takes seconds for many controls.
+
+    Args:
+        num_ctrl_qubits (int): The number of control qubits.
+
+    Returns:
+        tuple: The name of the gate and its number of CNOTs.
+    """
+
+    if num_ctrl_qubits < 3:
+        name = "c" * num_ctrl_qubits + "ry"
+        cx_count = {0: 0, 1: 2, 2: 12}[num_ctrl_qubits]
+    else:
+        name = f"c{num_ctrl_qubits}ry"
+        cx_count = 3 * 2**num_ctrl_qubits - 4
+
+    return name, cx_count
+
+
+def _flip_changes(flip_masks: np.ndarray) -> np.ndarray:
+    """Return the qubits flipped before every term without barriers.
+
+    Args:
+        flip_masks (np.ndarray): The boolean flip masks of the terms.
+
+    Returns:
+        np.ndarray: The flip masks xor the flip masks of the previous terms.
+    """
+
+    changes = flip_masks.copy()
+    changes[1:] ^= flip_masks[:-1]
+
+    return changes
+
+
+def flip_gate_count(flip_masks: np.ndarray, barriers: bool = True) -> int:
+    """Return the number of X gates emitted by controlled_instructions.
+
+    Args:
+        flip_masks (np.ndarray): The boolean flip masks of the terms,
+                                 of shape (terms, control qubits).
+        barriers (bool, optional): If the terms are separated by barriers.
+                                   Defaults to True.
+
+    Returns:
+        int: The number of X gates.
+    """
+
+    if len(flip_masks) == 0:
+        return 0
+    if barriers:
+        return 2 * int(flip_masks.sum())
+
+    return int(_flip_changes(flip_masks=flip_masks).sum() + flip_masks[-1].sum())
+
+
+def controlled_terms_depth(
+    flip_masks: np.ndarray, num_instructions: np.ndarray, barriers: bool = True
+) -> int:
+    """Return the depth of the instructions emitted by controlled_instructions
+    when every instruction acts on all the control qubits.
+
+    Args:
+        flip_masks (np.ndarray): The boolean flip masks of the terms,
+                                 of shape (terms, control qubits).
+        num_instructions (np.ndarray): The number of instructions of each term.
+        barriers (bool, optional): If the terms are separated by barriers.
+                                   Defaults to True.
+
+    Returns:
+        int: The depth added to the circuit.
+    """
+
+    if len(flip_masks) == 0:
+        return 0
+    if barriers:
+        return int(2 * flip_masks.any(axis=1).sum() + np.sum(num_instructions))
+
+    changes = _flip_changes(flip_masks=flip_masks)
+
+    return int(
+        changes.any(axis=1).sum() + np.sum(num_instructions) + flip_masks[-1].any()
+    )
+
+
+def stream_resources(
+    quantum_circuit: QuantumCircuit, instructions: Iterable[tuple]
+) -> tuple:
+    """Count the gates, CNOTs and depth of a circuit followed by a stream of
+    instructions without appending them to the circuit.
+
+    Args:
+        quantum_circuit (QuantumCircuit): The circuit with the registers and
+                                          the first instructions.
+        instructions (Iterable[tuple]): The (operation, qargs, cargs) instructions.
+
+    Returns:
+        tuple: The gate counts, the decomposed CNOT count and the depth.
+    """
+
+    qc = quantum_circuit
+    indexes = {qubit: i for i, qubit in enumerate(qc.qubits)}
+    levels = [0] * qc.num_qubits
+    gate_counts = {}
+    cx_count = 0
+
+    initial_instructions = (
+        (instruction.operation, instruction.qubits, instruction.clbits)
+        for instruction in qc.data
+    )
+    for operation, qargs, _ in chain(initial_instructions, instructions):
+        gate_counts[operation.name] = gate_counts.get(operation.name, 0) + 1
+        qubits = [indexes[qubit] for qubit in qargs]
+        level = max(levels[i] for i in qubits)
+        if not getattr(operation, "_directive", False):
+            level += 1
+            cx_count += decomposed_cx_count(operation=operation)
+        for i in qubits:
+            levels[i] = level
+
+    return gate_counts, cx_count, max(levels, default=0)
+
+
+def resource_estimate(
+    num_qubits: int,
+    gate_counts: dict,
+    cx_count: int,
+    depth: int,
+    bytes_per_amplitude: int = BYTES_PER_AMPLITUDE,
+) -> dict:
+    """Return the resources of a circuit as a dictionary.
+
+    Args:
+        num_qubits (int): The number of qubits.
+        gate_counts (dict): The number of operations by name.
+        cx_count (int): The number of CNOTs after the decomposition to u and cx.
+        depth (int): The depth of the circuit.
+        bytes_per_amplitude (int, optional): The memory of a statevector amplitude.
+                                             Defaults to 16.
+
+    Returns:
+        dict: The num_qubits, gate_counts, cx_count, depth and
+              statevector_memory in bytes.
+    """
+
+    return {
+        "num_qubits": int(num_qubits),
+        "gate_counts": {
+            name: int(count) for name, count in gate_counts.items() if count
+        },
+        "cx_count": int(cx_count),
+        "depth": int(depth),
+        "statevector_memory": bytes_per_amplitude * 2 ** int(num_qubits),
+    }
@@ -0,0 +1 @@
+from .sampling import adaptive_counts, merge_counts
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import Callable
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import QuantumCircuit
+from execution import Executor
+
+
+def merge_counts(counts: dict, new_counts: dict) -> dict:
+    """Add the counts of a new job to the counts of the previous jobs.
+
+    Args:
+        counts (dict): The accumulated counts, updated in place.
+        new_counts (dict): The counts of the new job.
+
+    Returns:
+        dict: The accumulated counts.
+    """
+
+    for key, value in new_counts.items():
+        counts[key] = counts.get(key, 0) + value
+
+    return counts
+
+
+def adaptive_counts(
+    executor: Executor,
+    quantum_circuit: QuantumCircuit,
+    pixel_errors: Callable,
+    target_error: float,
+    fraction: float = 1.0,
+    initial_shots: int = 1024,
+    max_shots: int = 2**20,
+    growth: float = 2.0,
+) -> dict:
+    """Sample a circuit in increments until enough pixels are confident.
+
+    Every round runs growth times the shots of the previous round, so the
+    total number of shots is within a factor growth of the shots that were
+    needed, with a number of jobs logarithmic in that total. The circuit
+    is transpiled once for all the rounds and every round uses its own
+    seed, derived from the executor seed when it is set.
+
+    Args:
+        executor (Executor): The executor used to simulate the circuit.
+        quantum_circuit (QuantumCircuit): The circuit with measurements.
+        pixel_errors (Callable): A function that returns the estimated error
+                                 of every pixel from the accumulated counts.
+        target_error (float): The error that a pixel must not exceed.
+        fraction (float, optional): The fraction of pixels that must meet the
+                                    target error. Defaults to 1.0.
+        initial_shots (int, optional): The shots of the first round.
+                                       Defaults to 1024.
+        max_shots (int, optional): The budget of shots over all the rounds.
+                                   Defaults to 2**20.
+        growth (float, optional): The ratio between the shots of consecutive
+                                  rounds. Defaults to 2.0.
+
+    Raises:
+        ValueError: If fraction is not in (0, 1] or growth is smaller than 1.
+
+    Returns:
+        dict: The accumulated "counts", the total "shots", the number of
+              "rounds", the "pixel_errors", the "confident_fraction" of the
+              pixels and if the target was reached ("converged").
+    """
+
+    if not 0 < fraction <= 1:
+        raise ValueError(f"The fraction ({fraction}) should be in (0, 1]!")
+    if growth < 1:
+        raise ValueError(f"The growth ({growth}) should be at least 1!")
+
+    qc = transpile(circuits=quantum_circuit, backend=executor.simulator)
+    counts, shots, rounds = {}, 0, 0
+    round_shots = max(1, min(int(initial_shots), max_shots))
+    while True:
+        seed_simulator = None
+        if executor.seed_simulator is not None:
+            seed_simulator = executor.seed_simulator + rounds
+        merge_counts(
+            counts=counts,
+            new_counts=executor.get_counts(
+                quantum_circuits=[qc],
+                shots=round_shots,
+                seed_simulator=seed_simulator,
+            )[0],
+        )
+        shots += round_shots
+        rounds += 1
+
+        errors = pixel_errors(counts)
+        confident_fraction = float(np.mean(errors <= target_error))
+        converged = confident_fraction >= fraction
+        if converged or shots >= max_shots:
+            break
+        round_shots = min(int(np.ceil(round_shots * growth)), max_shots - shots)
+
+    return {
+        "counts": counts,
+        "shots": shots,
+        "rounds": rounds,
+        "pixel_errors": errors,
+        "confident_fraction": confident_fraction,
+        "converged": converged,
+    }
@@ -0,0 +1,7 @@
+from .sparsity import (
+    SparseImage,
+    is_sparse_image,
+    sparse_channel_pixels,
+    to_dense_image,
+    to_sparse_image,
+)
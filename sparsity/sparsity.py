@@ -0,0 +1,140 @@
+from __future__ import annotations
+import numpy as np
+from scipy import sparse
+from layout import ImageLayout
+
+
+class SparseImage:
+    """SparseImage class"""
+
+    def __init__(
+        self, coordinates: np.ndarray, values: np.ndarray, shape: tuple
+    ) -> SparseImage:
+        """Initialize the coordinate list of the nonzero pixels of an image.
+
+        Args:
+            coordinates (np.ndarray): The integer coordinates of the nonzero pixels,
+                                      of shape (nnz, ndim).
+            values (np.ndarray): The values of the nonzero pixels, of shape (nnz,).
+            shape (tuple): The shape of the dense image.
+        """
+
+        self.shape = tuple(shape)
+        self.coordinates = np.asarray(coordinates, dtype=np.int64).reshape(
+            -1, len(self.shape)
+        )
+        self.values = np.asarray(values)
+
+
+def is_sparse_image(image: object) -> bool:
+    """Return if an image is given as a SparseImage or a scipy.sparse matrix.
+
+    Args:
+        image (object): The image.
+
+    Returns:
+        bool: If the image is sparse.
+    """
+
+    return isinstance(image, SparseImage) or sparse.issparse(image)
+
+
+def to_sparse_image(image: np.ndarray | SparseImage) -> SparseImage:
+    """Return the coordinate list of the nonzero pixels of an image.
+
+    Args:
+        image (np.ndarray | SparseImage): A dense image, a SparseImage or a
+                                          scipy.sparse matrix.
+
+    Returns:
+        SparseImage: The nonzero pixels sorted in row-major order, explicit
+                     zeros are dropped and duplicated coordinates are summed.
+    """
+
+    if sparse.issparse(image):
+        coo = sparse.coo_matrix(image)
+        coo.sum_duplicates()
+        coordinates = np.stack((coo.row, coo.col), axis=1).astype(np.int64)
+        values, shape = coo.data, coo.shape
+    elif isinstance(image, SparseImage):
+        coordinates, values, shape = image.coordinates, image.values, image.shape
+        if len(values):
+            flat, inverse = np.unique(
+                np.ravel_multi_index(coordinates.T, shape), return_inverse=True
+            )
+            values = np.bincount(inverse, weights=values, minlength=len(flat))
+            coordinates = np.stack(np.unravel_index(flat, shape), axis=1)
+    else:
+        image = np.asarray(image)
+        coordinates = np.argwhere(image)
+        values, shape = image[tuple(coordinates.T)], image.shape
+
+    nonzero = values != 0
+
+    return SparseImage(
+        coordinates=coordinates[nonzero], values=values[nonzero], shape=tuple(shape)
+    )
+
+
+def to_dense_image(image: np.ndarray | SparseImage) -> np.ndarray:
+    """Return an image as a dense array.
+
+    Args:
+        image (np.ndarray | SparseImage): A dense image, a SparseImage or a
+                                          scipy.sparse matrix.
+
+    Returns:
+        np.ndarray: The dense image, dense inputs are returned as they are.
+    """
+
+    if not is_sparse_image(image):
+        return image
+
+    sparse_image = to_sparse_image(image=image)
+    dense_image = np.zeros(sparse_image.shape, dtype=sparse_image.values.dtype)
+    dense_image[tuple(sparse_image.coordinates.T)] = sparse_image.values
+
+    return dense_image
+
+
+def sparse_channel_pixels(
+    image: np.ndarray | SparseImage, layout: ImageLayout = None
+) -> tuple:
+    """Return the colour channel and the position of every nonzero pixel,
+    following the layout of the NEQR and FRQI encoders.
+
+    Args:
+        image (np.ndarray | SparseImage): A dense image, a SparseImage or a
+                                          scipy.sparse matrix.
+        layout (ImageLayout, optional): The layout of the image in the position
+                                        registers. Defaults to None, which uses
+                                        the default layout of the image shape.
+
+    Returns:
+        tuple: The number of channels, the number of positions per channel and
+               the channels, positions and values of the nonzero pixels
+               sorted by channel and position.
+    """
+
+    sparse_image = to_sparse_image(image=image)
+    coordinates = sparse_image.coordinates
+    if layout is None:
+        layout = ImageLayout(image_shape=sparse_image.shape)
+
+    num_channels, num_pixels = layout.num_channels, layout.num_positions
+    num_axes = len(layout.spatial_shape)
+    if layout.rgb:
+        channels = coordinates[:, -1]
+    else:
+        channels = np.zeros(len(coordinates), dtype=np.int64)
+    pixels = layout.positions(coordinates=coordinates[:, :num_axes])
+
+    order = np.lexsort((pixels, channels))
+
+    return (
+        num_channels,
+        num_pixels,
+        channels[order],
+        pixels[order],
+        sparse_image.values[order],
+    )
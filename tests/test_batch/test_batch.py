@@ -0,0 +1,42 @@
+import numpy as np
+from batch import encode_images
+from neqr import NEQR
+
+
+class TestBatch:
+
+    NEQR = NEQR()
+    IMAGES = np.random.default_rng(seed=3).random((6, 2, 2))
+
+    def test_process_pool_strategy(self):
+
+        circuits, strategy = encode_images(
+            encoder=self.NEQR, images=self.IMAGES, max_workers=2, chunksize=2
+        )
+        expected_circuits = [
+            self.NEQR.image_quantum_circuit(image=image) for image in self.IMAGES
+        ]
+
+        assert strategy == {
+            "strategy": "process_pool",
+            "max_workers": 2,
+            "chunksize": 2,
+            "num_chunks": 3,
+        }
+        assert circuits == expected_circuits
+
+    def test_serial_strategy(self):
+
+        circuits, strategy = encode_images(
+            encoder=self.NEQR,
+            images=iter(self.IMAGES),
+            max_workers=1,
+            measurements=True,
+        )
+        expected_circuits = [
+            self.NEQR.image_quantum_circuit(image=image, measurements=True)
+            for image in self.IMAGES
+        ]
+
+        assert strategy["strategy"] == "serial"
+        assert circuits == expected_circuits
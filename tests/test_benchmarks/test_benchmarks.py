@@ -0,0 +1,71 @@
+import pytest
+from benchmarks import (
+    benchmark_case,
+    benchmark_image,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+class TestBenchmarks:
+    def test_benchmark_image(self):
+
+        assert benchmark_image(size=4, kind="gray").shape == (4, 4)
+        assert benchmark_image(size=4, kind="rgb").shape == (4, 4, 3)
+        assert benchmark_image(size=4, kind="3d").shape == (4, 4, 2)
+
+        with pytest.raises(ValueError, match="Unsupported image kind"):
+            _ = benchmark_image(size=4, kind="4d")
+
+    def test_benchmark_case(self):
+
+        for encoder_name in ["frqi", "frqi-ucr", "neqr", "qpie"]:
+            case = benchmark_case(
+                encoder_name=encoder_name, image=benchmark_image(size=2, kind="rgb")
+            )
+
+            assert case["construction_time"] > 0
+            assert case["construction_peak_memory"] > 0
+            assert case["transpiled_gate_count"] >= case["gate_count"] > 0
+            assert case["simulation_time"] > 0
+            assert case["reconstruction_time"] > 0
+
+    def test_benchmark_case_max_qubits(self):
+
+        case = benchmark_case(
+            encoder_name="neqr",
+            image=benchmark_image(size=4, kind="gray"),
+            max_qubits=8,
+            memory=False,
+        )
+
+        assert case["num_qubits"] == 12
+        assert case["construction_peak_memory"] is None
+        assert case["transpile_time"] is None
+        assert case["simulation_time"] is None
+
+        with pytest.raises(ValueError, match="Unsupported encoder"):
+            _ = benchmark_case(
+                encoder_name="mcqi", image=benchmark_image(size=2, kind="gray")
+            )
+
+    def test_save_and_compare_results(self, tmp_path):
+
+        results = run_benchmarks(
+            encoders=("qpie",), sizes=(2,), kinds=("gray",), memory=False
+        )
+        path = tmp_path / "results.json"
+        save_results(results=results, path=path)
+        loaded_results = load_results(path=path)
+
+        slower_results = load_results(path=path)
+        slower_results["results"][0]["construction_time"] *= 2
+
+        assert loaded_results == results
+        assert compare_results(baseline=results, current=loaded_results) == []
+        assert [
+            regression["metric"]
+            for regression in compare_results(baseline=results, current=slower_results)
+        ] == ["construction_time"]
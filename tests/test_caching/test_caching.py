@@ -0,0 +1,108 @@
+import os
+import pytest
+import numpy as np
+from caching import CircuitCache, circuit_key
+from frqi import FRQI
+from neqr import NEQR
+from qiskit.quantum_info import Statevector
+from sparsity import to_sparse_image
+
+
+class TestCaching:
+
+    IMAGES = np.random.default_rng(seed=73).random((3, 2, 2))
+
+    def test_circuit_key(self):
+
+        frqi = FRQI()
+        key = circuit_key(encoder=frqi, image=self.IMAGES[0])
+
+        assert key == circuit_key(encoder=FRQI(), image=self.IMAGES[0].copy())
+        assert key != circuit_key(encoder=frqi, image=self.IMAGES[1])
+        assert key != circuit_key(encoder=frqi, image=self.IMAGES[0], method="ucr")
+        assert key != circuit_key(encoder=FRQI(rgb=False), image=self.IMAGES[0])
+        assert key != circuit_key(encoder=NEQR(), image=self.IMAGES[0])
+        assert key != circuit_key(
+            encoder=frqi, image=self.IMAGES[0], basis_gates=["u", "cx"]
+        )
+        assert key != circuit_key(
+            encoder=frqi, image=to_sparse_image(image=self.IMAGES[0])
+        )
+
+    def test_memory_cache(self):
+
+        cache = CircuitCache(max_memory_entries=2)
+        frqi = FRQI()
+        circuits = cache.image_quantum_circuits(encoder=frqi, images=self.IMAGES)
+        qc = cache.image_quantum_circuit(encoder=frqi, image=self.IMAGES[2])
+
+        assert qc == circuits[2]
+        assert qc is not circuits[2]
+        assert cache.stats == {
+            "memory_hits": 1,
+            "disk_hits": 0,
+            "misses": 3,
+            "memory_evictions": 1,
+            "disk_evictions": 0,
+        }
+        assert cache.hit_rate() == 0.25
+
+    def test_disk_cache(self, tmp_path):
+
+        frqi = FRQI()
+        circuits = CircuitCache(directory=tmp_path).image_quantum_circuits(
+            encoder=frqi, images=self.IMAGES
+        )
+        cache = CircuitCache(directory=tmp_path)
+        loaded = cache.image_quantum_circuits(encoder=frqi, images=self.IMAGES)
+
+        assert cache.stats["disk_hits"] == 3
+        assert cache.stats["misses"] == 0
+        for qc, loaded_qc in zip(circuits, loaded):
+            assert loaded_qc.count_ops() == qc.count_ops()
+            assert np.allclose(Statevector(loaded_qc).data, Statevector(qc).data)
+
+    def test_transpiled_circuit(self, tmp_path):
+
+        cache = CircuitCache(directory=tmp_path)
+        neqr = NEQR()
+        qc = cache.image_quantum_circuit(
+            encoder=neqr, image=self.IMAGES[0], basis_gates=["u", "cx"]
+        )
+        loaded = CircuitCache(directory=tmp_path).image_quantum_circuit(
+            encoder=neqr, image=self.IMAGES[0], basis_gates=["u", "cx"]
+        )
+
+        assert set(qc.count_ops()) <= {"u", "cx", "barrier"}
+        assert loaded == qc
+
+    def test_disk_eviction(self, tmp_path):
+
+        cache = CircuitCache(directory=tmp_path, max_memory_entries=0)
+        frqi = FRQI()
+        cache.image_quantum_circuit(encoder=frqi, image=self.IMAGES[0])
+        file_size = sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+        cache.max_disk_bytes = file_size
+        for image in self.IMAGES[1:]:
+            cache.image_quantum_circuit(encoder=frqi, image=image)
+
+        assert len(os.listdir(tmp_path)) == 1
+        assert cache.stats["disk_evictions"] == 2
+        cache.image_quantum_circuit(encoder=frqi, image=self.IMAGES[2])
+        assert cache.stats["disk_hits"] == 1
+
+    def test_clear(self, tmp_path):
+
+        cache = CircuitCache(directory=tmp_path)
+        cache.image_quantum_circuits(encoder=FRQI(), images=self.IMAGES)
+        cache.clear()
+
+        assert os.listdir(tmp_path) == []
+        assert cache.get(key=circuit_key(encoder=FRQI(), image=self.IMAGES[0])) is None
+
+    def test_invalid_bounds(self):
+
+        with pytest.raises(ValueError):
+            CircuitCache(max_memory_entries=-1)
+        with pytest.raises(ValueError):
+            CircuitCache(max_disk_bytes=-1)
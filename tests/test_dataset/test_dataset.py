@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+
+torch = pytest.importorskip("torch")
+
+from dataset import EncodedDataset
+from frqi import FRQI
+from neqr import NEQR
+from qpie import QPIE
+from skimage.transform import resize
+from torch.utils.data import DataLoader
+
+
+class TestEncodedDataset:
+
+    RNG = np.random.default_rng(seed=89)
+    IMAGES = [
+        (RNG.integers(0, 256, (28, 28), dtype=np.uint8), np.array([i % 2]))
+        for i in range(8)
+    ]
+
+    def test_statevector_features(self):
+
+        qpie = QPIE()
+        dataset = EncodedDataset(dataset=self.IMAGES, encoder=qpie, image_shape=(4, 4))
+        features, label = dataset[3]
+        expected = qpie.image_statevector(image=resize(self.IMAGES[3][0] / 255, (4, 4)))
+
+        assert len(dataset) == len(self.IMAGES)
+        assert dataset.feature_shape == (16,)
+        assert features.dtype == torch.float32
+        assert np.allclose(features.numpy(), expected, atol=1e-6)
+        assert np.array_equal(label, self.IMAGES[3][1])
+
+    def test_features(self):
+
+        neqr = NEQR()
+        dataset = EncodedDataset(
+            dataset=self.IMAGES,
+            encoder=neqr,
+            features="simulation",
+            image_shape=(2, 2),
+            dtype=np.float64,
+        )
+        image = resize(self.IMAGES[0][0] / 255, (2, 2))
+
+        assert np.allclose(dataset[0][0].numpy(), neqr.image_statevector(image=image))
+        assert EncodedDataset(
+            dataset=self.IMAGES,
+            encoder=neqr,
+            features=lambda encoder, image: image.reshape(-1),
+            image_shape=(2, 2),
+        ).feature_shape == (4,)
+        with pytest.raises(ValueError):
+            EncodedDataset(dataset=self.IMAGES, encoder=neqr, features="counts")
+
+    def test_cache(self, tmp_path):
+
+        cache_path = str(tmp_path / "features.npy")
+        frqi = FRQI()
+        dataset = EncodedDataset(
+            dataset=self.IMAGES,
+            encoder=frqi,
+            features="probabilities",
+            image_shape=(4, 4),
+            cache_path=cache_path,
+        )
+        assert dataset.cached_fraction() == 0
+
+        loader = DataLoader(dataset=dataset, batch_size=4, num_workers=2)
+        first_epoch = torch.cat([features for features, _ in loader])
+        assert dataset.cached_fraction() == 1
+
+        cached = EncodedDataset(
+            dataset=self.IMAGES,
+            encoder=frqi,
+            features="probabilities",
+            image_shape=(4, 4),
+            cache_path=cache_path,
+        )
+        assert cached.cached_fraction() == 1
+        second_epoch = torch.cat([features for features, _ in DataLoader(cached)])
+        assert torch.equal(first_epoch, second_epoch)
+
+        rebuilt = EncodedDataset(
+            dataset=self.IMAGES,
+            encoder=FRQI(mcqi=True),
+            features="probabilities",
+            image_shape=(4, 4),
+            cache_path=cache_path,
+        )
+        assert rebuilt.cached_fraction() == 0
+        rebuilt.precompute()
+        assert rebuilt.cached_fraction() == 1
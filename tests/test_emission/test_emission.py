@@ -0,0 +1,91 @@
+import io
+import numpy as np
+from emission import controlled_instructions, write_qasm
+from frqi import FRQI
+from neqr import NEQR
+from qiskit.circuit import QuantumCircuit
+from qiskit.circuit.library.standard_gates import XGate
+from qiskit.quantum_info import Statevector
+
+
+class TestEmission:
+
+    NEQR = NEQR()
+    FRQI = FRQI()
+    IMAGE = np.random.default_rng(seed=3).random((2, 2))
+    RGB_IMAGE = np.random.default_rng(seed=5).random((2, 2, 3))
+
+    def test_controlled_instructions_cancel_flips(self):
+
+        qubits = list(QuantumCircuit(2).qubits)
+        target = XGate()
+        terms = [
+            (np.array([True, True]), [(target, [qubits[0]], [])]),
+            (np.array([True, False]), [(target, [qubits[0]], [])]),
+        ]
+
+        with_barriers = list(
+            controlled_instructions(
+                terms=terms, control_qubits=qubits, barrier_qubits=qubits
+            )
+        )
+        without_barriers = list(
+            controlled_instructions(
+                terms=terms,
+                control_qubits=qubits,
+                barrier_qubits=qubits,
+                barriers=False,
+            )
+        )
+
+        assert len(with_barriers) == 10
+        assert [qargs for _, qargs, _ in without_barriers] == [
+            [qubits[0]],
+            [qubits[1]],
+            [qubits[0]],
+            [qubits[1]],
+            [qubits[0]],
+            [qubits[0]],
+        ]
+
+    def test_write_qasm_matches_circuit(self):
+
+        qc = self.NEQR.image_quantum_circuit(image=self.IMAGE)
+        file = io.StringIO()
+        write_qasm(quantum_circuit=qc, instructions=[], file=file)
+
+        assert Statevector(QuantumCircuit.from_qasm_str(file.getvalue())).equiv(
+            Statevector(qc)
+        )
+
+    def test_neqr_stream_qasm(self):
+
+        for image in [self.IMAGE, self.RGB_IMAGE]:
+            for compress in [False, True]:
+                file = io.StringIO()
+                self.NEQR.stream_qasm(image=image, file=file, compress=compress)
+                qc = self.NEQR.image_quantum_circuit(image=image)
+
+                assert Statevector(QuantumCircuit.from_qasm_str(file.getvalue())).equiv(
+                    Statevector(qc)
+                )
+
+    def test_frqi_stream_qasm(self):
+
+        for image in [self.IMAGE, self.RGB_IMAGE]:
+            file = io.StringIO()
+            self.FRQI.stream_qasm(image=image, file=file)
+            qc = self.FRQI.image_quantum_circuit(image=image)
+
+            assert Statevector(QuantumCircuit.from_qasm_str(file.getvalue())).equiv(
+                Statevector(qc)
+            )
+
+    def test_stream_qasm_measurements(self):
+
+        file = io.StringIO()
+        self.NEQR.stream_qasm(image=self.IMAGE, file=file, measurements=True)
+        qc = QuantumCircuit.from_qasm_str(file.getvalue())
+
+        assert qc.count_ops()["measure"] == qc.num_qubits
+        assert "barrier" not in qc.count_ops()
@@ -0,0 +1,60 @@
+import numpy as np
+from execution import Executor
+from neqr import NEQR
+from qiskit import QuantumCircuit
+
+
+class TestExecutor:
+
+    EXECUTOR = Executor(shots=1024, seed_simulator=42)
+
+    def test_pooled_simulators(self):
+
+        executor1 = Executor(method="statevector", max_parallel_threads=2)
+        executor2 = Executor(method="statevector", max_parallel_threads=2)
+        executor3 = Executor(method="statevector", precision="single")
+
+        assert executor1.simulator is executor2.simulator
+        assert executor1.simulator is not executor3.simulator
+        assert executor1.simulator.options.max_parallel_threads == 2
+        assert executor3.simulator.options.precision == "single"
+
+    def test_get_counts_batch(self):
+
+        qc0 = QuantumCircuit(1, 1)
+        qc0.measure(0, 0)
+        qc1 = QuantumCircuit(1, 1)
+        qc1.x(0)
+        qc1.measure(0, 0)
+
+        counts = self.EXECUTOR.get_counts(quantum_circuits=[qc0, qc1, qc0])
+
+        assert counts == [{"0": 1024}, {"1": 1024}, {"0": 1024}]
+
+    def test_get_statevectors_batch(self):
+
+        qc = QuantumCircuit(2)
+        qc.h(0)
+        qc.cx(0, 1)
+        expected_qc = qc.copy()
+
+        statevectors = self.EXECUTOR.get_statevectors(quantum_circuits=[qc, qc])
+
+        assert qc == expected_qc
+        for statevector in statevectors:
+            assert np.allclose(statevector, np.array([1, 0, 0, 1]) / np.sqrt(2))
+
+    def test_encoder_batch_reconstruction(self):
+
+        neqr = NEQR(executor=self.EXECUTOR)
+        images = np.random.default_rng(seed=11).integers(0, 256, (3, 2, 2)) / 255
+        circuits = neqr.batch_quantum_circuits(
+            images=images, measurements=True, max_workers=1
+        )
+
+        reconstructed_images = neqr.reconstruct_images(
+            quantum_circuits=circuits, image_shape=(2, 2)
+        )
+
+        for image, reconstructed_image in zip(images, reconstructed_images):
+            assert np.allclose(image, reconstructed_image)
@@ -1,9 +1,15 @@
+import pytest
 import numpy as np
+from execution import Executor
 from frqi import FRQI
-from qiskit import execute
+from histogram import register_layout
+from qiskit import execute, transpile
+from qiskit.quantum_info import Statevector
 from qiskit.providers.aer.backends import AerSimulator
+from scipy import sparse
 from skimage import data
 from skimage.transform import resize
+from sparsity import to_sparse_image
 
 
 class TestFRQI:
@@ -16,6 +22,7 @@ class TestFRQI:
     IMAGE2 = np.array([[1, 1], [1, 1]])
     IMAGE3 = np.array([[0.5, 0.5], [0.5, 0.5]])
     ASTRONAUT = resize(data.astronaut(), (2, 2))
+    RANDOM_IMAGE = np.random.default_rng(seed=42).random((4, 4))
 
     def test_result_image1(self):
 
@@ -183,3 +190,362 @@ class TestFRQI:
 
         assert np.allclose(qc_count_gate_list, count_gate_list)
         assert np.allclose(qc_rgb_count_gate_list, count_gate_list_rgb)
+
+    def test_ucr_method_state(self):
+
+        for image in [self.IMAGE3, self.RANDOM_IMAGE, self.ASTRONAUT]:
+            qc = self.FRQI.image_quantum_circuit(image=image)
+            qc_ucr = self.FRQI.image_quantum_circuit(image=image, method="ucr")
+
+            assert Statevector(qc_ucr).equiv(Statevector(qc))
+
+    def test_ucr_method_gate_count(self):
+
+        qc = self.FRQI.image_quantum_circuit(image=self.RANDOM_IMAGE, method="ucr")
+        qc_rgb = self.FRQI.image_quantum_circuit(image=self.ASTRONAUT, method="ucr")
+
+        num_pixel = 2 ** qc.qregs[0].size
+        num_pixel_rgb = 2 ** qc_rgb.qregs[0].size
+
+        assert dict(qc.count_ops()) == {
+            "h": qc.qregs[0].size,
+            "barrier": 1,
+            "ry": num_pixel,
+            "cx": num_pixel,
+        }
+        assert dict(qc_rgb.count_ops()) == {
+            "h": qc_rgb.qregs[0].size,
+            "barrier": 1,
+            "ry": 3 * num_pixel_rgb,
+            "cx": 3 * num_pixel_rgb,
+        }
+
+    def test_invalid_method(self):
+
+        with pytest.raises(ValueError, match="Unsupported method"):
+            _ = self.FRQI.image_quantum_circuit(image=self.IMAGE1, method="qrom")
+
+    def test_image_statevector(self):
+
+        for image in [self.IMAGE3, self.RANDOM_IMAGE, self.ASTRONAUT]:
+            qc = self.FRQI.image_quantum_circuit(image=image)
+            expected_statevector = Statevector(qc)
+
+            statevector = self.FRQI.image_statevector(image=image)
+            probabilities = self.FRQI.image_probabilities(image=image)
+
+            assert np.allclose(statevector, expected_statevector.data)
+            assert np.allclose(probabilities, expected_statevector.probabilities())
+
+    def test_template_binding(self):
+
+        for method in self.FRQI.METHODS:
+            for image in [self.RANDOM_IMAGE, self.ASTRONAUT]:
+                qc = self.FRQI.image_quantum_circuit(image=image, method=method)
+                qc_template = self.FRQI.image_quantum_circuit(
+                    image=image, method=method, template=True
+                )
+
+                assert not qc_template.parameters
+                assert Statevector(qc_template).equiv(Statevector(qc))
+
+    def test_template_cache(self):
+
+        template1 = self.FRQI.circuit_template(
+            image_shape=(4, 4), method="ucr", basis_gates=["cx", "ry", "h"]
+        )
+        template2 = self.FRQI.circuit_template(
+            image_shape=(4, 4), method="ucr", basis_gates=["cx", "ry", "h"]
+        )
+        qc = self.FRQI.bind_image(template=template1, image=self.RANDOM_IMAGE)
+        expected_qc = self.FRQI.image_quantum_circuit(image=self.RANDOM_IMAGE)
+
+        assert template1 is template2
+        assert set(qc.count_ops()) <= {"cx", "ry", "h", "barrier"}
+        assert Statevector(qc).equiv(Statevector(expected_qc))
+
+        with pytest.raises(ValueError, match="does not match the template shape"):
+            _ = self.FRQI.bind_image(template=template1, image=self.IMAGE1)
+
+    def test_batch_quantum_circuits(self):
+
+        images = [self.IMAGE1, self.IMAGE2, self.IMAGE3]
+        circuits = self.FRQI.batch_quantum_circuits(
+            images=images, method="ucr", max_workers=2, chunksize=1
+        )
+
+        assert self.FRQI.last_batch_strategy["strategy"] == "process_pool"
+        assert circuits == [
+            self.FRQI.image_quantum_circuit(image=image, method="ucr")
+            for image in images
+        ]
+
+    def test_reconstruct_image_from_statevector(self):
+
+        image_3d = np.random.default_rng(seed=5).random((2, 2, 2))
+
+        for image in [self.IMAGE3, self.RANDOM_IMAGE, self.ASTRONAUT, image_3d]:
+            qc = self.FRQI.image_quantum_circuit(image=image, method="ucr")
+            image_from_circuit = self.FRQI.reconstruct_image_from_statevector(
+                statevector=Statevector(qc), image_shape=image.shape
+            )
+            image_from_statevector = self.FRQI.reconstruct_image_from_statevector(
+                statevector=self.FRQI.image_statevector(image=image),
+                image_shape=image.shape,
+            )
+
+            assert np.allclose(image_from_circuit, image)
+            assert np.allclose(image_from_statevector, image)
+
+    def test_reconstruct_image_from_frqi_result(self):
+
+        for image in [self.IMAGE2, self.RANDOM_IMAGE, self.ASTRONAUT]:
+            qc = self.FRQI.image_quantum_circuit(
+                image=image, measurements=True, method="ucr"
+            )
+            counts = (
+                execute(experiments=qc, backend=self.BACKEND, shots=8 * self.SHOTS)
+                .result()
+                .get_counts()
+            )
+
+            reconstructed_image = self.FRQI.reconstruct_image_from_frqi_result(
+                counts=counts, image_shape=image.shape
+            )
+
+            assert reconstructed_image.shape == image.shape
+            assert np.allclose(reconstructed_image, image, atol=0.1)
+
+    def test_reconstruct_image_value_error(self):
+
+        with pytest.raises(ValueError, match="Image shape should be a tuple"):
+            _ = self.FRQI.reconstruct_image_from_statevector(
+                statevector=self.FRQI.image_statevector(image=self.IMAGE1),
+                image_shape=(4,),
+            )
+
+    def test_reconstruct_images(self):
+
+        images = [self.IMAGE3, self.RANDOM_IMAGE[:2, :2]]
+        circuits = [
+            self.FRQI.image_quantum_circuit(image=image, method="ucr")
+            for image in images
+        ]
+
+        reconstructed_images = self.FRQI.reconstruct_images(
+            quantum_circuits=circuits, image_shape=(2, 2), statevector=True
+        )
+
+        for image, reconstructed_image in zip(images, reconstructed_images):
+            assert np.allclose(image, reconstructed_image)
+
+    def test_encoding_without_barriers(self):
+
+        qc = self.FRQI.image_quantum_circuit(image=self.RANDOM_IMAGE)
+        qc_no_barriers = self.FRQI.image_quantum_circuit(
+            image=self.RANDOM_IMAGE, barriers=False
+        )
+
+        assert "barrier" not in qc_no_barriers.count_ops()
+        assert qc_no_barriers.count_ops()["x"] < qc.count_ops()["x"]
+        assert Statevector(qc_no_barriers).equiv(Statevector(qc))
+
+    def test_estimate_resources(self):
+
+        for image in [self.RANDOM_IMAGE, self.ASTRONAUT]:
+            for method in ["mcry", "ucr"]:
+                for barriers in [True, False]:
+                    resources = self.FRQI.estimate_resources(
+                        image=image.shape,
+                        measurements=True,
+                        method=method,
+                        barriers=barriers,
+                    )
+                    qc = self.FRQI.image_quantum_circuit(
+                        image=image, measurements=True, method=method, barriers=barriers
+                    )
+                    transpiled_qc = transpile(
+                        circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+                    )
+
+                    assert resources["num_qubits"] == qc.num_qubits
+                    assert resources["gate_counts"] == dict(qc.count_ops())
+                    assert resources["cx_count"] == transpiled_qc.count_ops()["cx"]
+                    assert resources["depth"] == qc.depth()
+
+    def test_sparse_image(self):
+
+        image = self.RANDOM_IMAGE * (self.RANDOM_IMAGE > 0.6)
+        sparse_image = to_sparse_image(image=image)
+
+        for barriers in [True, False]:
+            qc = self.FRQI.image_quantum_circuit(
+                image=sparse_image, measurements=True, barriers=barriers
+            )
+            resources = self.FRQI.estimate_resources(
+                image=sparse_image, measurements=True, barriers=barriers
+            )
+
+            assert qc.count_ops()["c4ry"] == np.count_nonzero(image)
+            assert resources["gate_counts"] == dict(qc.count_ops())
+            assert resources["depth"] == qc.depth()
+
+        assert np.allclose(
+            Statevector(self.FRQI.image_quantum_circuit(image=sparse_image)).data,
+            self.FRQI.image_statevector(image=image),
+        )
+        assert np.allclose(
+            Statevector(
+                self.FRQI.image_quantum_circuit(
+                    image=sparse.csr_matrix(image), method="ucr"
+                )
+            ).data,
+            self.FRQI.image_statevector(image=image),
+        )
+
+    def test_axis_registers(self):
+
+        volume = np.random.default_rng(seed=53).random((3, 2, 2, 2))
+        frqi = FRQI(axis_registers=True)
+        qc = frqi.image_quantum_circuit(image=volume)
+        statevector = Statevector(qc).data
+
+        assert [register.name for register in qc.qregs] == [
+            "x",
+            "y",
+            "z",
+            "t",
+            "intensity",
+        ]
+        assert np.allclose(statevector, frqi.image_statevector(image=volume))
+        assert np.allclose(
+            frqi.reconstruct_image_from_statevector(
+                statevector=statevector, image_shape=volume.shape
+            ),
+            volume,
+        )
+        assert np.allclose(
+            Statevector(frqi.image_quantum_circuit(image=volume, method="ucr")).data,
+            statevector,
+        )
+
+    def test_frame_quantum_circuits(self):
+
+        series = np.random.default_rng(seed=59).random((2, 2, 3, 2))
+        frqi = FRQI(rgb=False, axis_registers=True)
+        circuits = frqi.frame_quantum_circuits(series=series)
+
+        assert len(circuits) == 2
+        for t, qc in enumerate(circuits):
+            assert np.allclose(
+                Statevector(qc).data, frqi.image_statevector(image=series[..., t])
+            )
+
+    def test_reconstruct_image_adaptively(self):
+
+        frqi = FRQI(executor=Executor(seed_simulator=5))
+        qc = frqi.image_quantum_circuit(image=self.ASTRONAUT, measurements=True)
+        report = frqi.reconstruct_image_adaptively(
+            quantum_circuit=qc,
+            image_shape=self.ASTRONAUT.shape,
+            target_error=0.02,
+            fraction=0.5,
+        )
+
+        assert report["converged"]
+        assert report["confident_fraction"] >= 0.5
+        assert np.abs(report["image"] - self.ASTRONAUT).max() < 0.1
+
+    def test_mcqi_rgb_image(self):
+
+        image = np.random.default_rng(seed=61).random((3, 2, 3))
+        frqi = FRQI(mcqi=True)
+        qc = frqi.image_quantum_circuit(image=image)
+        statevector = Statevector(qc).data
+
+        assert [register.name for register in qc.qregs] == [
+            "pixel_indexes",
+            "channel",
+            "colour",
+        ]
+        assert np.allclose(statevector, frqi.image_statevector(image=image))
+        assert np.allclose(
+            frqi.reconstruct_image_from_statevector(
+                statevector=statevector, image_shape=image.shape
+            ),
+            image,
+        )
+        for method in FRQI.METHODS:
+            assert np.allclose(
+                Statevector(
+                    frqi.image_quantum_circuit(
+                        image=image, method=method, template=True
+                    )
+                ).data,
+                statevector,
+            )
+
+    def test_mcqi_estimate_resources(self):
+
+        image = np.random.default_rng(seed=67).random((2, 2, 3))
+        frqi = FRQI(mcqi=True)
+        for method in FRQI.METHODS:
+            qc = frqi.image_quantum_circuit(image=image, method=method)
+            estimate = frqi.estimate_resources(image=image, method=method)
+            assert estimate["num_qubits"] == qc.num_qubits
+            assert estimate["gate_counts"] == dict(qc.count_ops())
+            assert estimate["depth"] == qc.depth()
+
+        standard = FRQI().estimate_resources(image=image.shape)
+        mcqi = frqi.estimate_resources(image=image.shape)
+        assert mcqi["num_qubits"] == standard["num_qubits"]
+        assert mcqi["gate_counts"]["c4ry"] == standard["gate_counts"]["ccry"]
+
+    def test_mcqi_reconstruct_image_from_frqi_result(self):
+
+        image = np.random.default_rng(seed=71).random((2, 2, 3))
+        frqi = FRQI(executor=Executor(shots=100000, seed_simulator=7), mcqi=True)
+        qc = frqi.image_quantum_circuit(image=image, measurements=True)
+        counts = frqi.executor.get_counts(quantum_circuits=[qc])[0]
+
+        assert (
+            np.abs(
+                frqi.reconstruct_image_from_frqi_result(
+                    counts=counts, image_shape=image.shape
+                )
+                - image
+            ).max()
+            < 0.05
+        )
+        assert frqi.pixel_errors(counts=counts, image_shape=image.shape).shape == (
+            image.shape
+        )
+
+    def test_reconstruct_image_from_histogram(self):
+
+        frqi = FRQI(executor=Executor(shots=2048, seed_simulator=5))
+        for encoder in (frqi, FRQI(mcqi=True), FRQI(axis_registers=True)):
+            qc = encoder.image_quantum_circuit(image=self.ASTRONAUT, measurements=True)
+            assert encoder.bit_layout(
+                image_shape=self.ASTRONAUT.shape
+            ) == register_layout(quantum_circuit=qc)
+
+        qc = frqi.image_quantum_circuit(image=self.ASTRONAUT, measurements=True)
+        expected = frqi.reconstruct_image_from_frqi_result(
+            counts=frqi.executor.get_counts(quantum_circuits=[qc])[0],
+            image_shape=self.ASTRONAUT.shape,
+        )
+        assert np.allclose(
+            frqi.reconstruct_image_from_histogram(
+                histogram=frqi.executor.get_histograms(quantum_circuits=[qc])[0],
+                image_shape=self.ASTRONAUT.shape,
+            ),
+            expected,
+        )
+        assert np.allclose(
+            frqi.reconstruct_image_from_frqi_result(
+                counts=frqi.executor.get_raw_counts(quantum_circuits=[qc])[0],
+                image_shape=self.ASTRONAUT.shape,
+            ),
+            expected,
+        )
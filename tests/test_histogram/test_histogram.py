@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+from execution import Executor
+from histogram import (
+    counts_histogram,
+    counts_outcomes,
+    memory_histogram,
+    probability_histogram,
+    register_histogram,
+    register_layout,
+    register_values,
+    result_histograms,
+)
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+
+class TestHistogram:
+    def _circuit(self) -> QuantumCircuit:
+
+        qc = QuantumCircuit(
+            QuantumRegister(size=3, name="q"),
+            ClassicalRegister(size=1, name="low"),
+            ClassicalRegister(size=2, name="high"),
+        )
+        qc.x(qubit=[0, 2])
+        qc.h(qubit=1)
+        qc.measure(qubit=[0, 1, 2], cbit=[0, 1, 2])
+
+        return qc
+
+    def test_register_layout(self):
+
+        assert register_layout(quantum_circuit=self._circuit()) == {
+            "low": (0, 1),
+            "high": (1, 2),
+        }
+
+    def test_counts_outcomes(self):
+
+        outcomes, shots = counts_outcomes(counts={"10 1": 3, "11 1": 5})
+        hex_outcomes, hex_shots = counts_outcomes(counts={"0x5": 3, "0x7": 5})
+
+        assert np.array_equal(outcomes, [5, 7])
+        assert np.array_equal(hex_outcomes, outcomes)
+        assert np.array_equal(shots, [3, 5])
+        assert np.array_equal(hex_shots, shots)
+
+    def test_counts_histogram(self):
+
+        histogram = counts_histogram(counts={"10 1": 3, "11 1": 5})
+
+        assert np.array_equal(histogram, [0, 0, 0, 0, 0, 3, 0, 5])
+        assert np.array_equal(
+            counts_histogram(counts={"0x5": 3, "0x7": 5}, num_clbits=3), histogram
+        )
+        with pytest.raises(ValueError):
+            counts_histogram(counts={"0x5": 3})
+
+    def test_memory_histogram(self):
+
+        assert np.array_equal(memory_histogram(memory=["01", "11", "01"]), [0, 2, 0, 1])
+        assert np.array_equal(
+            memory_histogram(memory=["0x1", "0x3", "0x1"], num_clbits=2), [0, 2, 0, 1]
+        )
+
+    def test_probability_histogram(self):
+
+        statevector = np.array([1, 0, 0, -1j]) / np.sqrt(2)
+
+        assert np.allclose(
+            probability_histogram(probabilities=statevector, statevector=True),
+            [0.5, 0, 0, 0.5],
+        )
+        assert np.allclose(
+            probability_histogram(probabilities=[0.25, 0.75], shots=100), [25, 75]
+        )
+
+    def test_result_histograms(self):
+
+        qc = self._circuit()
+        executor = Executor(shots=1000, seed_simulator=11)
+        (histogram,) = result_histograms(result=executor.run(quantum_circuits=[qc]))
+
+        assert histogram.sum() == 1000
+        assert np.array_equal(np.flatnonzero(histogram), [5, 7])
+        assert np.array_equal(
+            executor.get_histograms(quantum_circuits=[qc])[0],
+            counts_histogram(counts=executor.get_counts(quantum_circuits=[qc])[0]),
+        )
+
+    def test_register_values(self):
+
+        layout = register_layout(quantum_circuit=self._circuit())
+        outcomes = np.array([5, 7])
+
+        assert np.array_equal(
+            register_values(outcomes=outcomes, layout=layout, name="low"), [1, 1]
+        )
+        assert np.array_equal(
+            register_values(outcomes=outcomes, layout=layout, name="high"), [2, 3]
+        )
+
+    def test_register_histogram(self):
+
+        layout = register_layout(quantum_circuit=self._circuit())
+        histogram = np.array([0, 0, 0, 0, 0, 3, 0, 5])
+
+        assert np.array_equal(
+            register_histogram(histogram=histogram, layout=layout, names=["low"]),
+            [0, 8],
+        )
+        assert np.array_equal(
+            register_histogram(
+                histogram=histogram, layout=layout, names=["low", "high"]
+            ),
+            [[0, 0, 0, 0], [0, 0, 3, 5]],
+        )
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from layout import ImageLayout, time_frames
+
+
+class TestImageLayout:
+
+    VOLUME = np.random.default_rng(seed=37).random((3, 2, 5, 4))
+
+    def test_flattened_layout(self):
+
+        layout = ImageLayout(image_shape=(4, 4, 3))
+
+        assert layout.rgb
+        assert layout.register_names == ("pixel_indexes",)
+        assert layout.register_sizes == (4,)
+
+        layout = ImageLayout(image_shape=(4, 4, 3), rgb=False)
+
+        assert not layout.rgb
+        assert layout.register_sizes == (6,)
+        assert layout.num_positions == 48
+
+    def test_axis_registers(self):
+
+        layout = ImageLayout(image_shape=self.VOLUME.shape, axis_registers=True)
+        matrix = layout.channel_matrix(image=self.VOLUME)
+
+        assert layout.register_names == ("x", "y", "z", "t")
+        assert layout.register_sizes == (2, 1, 3, 2)
+        assert matrix.shape == (1, 2**8)
+        assert matrix[0, 2 + (1 << 2) + (4 << 3) + (3 << 6)] == self.VOLUME[2, 1, 4, 3]
+        assert np.array_equal(
+            layout.image_from_channel_matrix(matrix=matrix), self.VOLUME
+        )
+
+        coordinates, valid = layout.coordinates(positions=np.arange(2**8))
+
+        assert valid.sum() == self.VOLUME.size
+        assert np.array_equal(
+            layout.positions(coordinates=np.stack(coordinates, axis=1)[valid]),
+            np.flatnonzero(valid),
+        )
+
+    def test_rgb_axis_registers(self):
+
+        image = self.VOLUME[:, :, :3, 0]
+        layout = ImageLayout(image_shape=image.shape, rgb=True, axis_registers=True)
+        matrix = layout.channel_matrix(image=image)
+
+        assert layout.register_names == ("x", "y")
+        assert matrix.shape == (3, 8)
+        assert np.array_equal(layout.image_from_channel_matrix(matrix=matrix), image)
+
+    def test_invalid_layouts(self):
+
+        with pytest.raises(ValueError, match="Image shape should be a tuple"):
+            _ = ImageLayout(image_shape=(2, 2, 2, 2))
+        with pytest.raises(ValueError, match="last axis of size 3"):
+            _ = ImageLayout(image_shape=(2, 2, 2), rgb=True)
+        with pytest.raises(ValueError, match="2 to 4 spatial axes"):
+            _ = ImageLayout(image_shape=(2, 2, 2, 2, 2), axis_registers=True)
+
+    def test_time_frames(self):
+
+        frames = time_frames(series=self.VOLUME)
+
+        assert frames.shape == (4, 3, 2, 5)
+        assert np.array_equal(frames[1], self.VOLUME[..., 1])
@@ -1,11 +1,16 @@
 import pytest
 import numpy as np
+from execution import Executor
+from histogram import register_layout
 from neqr import NEQR
-from qiskit import execute
+from qiskit import execute, transpile
 from qiskit.providers.aer.backends import AerSimulator
+from qiskit.quantum_info import Statevector
+from scipy import sparse
 from skimage import data
 from skimage.color import rgb2gray
 from skimage.transform import resize
+from sparsity import to_sparse_image
 
 
 class TestNEQR:
@@ -432,3 +437,374 @@ class TestNEQR:
         )
 
         assert np.allclose(image_3d, image)
+
+    def test_vectorized_encoding_matches_per_pixel_construction(self):
+
+        resized_astronaut_pic = resize(self.ASTRONAUT_IMAGE_RGB, (2, 2))
+
+        for image in [self.ZERO_IMAGE_MATRIX, resized_astronaut_pic]:
+            qc = self.NEQR.image_quantum_circuit(image=image)
+            expected_qc = self.NEQR._initialize_circuit(image=image)
+
+            if len(image.shape) == 3:
+                channels = [image[:, :, i] for i in range(3)]
+                control_qubits = list(expected_qc.qregs[1]) + list(expected_qc.qregs[2])
+                rgb = expected_qc.qregs[2]
+                flips = [[rgb[0], rgb[1]], [rgb[1]], [rgb[0]]]
+            else:
+                channels = [image]
+                control_qubits = list(expected_qc.qregs[1])
+                flips = [[]]
+
+            for j, channel in enumerate(channels):
+                for k, entry in enumerate(channel.flatten()):
+                    intensity = int(np.round(255 * entry))
+                    if intensity == 0:
+                        continue
+                    zeros = [
+                        expected_qc.qregs[1][idx]
+                        for idx in range(expected_qc.qregs[1].size)
+                        if not (k >> idx) & 1
+                    ] + flips[j]
+                    expected_qc.x(zeros)
+                    for idx in range(8):
+                        if (intensity >> idx) & 1:
+                            expected_qc.mct(
+                                control_qubits=control_qubits,
+                                target_qubit=expected_qc.qregs[0][idx],
+                            )
+                    expected_qc.x(zeros)
+                    expected_qc.barrier()
+
+            assert qc == expected_qc
+
+    def test_compressed_encoding_state(self):
+
+        background_image = np.zeros((8, 8))
+        background_image[2:6, 2:6] = 0.5
+        resized_astronaut_pic = resize(self.ASTRONAUT_IMAGE_RGB, (2, 2))
+
+        for image in [
+            self.ZERO_IMAGE_MATRIX,
+            background_image,
+            resized_astronaut_pic,
+        ]:
+            qc = self.NEQR.image_quantum_circuit(image=image)
+            qc_compressed = self.NEQR.image_quantum_circuit(image=image, compress=True)
+
+            assert Statevector(qc_compressed).equiv(Statevector(qc))
+
+    def test_compression_report(self):
+
+        background_image = np.zeros((8, 8))
+        background_image[4:8, 0:4] = 1
+
+        report = self.NEQR.compression_report(image=background_image)
+        qc_compressed = self.NEQR.image_quantum_circuit(
+            image=background_image, compress=True
+        )
+
+        assert report["pixel_terms"] == 16 * 8
+        assert report["compressed_terms"] == 8
+        assert qc_compressed.count_ops()["ccx"] == report["compressed_terms"]
+        assert np.isclose(report["reduction"], 1 - 8 / 128)
+
+    def test_image_statevector(self):
+
+        resized_astronaut_pic = resize(self.ASTRONAUT_IMAGE_RGB, (2, 2))
+        image_3d = np.random.default_rng(seed=7).random((2, 2, 2))
+
+        for image in [self.ZERO_IMAGE_MATRIX, resized_astronaut_pic, image_3d]:
+            qc = self.NEQR.image_quantum_circuit(image=image)
+            expected_statevector = Statevector(qc)
+
+            statevector = self.NEQR.image_statevector(image=image)
+            probabilities = self.NEQR.image_probabilities(image=image)
+
+            assert np.allclose(statevector, expected_statevector.data)
+            assert np.allclose(probabilities, expected_statevector.probabilities())
+
+    def test_batch_quantum_circuits(self):
+
+        images = np.stack([self.ZERO_IMAGE_MATRIX, 1 - self.ZERO_IMAGE_MATRIX])
+        circuits = self.NEQR.batch_quantum_circuits(
+            images=images, measurements=True, compress=True, max_workers=2
+        )
+
+        assert self.NEQR.last_batch_strategy["num_chunks"] == 2
+        assert circuits == [
+            self.NEQR.image_quantum_circuit(
+                image=image, measurements=True, compress=True
+            )
+            for image in images
+        ]
+
+    def test_reconstruct_image_majority_vote(self):
+
+        image = np.array([[0, 128], [255, 64]]) / 255
+        rgb_image = np.stack([image, image[::-1], image.T], axis=2)
+
+        counts = {}
+        rgb_counts = {}
+        for k, entry in enumerate(image.flatten()):
+            intensity = int(np.round(255 * entry))
+            counts[f"{k:02b} {intensity:08b}"] = 100
+            counts[f"{k:02b} {(intensity + 1) % 256:08b}"] = 3
+            counts[f"{k:02b} {0:08b}"] = counts.get(f"{k:02b} {0:08b}", 2)
+        for c in range(3):
+            for k, entry in enumerate(rgb_image[:, :, c].flatten()):
+                intensity = int(np.round(255 * entry))
+                rgb_counts[f"{c:02b} {k:02b} {intensity:08b}"] = 50
+                rgb_counts[f"{c:02b} {k:02b} {255 - intensity:08b}"] = 1
+        rgb_counts["11 00 11111111"] = 500
+
+        reconstructed_image = self.NEQR.reconstruct_image_from_neqr_result(
+            counts=counts, image_shape=image.shape
+        )
+        reconstructed_rgb_image = self.NEQR.reconstruct_image_from_neqr_result(
+            counts=rgb_counts, image_shape=rgb_image.shape
+        )
+
+        assert np.allclose(reconstructed_image, image)
+        assert np.allclose(reconstructed_rgb_image, rgb_image)
+
+    def test_encoding_without_barriers(self):
+
+        image = np.random.default_rng(seed=7).random((4, 4, 3))
+
+        for compress in [False, True]:
+            qc = self.NEQR.image_quantum_circuit(image=image, compress=compress)
+            qc_no_barriers = self.NEQR.image_quantum_circuit(
+                image=image, compress=compress, barriers=False
+            )
+
+            assert "barrier" not in qc_no_barriers.count_ops()
+            assert qc_no_barriers.count_ops()["x"] < qc.count_ops()["x"]
+            assert Statevector(qc_no_barriers).equiv(Statevector(qc))
+
+    def test_mct_modes(self):
+
+        image = np.random.default_rng(seed=11).random((4, 8))
+
+        for mct_mode, num_ancillas in [
+            ("noancilla", 0),
+            ("v-chain", 3),
+            ("recursion", 0),
+        ]:
+            neqr = NEQR(mct_mode=mct_mode)
+            qc = neqr.image_quantum_circuit(image=image)
+
+            assert qc.num_qubits == 8 + 5 + num_ancillas
+            assert np.allclose(
+                Statevector(qc).data, neqr.image_statevector(image=image)
+            )
+
+    def test_reconstruct_image_with_ancilla_register(self):
+
+        image = np.random.default_rng(seed=13).random((4, 4))
+        neqr = NEQR(mct_mode="v-chain")
+        qc = neqr.image_quantum_circuit(image=image, measurements=True)
+
+        reconstructed_image = neqr.reconstruct_images(
+            quantum_circuits=[qc], image_shape=image.shape
+        )[0]
+
+        assert "ancilla" in [register.name for register in qc.qregs]
+        assert np.allclose(reconstructed_image, np.round(255 * image) / 255)
+
+    def test_invalid_mct_mode(self):
+
+        with pytest.raises(ValueError, match="Unsupported mct_mode"):
+            _ = NEQR(mct_mode="v-chain-dirty")
+
+    def test_estimate_resources(self):
+
+        image = np.random.default_rng(seed=17).random((4, 2, 3))
+        image[0, 0] = 0
+
+        for mct_mode in NEQR.MCT_MODES:
+            neqr = NEQR(mct_mode=mct_mode)
+            for compress, barriers, measurements in [
+                (False, True, False),
+                (False, False, True),
+                (True, True, True),
+                (True, False, False),
+            ]:
+                options = {
+                    "measurements": measurements,
+                    "compress": compress,
+                    "barriers": barriers,
+                }
+                resources = neqr.estimate_resources(image=image, **options)
+                qc = neqr.image_quantum_circuit(image=image, **options)
+                transpiled_qc = transpile(
+                    circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+                )
+
+                assert resources["num_qubits"] == qc.num_qubits
+                assert resources["gate_counts"] == dict(qc.count_ops())
+                assert resources["cx_count"] == transpiled_qc.count_ops()["cx"]
+                assert resources["depth"] == qc.depth()
+                assert resources["statevector_memory"] == 16 * 2**qc.num_qubits
+
+    def test_estimate_resources_from_shape(self):
+
+        resources = self.NEQR.estimate_resources(image=(2, 2))
+        qc = self.NEQR.image_quantum_circuit(image=np.ones((2, 2)))
+
+        assert resources["gate_counts"] == dict(qc.count_ops())
+        assert resources["depth"] == qc.depth()
+
+        with pytest.raises(ValueError, match="compressed estimate needs the image"):
+            _ = self.NEQR.estimate_resources(image=(2, 2), compress=True)
+
+    def test_sparse_image(self):
+
+        image = np.zeros((4, 4, 3))
+        image[1, 2] = [0.5, 0, 1]
+        image[3, 0, 1] = 0.25
+        sparse_image = to_sparse_image(image=image)
+
+        for compress in [False, True]:
+            qc = self.NEQR.image_quantum_circuit(image=image, compress=compress)
+            sparse_qc = self.NEQR.image_quantum_circuit(
+                image=sparse_image, compress=compress
+            )
+
+            assert sparse_qc == qc
+            assert self.NEQR.estimate_resources(
+                image=sparse_image, compress=compress
+            ) == self.NEQR.estimate_resources(image=image, compress=compress)
+
+        assert self.NEQR.image_quantum_circuit(
+            image=sparse.csr_matrix(image[:, :, 0])
+        ) == self.NEQR.image_quantum_circuit(image=image[:, :, 0])
+
+    def test_bit_depth(self):
+
+        image = np.random.default_rng(seed=31).random((2, 2, 3))
+
+        for bit_depth in [1, 4, 12]:
+            neqr = NEQR(bit_depth=bit_depth)
+            qc = neqr.image_quantum_circuit(image=image)
+            max_intensity = 2**bit_depth - 1
+
+            assert qc.qregs[0].size == bit_depth
+            assert qc.num_qubits == bit_depth + 4
+            assert np.allclose(
+                Statevector(qc).data, neqr.image_statevector(image=image)
+            )
+
+            qc = neqr.image_quantum_circuit(image=image, measurements=True)
+            counts = (
+                execute(experiments=qc, backend=self.BACKEND, shots=self.SHOTS)
+                .result()
+                .get_counts()
+            )
+            reconstructed_image = neqr.reconstruct_image_from_neqr_result(
+                counts=counts, image_shape=image.shape
+            )
+
+            assert np.allclose(
+                reconstructed_image, np.round(image * max_intensity) / max_intensity
+            )
+
+    def test_invalid_bit_depth(self):
+
+        with pytest.raises(ValueError, match="positive integer"):
+            _ = NEQR(bit_depth=0)
+        with pytest.raises(ValueError, match="at least 2"):
+            _ = NEQR(mct_mode="recursion", bit_depth=1)
+
+    def test_axis_registers(self):
+
+        volume = np.round(np.random.default_rng(seed=41).random((3, 2, 2, 2)) * 3) / 3
+        neqr = NEQR(bit_depth=2, axis_registers=True)
+        qc = neqr.image_quantum_circuit(image=volume)
+
+        assert [(register.name, register.size) for register in qc.qregs] == [
+            ("intensity", 2),
+            ("x", 2),
+            ("y", 1),
+            ("z", 1),
+            ("t", 1),
+        ]
+        assert np.allclose(Statevector(qc).data, neqr.image_statevector(image=volume))
+
+        qc = neqr.image_quantum_circuit(image=volume, measurements=True)
+        counts = (
+            execute(experiments=qc, backend=self.BACKEND, shots=self.SHOTS)
+            .result()
+            .get_counts()
+        )
+        reconstructed_volume = neqr.reconstruct_image_from_neqr_result(
+            counts=counts, image_shape=volume.shape
+        )
+
+        assert np.allclose(reconstructed_volume, volume)
+
+    def test_explicit_rgb(self):
+
+        volume = np.random.default_rng(seed=43).random((2, 2, 3))
+        qc = NEQR(rgb=False).image_quantum_circuit(image=volume)
+
+        assert [register.name for register in qc.qregs] == [
+            "intensity",
+            "pixel_indexes",
+        ]
+        assert qc.qregs[1].size == 4
+
+    def test_frame_quantum_circuits(self):
+
+        series = np.random.default_rng(seed=47).random((2, 2, 2, 3))
+        neqr = NEQR(axis_registers=True)
+        circuits = neqr.frame_quantum_circuits(series=series, measurements=True)
+
+        assert len(circuits) == 3
+        for t, qc in enumerate(circuits):
+            assert qc == neqr.image_quantum_circuit(
+                image=series[..., t], measurements=True
+            )
+
+    def test_reconstruct_image_adaptively(self):
+
+        image = np.random.default_rng(seed=61).random((4, 4))
+        neqr = NEQR(executor=Executor(seed_simulator=3))
+        qc = neqr.image_quantum_circuit(image=image, measurements=True)
+        report = neqr.reconstruct_image_adaptively(
+            quantum_circuit=qc, image_shape=image.shape, target_error=0.05
+        )
+
+        assert report["converged"]
+        assert report["shots"] < self.SHOTS
+        assert np.all(report["pixel_errors"] <= 0.05)
+        assert np.allclose(report["image"], np.round(image * 255) / 255)
+
+    def test_reconstruct_image_from_histogram(self):
+
+        image = np.random.default_rng(seed=83).random((2, 2, 3))
+        neqr = NEQR(executor=Executor(shots=2048, seed_simulator=5), bit_depth=4)
+        qc = neqr.image_quantum_circuit(image=image, measurements=True)
+
+        assert neqr.bit_layout(image_shape=image.shape) == register_layout(
+            quantum_circuit=qc
+        )
+        expected = neqr.reconstruct_image_from_neqr_result(
+            counts=neqr.executor.get_counts(quantum_circuits=[qc])[0],
+            image_shape=image.shape,
+        )
+        assert np.allclose(expected, np.round(image * 15) / 15)
+        assert np.allclose(
+            neqr.reconstruct_image_from_histogram(
+                histogram=neqr.executor.get_histograms(quantum_circuits=[qc])[0],
+                image_shape=image.shape,
+            ),
+            expected,
+        )
+        assert np.allclose(
+            neqr.reconstruct_image_from_neqr_result(
+                counts=neqr.executor.get_raw_counts(quantum_circuits=[qc])[0],
+                image_shape=image.shape,
+            ),
+            expected,
+        )
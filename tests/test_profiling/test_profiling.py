@@ -0,0 +1,98 @@
+import csv
+import json
+import numpy as np
+from execution import Executor
+from frqi import FRQI
+from neqr import NEQR
+from profiling import ProfileCollector, active_collector, profile_stage, profiled
+
+
+class TestProfiling:
+
+    IMAGE = np.random.default_rng(seed=79).random((2, 2))
+
+    def test_disabled(self):
+
+        assert active_collector() is None
+        with profile_stage(stage="stage") as record:
+            assert record is None
+
+    def test_encoder_stages(self):
+
+        neqr = NEQR(executor=Executor(shots=256, seed_simulator=3))
+        with ProfileCollector() as collector:
+            assert active_collector() is collector
+            qc = neqr.image_quantum_circuit(image=self.IMAGE, measurements=True)
+            counts = neqr.executor.get_counts(quantum_circuits=[qc])[0]
+            neqr.reconstruct_image_from_neqr_result(
+                counts=counts, image_shape=self.IMAGE.shape
+            )
+
+        assert active_collector() is None
+        assert [
+            (record["stage"], record["parent"]) for record in collector.records
+        ] == [
+            ("NEQR._initialize_circuit", "NEQR.image_quantum_circuit"),
+            ("NEQR._encode_image", "NEQR.image_quantum_circuit"),
+            ("NEQR._add_measurements", "NEQR.image_quantum_circuit"),
+            ("NEQR.image_quantum_circuit", None),
+            ("Executor.transpile", None),
+            ("Executor.simulate", None),
+            ("NEQR.reconstruct_image_from_neqr_result", None),
+        ]
+        assert collector.records[3]["gate_count"] == len(qc.data)
+        assert all(record["wall_time"] >= 0 for record in collector.records)
+        assert all(record["peak_memory"] is None for record in collector.records)
+
+    def test_peak_memory(self):
+        @profiled
+        def allocate(size: int) -> np.ndarray:
+            return np.ones(size)
+
+        with ProfileCollector(memory=True) as collector:
+            with profile_stage(stage="outer"):
+                allocate(size=2**16)
+
+        inner, outer = collector.records
+        assert inner["stage"].endswith("allocate")
+        assert inner["parent"] == "outer"
+        assert inner["peak_memory"] >= 8 * 2**16
+        assert outer["peak_memory"] >= inner["peak_memory"]
+
+    def test_summary(self):
+
+        frqi = FRQI()
+        with ProfileCollector() as collector:
+            for method in FRQI.METHODS:
+                frqi.image_quantum_circuit(image=self.IMAGE, method=method)
+
+        summary = collector.summary()
+        assert summary["FRQI.image_quantum_circuit"]["calls"] == 2
+        assert summary["FRQI._initialize_circuit"]["calls"] == 2
+        assert summary["FRQI._encode_image"]["calls"] == 1
+        assert summary["FRQI._encode_image_ucr"]["calls"] == 1
+
+    def test_export(self, tmp_path):
+
+        with ProfileCollector() as collector:
+            FRQI().image_quantum_circuit(image=self.IMAGE, measurements=True)
+        collector.to_json(path=tmp_path / "profile.json")
+        collector.to_csv(path=tmp_path / "profile.csv")
+
+        with open(tmp_path / "profile.json") as file:
+            assert json.load(file) == collector.records
+        with open(tmp_path / "profile.csv") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["stage"] for row in rows] == [
+            record["stage"] for record in collector.records
+        ]
+
+    def test_custom_collector(self):
+        class StageNames(ProfileCollector):
+            def record(self, record: dict) -> None:
+                self.records.append(record["stage"])
+
+        with StageNames() as collector:
+            NEQR().image_quantum_circuit(image=self.IMAGE)
+
+        assert collector.records[-1] == "NEQR.image_quantum_circuit"
@@ -0,0 +1,57 @@
+import numpy as np
+from qhed import QHED
+from qiskit import transpile
+from qiskit.quantum_info import Operator
+
+
+class TestQHED:
+
+    QHED = QHED()
+    IMAGE = np.array(
+        [
+            [0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 1, 1, 1, 1, 1, 0, 0],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [0, 0, 0, 1, 1, 1, 1, 0],
+            [0, 0, 0, 1, 1, 1, 1, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0],
+        ]
+    )
+
+    def _classical_edge_scan(self, image: np.ndarray) -> np.ndarray:
+
+        pixels = image.flatten()
+        edges = pixels != np.roll(pixels, -1)
+
+        return edges.reshape(image.shape)
+
+    def test_decrement(self):
+
+        num_qubits = 6
+        decrement_matrix = np.roll(np.identity(2**num_qubits), 1, axis=1)
+
+        qc = self.QHED._decrement(num_qubits=num_qubits)
+
+        assert Operator(qc).equiv(Operator(np.kron(np.identity(2), decrement_matrix)))
+
+        for num_qubits in [4, 8, 12]:
+            qc = transpile(
+                circuits=self.QHED._decrement(num_qubits=num_qubits),
+                basis_gates=["u", "cx"],
+                optimization_level=0,
+            )
+
+            assert qc.count_ops()["cx"] <= 8 * num_qubits**2
+
+    def test_detect_edges(self):
+
+        for image in [self.IMAGE, self.IMAGE[:4, :]]:
+            expected_edges = self._classical_edge_scan(image=image) | (
+                self._classical_edge_scan(image=image.T).T
+            )
+
+            edges = self.QHED.detect_edges(image=image)
+
+            assert np.array_equal(edges, expected_edges.astype(int))
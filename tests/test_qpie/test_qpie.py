@@ -1,8 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from qpie import QPIE
+from qiskit import transpile
+from qiskit.quantum_info import Statevector
+from scipy import sparse
 from skimage import data
 from skimage.color import rgb2gray
 from skimage.transform import resize
+from sparsity import to_sparse_image
 
 
 class TestQPIE:
@@ -65,3 +70,132 @@ class TestQPIE:
 
         assert np.allclose(normalized_image1, image1)
         assert np.allclose(normalized_image2, image2)
+
+    def test_image_statevector(self):
+
+        resized_astro_gray_pic = resize(self.ASTRONAUT_IMAGE_GRAY, (8, 8))
+
+        for image in [resized_astro_gray_pic, self.IMAGE]:
+            qc = self.QPIE.image_quantum_circuit(image=image)
+            expected_statevector = Statevector(qc)
+
+            statevector = self.QPIE.image_statevector(image=image)
+            probabilities = self.QPIE.image_probabilities(image=image)
+
+            assert np.allclose(statevector, expected_statevector.data)
+            assert np.allclose(probabilities, expected_statevector.probabilities())
+
+    def test_batch_quantum_circuits(self):
+
+        images = [self.IMAGE, resize(self.ASTRONAUT_IMAGE_GRAY, (8, 8))]
+        circuits = self.QPIE.batch_quantum_circuits(images=images, max_workers=1)
+
+        assert self.QPIE.last_batch_strategy["strategy"] == "serial"
+        assert circuits == [
+            self.QPIE.image_quantum_circuit(image=image) for image in images
+        ]
+
+    def test_recover_image_does_not_modify_circuit(self):
+
+        normalized_image = self.IMAGE / np.linalg.norm(self.IMAGE)
+        qc = self.QPIE.image_quantum_circuit(image=self.IMAGE)
+        expected_qc = qc.copy()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            images = list(
+                executor.map(
+                    lambda _: self.QPIE.recover_image_from_statevector(
+                        quantum_circuit=qc, image_shape=self.IMAGE.shape
+                    ),
+                    range(8),
+                )
+            )
+
+        assert qc == expected_qc
+        for image in images:
+            assert np.allclose(image, normalized_image)
+
+    def test_single_precision_pipeline(self):
+
+        qpie = QPIE(dtype=np.float32)
+        image = self.IMAGE.astype(np.float32)
+        normalized_image = image / np.linalg.norm(image)
+
+        statevector = qpie.image_statevector(image=image)
+        qc = qpie.image_quantum_circuit(image=image)
+        recovered_image = qpie.recover_image_from_statevector(
+            quantum_circuit=qc, image_shape=image.shape
+        )
+
+        assert statevector.dtype == np.float32
+        assert statevector.flags["C_CONTIGUOUS"]
+        assert recovered_image.dtype == np.float32
+        assert np.allclose(recovered_image, normalized_image, atol=1e-6)
+        assert np.array_equal(image, self.IMAGE)
+
+    def test_recover_images_from_statevectors(self):
+
+        images = [self.IMAGE, resize(self.ASTRONAUT_IMAGE_GRAY, (8, 8))]
+        circuits = [self.QPIE.image_quantum_circuit(image=image) for image in images]
+
+        recovered_images = self.QPIE.recover_images_from_statevectors(
+            quantum_circuits=circuits, image_shape=(8, 8)
+        )
+
+        for image, recovered_image in zip(images, recovered_images):
+            assert np.allclose(image / np.linalg.norm(image), recovered_image)
+
+    def test_reconstruct_image_from_statevector(self):
+
+        image = np.random.default_rng(seed=7).random((3, 6))
+        statevector = Statevector(self.QPIE.image_quantum_circuit(image=image)).data
+
+        reconstructed_image = self.QPIE.reconstruct_image_from_statevector(
+            statevector=statevector, image_shape=image.shape
+        )
+
+        assert reconstructed_image.shape == image.shape
+        assert reconstructed_image.dtype == np.float64
+        assert np.allclose(reconstructed_image, image / np.linalg.norm(image))
+
+    def test_estimate_resources(self):
+
+        image = np.random.default_rng(seed=19).random((4, 6))
+        resources = self.QPIE.estimate_resources(image=image, measurements=True)
+        qc = self.QPIE.image_quantum_circuit(image=image, measurements=True)
+        transpiled_qc = transpile(
+            circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+        )
+
+        assert resources["num_qubits"] == qc.num_qubits
+        assert resources["gate_counts"] == dict(qc.count_ops())
+        assert resources["cx_count"] == transpiled_qc.count_ops()["cx"]
+        assert resources["depth"] == qc.depth()
+        assert (
+            QPIE(dtype=np.float32).estimate_resources(image=(4, 6))[
+                "statevector_memory"
+            ]
+            == 8 * 2**5
+        )
+
+    def test_sparse_image(self):
+
+        image = np.zeros((8, 8))
+        image[1, 2], image[4, 7], image[6, 3] = 0.5, -0.25, 1
+        sparse_image = to_sparse_image(image=image)
+        qc = self.QPIE.image_quantum_circuit(image=sparse_image, measurements=True)
+        resources = self.QPIE.estimate_resources(image=sparse_image, measurements=True)
+        transpiled_qc = transpile(
+            circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+        )
+
+        assert "initialize" not in qc.count_ops()
+        assert resources["gate_counts"] == dict(qc.count_ops())
+        assert resources["cx_count"] == transpiled_qc.count_ops()["cx"]
+        assert resources["depth"] == qc.depth()
+        assert np.allclose(
+            Statevector(
+                self.QPIE.image_quantum_circuit(image=sparse.csr_matrix(image))
+            ).data,
+            self.QPIE.image_statevector(image=image),
+        )
@@ -0,0 +1,96 @@
+import numpy as np
+from emission import controlled_instructions
+from qiskit import transpile
+from qiskit.circuit import QuantumCircuit
+from qiskit.circuit.library.standard_gates import MCXGrayCode, RYGate, XGate
+from resources import (
+    controlled_terms_depth,
+    decomposed_cx_count,
+    flip_gate_count,
+    mcry_resources,
+    stream_resources,
+)
+
+
+class TestResources:
+
+    FLIP_MASKS = np.random.default_rng(seed=23).random((20, 4)) < 0.5
+
+    def _controlled_circuit(self, barriers: bool) -> QuantumCircuit:
+
+        qc = QuantumCircuit(5)
+        gate = MCXGrayCode(num_ctrl_qubits=4)
+        terms = [
+            (flip_mask, [(gate, list(qc.qubits), [])] * (i % 3 + 1))
+            for i, flip_mask in enumerate(self.FLIP_MASKS)
+        ]
+        for operation, qargs, cargs in controlled_instructions(
+            terms=terms,
+            control_qubits=qc.qubits[:4],
+            barrier_qubits=list(qc.qubits),
+            barriers=barriers,
+        ):
+            qc.append(operation, qargs=qargs, cargs=cargs)
+
+        return qc
+
+    def test_controlled_terms(self):
+
+        num_instructions = np.arange(len(self.FLIP_MASKS)) % 3 + 1
+
+        for barriers in [True, False]:
+            qc = self._controlled_circuit(barriers=barriers)
+
+            assert flip_gate_count(
+                flip_masks=self.FLIP_MASKS, barriers=barriers
+            ) == qc.count_ops().get("x", 0)
+            assert (
+                controlled_terms_depth(
+                    flip_masks=self.FLIP_MASKS,
+                    num_instructions=num_instructions,
+                    barriers=barriers,
+                )
+                == qc.depth()
+            )
+
+    def test_stream_resources(self):
+
+        qc = self._controlled_circuit(barriers=False)
+        gate_counts, cx_count, depth = stream_resources(
+            quantum_circuit=QuantumCircuit(5),
+            instructions=(
+                (instruction.operation, instruction.qubits, instruction.clbits)
+                for instruction in qc.data
+            ),
+        )
+        transpiled_qc = transpile(
+            circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+        )
+
+        assert gate_counts == dict(qc.count_ops())
+        assert cx_count == transpiled_qc.count_ops()["cx"]
+        assert depth == qc.depth()
+
+    def test_decomposed_cx_count(self):
+
+        for num_ctrl_qubits in range(1, 7):
+            for gate in [
+                MCXGrayCode(num_ctrl_qubits=num_ctrl_qubits),
+                RYGate(theta=0.3).control(num_ctrl_qubits=num_ctrl_qubits),
+            ]:
+                qc = QuantumCircuit(gate.num_qubits)
+                qc.append(gate, qargs=list(range(gate.num_qubits)))
+                transpiled_qc = transpile(
+                    circuits=qc, basis_gates=["u", "cx"], optimization_level=0
+                )
+
+                assert (
+                    decomposed_cx_count(operation=gate)
+                    == transpiled_qc.count_ops()["cx"]
+                )
+            assert mcry_resources(num_ctrl_qubits=num_ctrl_qubits) == (
+                gate.name,
+                decomposed_cx_count(operation=gate),
+            )
+
+        assert decomposed_cx_count(operation=XGate()) == 0
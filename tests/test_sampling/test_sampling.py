@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from execution import Executor
+from qiskit import QuantumCircuit
+from sampling import adaptive_counts, merge_counts
+
+
+class TestSampling:
+
+    EXECUTOR = Executor(seed_simulator=7)
+
+    def _hadamard_circuit(self) -> QuantumCircuit:
+
+        qc = QuantumCircuit(2, 2)
+        qc.h(qubit=[0, 1])
+        qc.measure(qubit=[0, 1], cbit=[0, 1])
+
+        return qc
+
+    def _pixel_errors(self, counts: dict) -> np.ndarray:
+
+        shots = np.array([counts.get(key, 0) for key in ["00", "01", "10", "11"]])
+
+        return 1 / np.sqrt(np.maximum(shots, 1))
+
+    def test_merge_counts(self):
+
+        counts = merge_counts(counts={"00": 3, "01": 1}, new_counts={"01": 2, "11": 5})
+
+        assert counts == {"00": 3, "01": 3, "11": 5}
+
+    def test_adaptive_counts(self):
+
+        report = adaptive_counts(
+            executor=self.EXECUTOR,
+            quantum_circuit=self._hadamard_circuit(),
+            pixel_errors=self._pixel_errors,
+            target_error=0.05,
+            initial_shots=100,
+        )
+
+        assert report["converged"]
+        assert report["confident_fraction"] == 1.0
+        assert report["shots"] == sum(report["counts"].values())
+        assert report["shots"] == 100 * (2 ** report["rounds"] - 1)
+        assert np.all(report["pixel_errors"] <= 0.05)
+
+    def test_adaptive_counts_budget(self):
+
+        report = adaptive_counts(
+            executor=self.EXECUTOR,
+            quantum_circuit=self._hadamard_circuit(),
+            pixel_errors=self._pixel_errors,
+            target_error=0.001,
+            initial_shots=100,
+            max_shots=1000,
+        )
+
+        assert not report["converged"]
+        assert report["shots"] == 1000
+
+    def test_invalid_fraction(self):
+
+        with pytest.raises(ValueError, match="fraction"):
+            _ = adaptive_counts(
+                executor=self.EXECUTOR,
+                quantum_circuit=self._hadamard_circuit(),
+                pixel_errors=self._pixel_errors,
+                target_error=0.05,
+                fraction=0,
+            )
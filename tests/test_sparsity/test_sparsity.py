@@ -0,0 +1,71 @@
+import numpy as np
+from scipy import sparse
+from sparsity import (
+    SparseImage,
+    is_sparse_image,
+    sparse_channel_pixels,
+    to_dense_image,
+    to_sparse_image,
+)
+
+
+class TestSparsity:
+
+    IMAGE = np.array([[0, 0.5, 0], [0, 0, 0.25], [1, 0, 0]])
+    RGB_IMAGE = np.random.default_rng(seed=29).random((2, 2, 3)) * np.array([1, 0, 1])
+
+    def test_is_sparse_image(self):
+
+        assert is_sparse_image(to_sparse_image(image=self.IMAGE))
+        assert is_sparse_image(sparse.csr_matrix(self.IMAGE))
+        assert not is_sparse_image(self.IMAGE)
+        assert not is_sparse_image((3, 3))
+
+    def test_dense_round_trip(self):
+
+        for image in [self.IMAGE, self.RGB_IMAGE]:
+            sparse_image = to_sparse_image(image=image)
+
+            assert len(sparse_image.values) == np.count_nonzero(image)
+            assert np.array_equal(to_dense_image(image=sparse_image), image)
+
+        assert to_dense_image(image=self.IMAGE) is self.IMAGE
+        assert np.array_equal(
+            to_dense_image(image=sparse.csr_matrix(self.IMAGE)), self.IMAGE
+        )
+
+    def test_duplicates_and_explicit_zeros(self):
+
+        sparse_image = SparseImage(
+            coordinates=[[2, 0], [0, 1], [2, 0], [1, 1]],
+            values=[0.5, 0.5, 0.5, 0],
+            shape=(3, 3),
+        )
+        expected_image = np.array([[0, 0.5, 0], [0, 0, 0], [1, 0, 0]])
+        result = to_sparse_image(image=sparse_image)
+
+        assert np.array_equal(result.coordinates, [[0, 1], [2, 0]])
+        assert np.array_equal(result.values, [0.5, 1])
+        assert np.array_equal(to_dense_image(image=sparse_image), expected_image)
+
+    def test_sparse_channel_pixels(self):
+
+        num_channels, num_pixels, channels, pixels, values = sparse_channel_pixels(
+            image=self.RGB_IMAGE
+        )
+
+        assert (num_channels, num_pixels) == (3, 4)
+        assert np.array_equal(channels, [0, 0, 0, 0, 2, 2, 2, 2])
+        assert np.array_equal(pixels, [0, 1, 2, 3, 0, 1, 2, 3])
+        assert np.allclose(
+            values, np.moveaxis(self.RGB_IMAGE, 2, 0)[[0, 2]].reshape(-1)
+        )
+
+        num_channels, num_pixels, channels, pixels, values = sparse_channel_pixels(
+            image=sparse.csr_matrix(self.IMAGE)
+        )
+
+        assert (num_channels, num_pixels) == (1, 9)
+        assert np.array_equal(channels, [0, 0, 0])
+        assert np.array_equal(pixels, [1, 5, 6])
+        assert np.array_equal(values, [0.5, 0.25, 1])
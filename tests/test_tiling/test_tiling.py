@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+from frqi import FRQI
+from neqr import NEQR
+from qpie import QPIE
+from skimage import data
+from skimage.color import rgb2gray
+from skimage.transform import resize
+from tiling import Tiler
+
+
+class TestTiler:
+
+    ASTRONAUT_IMAGE_GRAY = (
+        np.round(resize(rgb2gray(data.astronaut()), (6, 8)) * 255) / 255
+    )
+    ASTRONAUT_IMAGE_RGB = np.round(resize(data.astronaut(), (4, 4)) * 255) / 255
+
+    def test_split_and_stitch(self):
+
+        tiler = Tiler(encoder=QPIE(), tile_shape=(4, 4), overlap=1)
+        tiles, positions = tiler.split_image(image=self.ASTRONAUT_IMAGE_GRAY)
+
+        image = tiler.stitch_tiles(tiles=tiles, positions=positions, image_shape=(6, 8))
+
+        assert positions == [(0, 0), (0, 3), (0, 6), (3, 0), (3, 3), (3, 6)]
+        assert all(tile.shape == (4, 4) for tile in tiles)
+        assert np.allclose(image, self.ASTRONAUT_IMAGE_GRAY)
+
+    def test_choose_tile_shape(self):
+
+        tiler = Tiler(encoder=NEQR(), memory_budget=16 * 2**12)
+
+        assert tiler.choose_tile_shape(image_shape=(256, 256)) == (4, 4)
+        assert tiler.choose_tile_shape(image_shape=(2, 3)) == (2, 4)
+        assert tiler.statevector_memory(tile_shape=(4, 4)) == 16 * 2**12
+
+        tiler = Tiler(encoder=NEQR(bit_depth=4), memory_budget=16 * 2**12)
+
+        assert tiler.choose_tile_shape(image_shape=(256, 256)) == (16, 16)
+
+        tiler = Tiler(encoder=QPIE(), memory_budget=16 * 2**10)
+
+        assert tiler.choose_tile_shape(image_shape=(64, 64, 3)) == (16, 16)
+        assert tiler.statevector_memory(tile_shape=(32, 32, 3)) == 16 * 2**12
+
+        tiler = Tiler(encoder=QPIE(dtype=np.float32), memory_budget=8 * 2**12)
+
+        assert tiler.choose_tile_shape(image_shape=(64, 64, 3)) == (32, 32)
+
+        with pytest.raises(ValueError, match="No tile shape fits"):
+            _ = Tiler(encoder=NEQR(), memory_budget=1).choose_tile_shape(
+                image_shape=(8, 8)
+            )
+
+    def test_invalid_tile_shape(self):
+
+        with pytest.raises(ValueError, match="power of two"):
+            _ = Tiler(encoder=FRQI(), tile_shape=(3, 4))
+        with pytest.raises(ValueError, match="overlap"):
+            _ = Tiler(encoder=FRQI(), tile_shape=(2, 2), overlap=2)
+
+    def test_reconstruct_image(self):
+
+        image = self.ASTRONAUT_IMAGE_GRAY.copy()
+        image[:4, :4] = 0
+
+        for encoder in [NEQR(), FRQI(), QPIE()]:
+            tiler = Tiler(encoder=encoder, tile_shape=(4, 4), max_workers=1)
+
+            reconstructed_image = tiler.reconstruct_image(image=image)
+
+            assert np.allclose(reconstructed_image, image)
+
+    def test_reconstruct_rgb_image_with_overlap(self):
+
+        tiler = Tiler(encoder=NEQR(), tile_shape=(2, 2), overlap=1, max_workers=1)
+
+        reconstructed_image = tiler.reconstruct_image(image=self.ASTRONAUT_IMAGE_RGB)
+
+        assert np.allclose(reconstructed_image, self.ASTRONAUT_IMAGE_RGB)
@@ -0,0 +1 @@
+from .tiling import Tiler
@@ -0,0 +1,238 @@
+from __future__ import annotations
+import numpy as np
+from frqi import FRQI
+from neqr import NEQR
+from qpie import QPIE
+
+
+class Tiler:
+    """Tiler class"""
+
+    def __init__(
+        self,
+        encoder: FRQI | NEQR | QPIE,
+        tile_shape: tuple = None,
+        overlap: int = 0,
+        memory_budget: int = 2**30,
+        max_workers: int = None,
+        shots: int = None,
+    ) -> Tiler:
+        """Initialize the tiling layer.
+
+        Args:
+            encoder (FRQI | NEQR | QPIE): The encoder of the tiles.
+            tile_shape (tuple, optional): The power of two shape of the tiles along
+                                          the first two axes of the image. Defaults
+                                          to None, which chooses the largest tiles
+                                          that fit in the memory budget.
+            overlap (int, optional): The number of pixels shared by neighbouring tiles,
+                                     the overlapping pixels are averaged when the
+                                     tiles are stitched. Defaults to 0.
+            memory_budget (int, optional): The maximum statevector memory of a tile
+                                           in bytes. Defaults to 2**30.
+            max_workers (int, optional): The number of processes that build the tile
+                                         circuits. Defaults to None, which uses the
+                                         number of CPUs.
+            shots (int, optional): The number of shots of the NEQR tiles. Defaults to
+                                   None, which uses the executor shots.
+
+        Raises:
+            ValueError: If the tile shape is not a power of two or the overlap is
+                        not smaller than the tiles.
+        """
+
+        if tile_shape is not None:
+            if any(size < 1 or size & (size - 1) for size in tile_shape):
+                raise ValueError("The tile shape should be a power of two!")
+            if overlap >= min(tile_shape):
+                raise ValueError("The overlap should be smaller than the tiles!")
+
+        self.encoder = encoder
+        self.tile_shape = None if tile_shape is None else tuple(tile_shape)
+        self.overlap = overlap
+        self.memory_budget = memory_budget
+        self.max_workers = max_workers
+        self.shots = shots
+
+    def statevector_memory(self, tile_shape: tuple) -> int:
+        """Return the statevector memory needed to simulate a tile.
+
+        Args:
+            tile_shape (tuple): The full shape of the tile.
+
+        Returns:
+            int: The memory in bytes, as estimated by the encoder.
+        """
+
+        return self.encoder.estimate_resources(image=tuple(tile_shape))[
+            "statevector_memory"
+        ]
+
+    def choose_tile_shape(self, image_shape: tuple) -> tuple:
+        """Return the tile shape used for an image.
+
+        Without an explicit tile shape, the largest square power of two
+        tile (clipped to the image) that fits in the memory budget is used.
+
+        Args:
+            image_shape (tuple): The shape of the image.
+
+        Raises:
+            ValueError: If not even a 2x2 tile fits in the memory budget.
+
+        Returns:
+            tuple: The tile shape along the first two axes.
+        """
+
+        if self.tile_shape is not None:
+            return self.tile_shape
+
+        max_sizes = [2 ** int(np.ceil(np.log2(size))) for size in image_shape[:2]]
+        size = max(max_sizes)
+        while size >= 2:
+            tile_shape = tuple(min(size, max_size) for max_size in max_sizes)
+            if min(tile_shape) > self.overlap and (
+                self.statevector_memory(tile_shape=tile_shape + image_shape[2:])
+                <= self.memory_budget
+            ):
+                return tile_shape
+            size //= 2
+
+        raise ValueError("No tile shape fits in the memory budget!")
+
+    def split_image(self, image: np.ndarray) -> tuple:
+        """Split an image into tiles along its first two axes.
+
+        The image is padded with zeros so that every tile has the same shape.
+
+        Args:
+            image (np.ndarray): The image that will be split.
+
+        Returns:
+            tuple: The list of tiles and the list with the position of the
+                   top left pixel of each tile.
+        """
+
+        tile_shape = self.choose_tile_shape(image_shape=image.shape)
+
+        starts = []
+        padding = [(0, 0)] * len(image.shape)
+        for axis, tile_size in enumerate(tile_shape):
+            stride = tile_size - self.overlap
+            num_tiles = max(
+                int(np.ceil((image.shape[axis] - self.overlap) / stride)), 1
+            )
+            starts.append(range(0, num_tiles * stride, stride))
+            padding[axis] = (
+                0,
+                (num_tiles - 1) * stride + tile_size - image.shape[axis],
+            )
+
+        padded_image = np.pad(image, padding)
+        positions = [(row, column) for row in starts[0] for column in starts[1]]
+        tiles = [
+            padded_image[row : row + tile_shape[0], column : column + tile_shape[1]]
+            for row, column in positions
+        ]
+
+        return tiles, positions
+
+    def stitch_tiles(
+        self, tiles: list, positions: list, image_shape: tuple
+    ) -> np.ndarray:
+        """Stitch decoded tiles back into an image, averaging the overlaps.
+
+        Args:
+            tiles (list): The decoded tiles.
+            positions (list): The position of the top left pixel of each tile.
+            image_shape (tuple): The shape of the image.
+
+        Returns:
+            np.ndarray: The stitched image.
+        """
+
+        tile_shape = tiles[0].shape
+        padded_shape = (
+            max(row for row, _ in positions) + tile_shape[0],
+            max(column for _, column in positions) + tile_shape[1],
+        ) + tuple(image_shape[2:])
+
+        image = np.zeros(padded_shape)
+        weights = np.zeros(padded_shape)
+        for tile, (row, column) in zip(tiles, positions):
+            window = (
+                slice(row, row + tile_shape[0]),
+                slice(column, column + tile_shape[1]),
+            )
+            image[window] += tile
+            weights[window] += 1
+
+        image = image / weights
+
+        return image[: image_shape[0], : image_shape[1]]
+
+    def _decode_tiles(self, tiles: list) -> list:
+        """Encode and simulate a list of tiles with the same shape.
+
+        Args:
+            tiles (list): The tiles that will be encoded.
+
+        Returns:
+            list: The decoded tiles.
+        """
+
+        tile_shape = tiles[0].shape
+
+        if isinstance(self.encoder, NEQR):
+            circuits = self.encoder.batch_quantum_circuits(
+                images=tiles, measurements=True, max_workers=self.max_workers
+            )
+            return self.encoder.reconstruct_images(
+                quantum_circuits=circuits, image_shape=tile_shape, shots=self.shots
+            )
+
+        if isinstance(self.encoder, FRQI):
+            circuits = self.encoder.batch_quantum_circuits(
+                images=tiles, method="ucr", max_workers=self.max_workers
+            )
+            return self.encoder.reconstruct_images(
+                quantum_circuits=circuits, image_shape=tile_shape, statevector=True
+            )
+
+        circuits = self.encoder.batch_quantum_circuits(
+            images=tiles, max_workers=self.max_workers
+        )
+        decoded_tiles = self.encoder.recover_images_from_statevectors(
+            quantum_circuits=circuits, image_shape=tile_shape
+        )
+
+        return [
+            decoded_tile * np.linalg.norm(tile)
+            for tile, decoded_tile in zip(tiles, decoded_tiles)
+        ]
+
+    def reconstruct_image(self, image: np.ndarray) -> np.ndarray:
+        """Encode, simulate and decode an image tile by tile.
+
+        The circuits of the tiles are built in parallel and simulated as a
+        single batched job, tiles without nonzero pixels are not simulated.
+
+        Args:
+            image (np.ndarray): The image that will be processed.
+
+        Returns:
+            np.ndarray: The image stitched from the decoded tiles.
+        """
+
+        tiles, positions = self.split_image(image=image)
+
+        decoded_tiles = [np.zeros(tile.shape) for tile in tiles]
+        nonzero = [i for i, tile in enumerate(tiles) if np.any(tile)]
+        if nonzero:
+            decoded = self._decode_tiles(tiles=[tiles[i] for i in nonzero])
+            for i, decoded_tile in zip(nonzero, decoded):
+                decoded_tiles[i] = decoded_tile
+
+        return self.stitch_tiles(
+            tiles=decoded_tiles, positions=positions, image_shape=image.shape
+        )